@@ -0,0 +1,755 @@
+"""Benchmarks for UniversalCodebaseAnalyzer on synthetic repositories
+
+Usage:
+    python benchmark_report.py scan --files 100000 --workers 1,2,4,8
+    python benchmark_report.py scan --files 100000 --workers 1 --tier deps
+    python benchmark_report.py graph --nodes 10000,50000,100000 --degree 8
+    python benchmark_report.py extract --repeat 200
+    python benchmark_report.py walk --files 5000 --vendored 50000
+    python benchmark_report.py report --files 100000
+    python benchmark_report.py memory --files 100000,300000
+    python benchmark_report.py suite --files 20000 --output results.json
+    python benchmark_report.py suite --files 20000 --baseline results.json
+    python benchmark_report.py startup --files 2000 --repeat 20
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, fields, make_dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from generate_report import DependencyGraph, FileMetadata, MetadataStore, UniversalCodebaseAnalyzer
+
+JS_TEMPLATE = """import React from 'react';
+{imports}
+
+/**
+ * {name} component
+ */
+export function {name}(props) {{
+  const total = props.items.reduce((sum, item) => sum + item.value, 0);
+  return total;
+}}
+
+export const use{name} = (value) => value * 2;
+
+class {name}Store {{
+  constructor() {{
+    this.items = [];
+  }}
+}}
+
+export default {name}Store;
+"""
+
+PY_TEMPLATE = '''"""{name} module"""
+import os
+{imports}
+
+__all__ = ['{name}', 'load_{name}']
+
+
+class {name}:
+    """Container for {name} records"""
+
+    def __init__(self, items):
+        self.items = items
+
+
+def load_{name}(path):
+    """Load {name} records from path"""
+    return {name}(os.listdir(path))
+'''
+
+FILES_PER_DIR = 100
+
+
+JS_HELPER = """
+export function {name}Helper{index}(value) {{
+  if (value > {index}) {{
+    return value - {index};
+  }}
+  return value + {index};
+}}
+"""
+
+PY_HELPER = '''
+
+def {name}_helper_{index}(value):
+    """Helper {index} for {name}"""
+    if value > {index}:
+        return value - {index}
+    return value + {index}
+'''
+
+
+def generate_tree(root_dir: str, file_count: int, seed: int = 0, imports: int = 3,
+                  cycle_rate: float = 0.05, size: int = 1) -> List[str]:
+    """Write a synthetic JS/TS/Python tree, with import cycles at ``cycle_rate``, and return its paths"""
+    rng = random.Random(seed)
+    paths = []
+    for index in range(file_count):
+        package_start = index - index % FILES_PER_DIR
+        package = os.path.join(root_dir, 'src', f"pkg{index // FILES_PER_DIR}")
+        os.makedirs(package, exist_ok=True)
+
+        name = f"Module{index}"
+        kind = index % 3
+        local = index % FILES_PER_DIR
+        package_size = min(FILES_PER_DIR, file_count - package_start)
+        # Same-language siblings; kind repeats every three files
+        siblings = range(local % 3, package_size, 3)
+        targets = []
+        for _ in range(imports):
+            if local > 2 and rng.random() < cycle_rate:
+                targets.append(rng.choice([j for j in siblings if j < local]))
+            else:
+                later = [j for j in siblings if j > local]
+                if later:
+                    targets.append(rng.choice(later))
+
+        if kind == 2:
+            import_lines = '\n'.join(f"from . import module{j}" for j in targets)
+            path = os.path.join(package, f"module{local}.py")
+            content = PY_TEMPLATE.format(name=name, imports=import_lines)
+            content += ''.join(PY_HELPER.format(name=name, index=i) for i in range(size - 1))
+        else:
+            import_lines = '\n'.join(
+                f"const dep{i} = require('./module{j}');" for i, j in enumerate(targets)
+            )
+            ext = '.js' if kind == 0 else '.ts'
+            path = os.path.join(package, f"module{local}{ext}")
+            content = JS_TEMPLATE.format(name=name, imports=import_lines)
+            content += ''.join(JS_HELPER.format(name=name, index=i) for i in range(size - 1))
+
+        with open(path, 'w') as f:
+            f.write(content)
+        paths.append(path)
+    return paths
+
+
+def make_analyzer(**overrides) -> UniversalCodebaseAnalyzer:
+    """Create an analyzer with history tracking off and config overrides applied"""
+    analyzer = UniversalCodebaseAnalyzer()
+    analyzer.config['track_history'] = False
+    analyzer.config.update(overrides)
+    return analyzer
+
+
+def simulate_latency(seconds: float) -> None:
+    """Delay every os.stat in this process (and forked workers) like a network filesystem"""
+    real_stat = os.stat
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(seconds)
+        return real_stat(*args, **kwargs)
+
+    os.stat = slow_stat
+
+
+def bench_scan(args) -> None:
+    """Measure _scan_files throughput for each worker count"""
+    root_dir = args.root or tempfile.mkdtemp(prefix='analyzer-bench-')
+    try:
+        if not args.root:
+            print(f"Generating {args.files} files in {root_dir}")
+            generate_tree(root_dir, args.files)
+        if args.latency_ms:
+            simulate_latency(args.latency_ms / 1000)
+
+        baseline = None
+        baseline_time = None
+        print(f"{'workers':>8} {'seconds':>10} {'files/s':>10} {'speedup':>8} identical")
+        for workers in args.workers:
+            analyzer = make_analyzer(workers=workers, executor=args.executor, extraction_tier=args.tier)
+            start = time.perf_counter()
+            analyzer._scan_files(root_dir)
+            elapsed = time.perf_counter() - start
+
+            fields = analyzer._report_fields()
+            result = [metadata.to_dict(fields) for metadata in analyzer.file_metadata.values()]
+            if baseline is None:
+                baseline, baseline_time = result, elapsed
+            print(
+                f"{workers:>8} {elapsed:>10.2f} {len(result) / elapsed:>10.0f} "
+                f"{baseline_time / elapsed:>7.2f}x {result == baseline}"
+            )
+    finally:
+        if not args.root and not args.keep:
+            shutil.rmtree(root_dir, ignore_errors=True)
+
+
+def generate_graph(node_count: int, degree: int, seed: int = 0) -> Dict[str, List[str]]:
+    """Random import graph; mostly forward edges with a few back edges forming cycles"""
+    rng = random.Random(seed)
+    edges = {}
+    for node in range(node_count):
+        targets = []
+        for _ in range(degree):
+            if rng.random() < 0.05:
+                targets.append(f"n{rng.randrange(node_count)}")
+            elif node + 1 < node_count:
+                targets.append(f"n{rng.randrange(node + 1, node_count)}")
+        edges[f"n{node}"] = targets
+    return edges
+
+
+def bench_graph(args) -> None:
+    """Measure graph construction, cycle detection, edits and transitive queries"""
+    print(f"{'nodes':>8} {'edges':>9} {'build s':>8} {'scc s':>8} {'cyclic':>8} "
+          f"{'query ms':>9} {'edit ms':>8}")
+    for node_count in args.nodes:
+        edges = generate_graph(node_count, args.degree)
+
+        start = time.perf_counter()
+        graph = DependencyGraph()
+        for node, targets in edges.items():
+            graph.set_edges(node, targets)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cyclic = graph.circular_nodes()
+        scc_time = time.perf_counter() - start
+
+        # Transitive queries from nodes spread across the graph
+        samples = [f"n{i}" for i in range(0, node_count, max(1, node_count // 10))]
+        start = time.perf_counter()
+        for node in samples:
+            graph.transitive_dependencies(node)
+            graph.transitive_dependents(node)
+        query_time = (time.perf_counter() - start) / len(samples)
+
+        # An edit replaces one file's imports, then asks for cycles again
+        rng = random.Random(1)
+        start = time.perf_counter()
+        for node in samples:
+            graph.set_edges(node, [f"n{rng.randrange(node_count)}" for _ in range(args.degree)])
+            graph.circular_nodes()
+        edit_time = (time.perf_counter() - start) / len(samples)
+
+        edge_count = sum(len(targets) for targets in graph.edges.values())
+        print(
+            f"{node_count:>8} {edge_count:>9} {build_time:>8.2f} {scc_time:>8.2f} "
+            f"{len(cyclic):>8} {query_time * 1000:>9.1f} {edit_time * 1000:>8.1f}"
+        )
+
+
+def legacy_extract(analyzer: UniversalCodebaseAnalyzer, content: str, language: str) -> Dict:
+    """The five uncompiled regex scans _analyze_file used before PatternExtractor"""
+    return {
+        'dependencies': analyzer._extract_dependencies(content, language),
+        'exports': analyzer._extract_exports(content, language),
+        'doc_strings': analyzer._extract_doc_strings(content, language),
+        'functions': analyzer._extract_functions(content, language),
+        'classes': analyzer._extract_classes(content, language),
+    }
+
+
+def bench_extract(args) -> None:
+    """Compare PatternExtractor with the uncompiled per-pattern scans for each language"""
+    analyzer = make_analyzer()
+    samples = {
+        'javascript': JS_TEMPLATE,
+        'typescript': JS_TEMPLATE.replace(
+            'class {name}Store', 'interface {name}Props {{}}\nclass {name}Store'
+        ),
+        'python': PY_TEMPLATE,
+    }
+
+    print(f"{'language':>12} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8} identical")
+    for language, template in samples.items():
+        # One large file made of many modules, typical of bundled sources
+        content = '\n'.join(
+            template.format(name=f"Module{i}", imports=f"import dep from './dep{i}';")
+            for i in range(args.modules)
+        )
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            legacy = legacy_extract(analyzer, content, language)
+        legacy_time = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            compiled = analyzer._extract_symbols(content, language)
+        compiled_time = (time.perf_counter() - start) / args.repeat
+
+        print(
+            f"{language:>12} {legacy_time * 1000:>10.2f} {compiled_time * 1000:>12.2f} "
+            f"{legacy_time / compiled_time:>7.2f}x {legacy == compiled}"
+        )
+
+
+def generate_vendored(root_dir: str, file_count: int) -> None:
+    """Write a node_modules tree of small packages with manifests and sources"""
+    for index in range(file_count // 4):
+        package = os.path.join(root_dir, 'node_modules', f"vendor{index // 50}", f"pkg{index}")
+        os.makedirs(os.path.join(package, 'lib'), exist_ok=True)
+        for name in ('package.json', 'index.js', os.path.join('lib', 'util.js'), 'README.md'):
+            with open(os.path.join(package, name), 'w') as f:
+                f.write('{}\n' if name.endswith('.json') else 'module.exports = {};\n')
+
+
+def legacy_walk(analyzer: UniversalCodebaseAnalyzer, root_dir: str) -> tuple:
+    """One rglob per config pattern plus a separate source walk, as before _walk_project"""
+    config_files = []
+    for pattern in analyzer.CONFIG_PATTERNS:
+        config_files.extend(
+            str(p.relative_to(root_dir))
+            for p in Path(root_dir).rglob(pattern)
+            if not any(excluded in str(p) for excluded in analyzer.config['excluded_dirs'])
+        )
+
+    source_files = []
+    for root, dirs, files in os.walk(root_dir):
+        dirs[:] = [d for d in dirs if d not in analyzer.config['excluded_dirs']]
+        source_files.extend(
+            os.path.join(root, file) for file in files if analyzer._should_analyze_file(file)
+        )
+    return source_files, config_files
+
+
+def bench_walk(args) -> None:
+    """Compare the single pruned traversal with per-pattern rglob on a vendored tree"""
+    root_dir = tempfile.mkdtemp(prefix='analyzer-bench-')
+    try:
+        print(f"Generating {args.files} files and {args.vendored} vendored files in {root_dir}")
+        generate_tree(root_dir, args.files)
+        generate_vendored(root_dir, args.vendored)
+
+        analyzer = make_analyzer()
+        start = time.perf_counter()
+        legacy_sources, _ = legacy_walk(analyzer, root_dir)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sources, configs = analyzer._walk_project(root_dir)
+        walk_time = time.perf_counter() - start
+
+        print(f"{'legacy s':>9} {'single s':>9} {'speedup':>8} {'sources':>8} {'configs':>8} same sources")
+        print(
+            f"{legacy_time:>9.2f} {walk_time:>9.2f} {legacy_time / walk_time:>7.1f}x "
+            f"{len(sources):>8} {len(configs):>8} {sorted(legacy_sources) == sorted(sources)}"
+        )
+    finally:
+        shutil.rmtree(root_dir, ignore_errors=True)
+
+
+def legacy_generate_report(analyzer: UniversalCodebaseAnalyzer, base_path: str) -> None:
+    """Build the whole report dict, then dump JSON and text from it, as before streaming"""
+    report = {
+        'timestamp': 'benchmark',
+        'project': asdict(analyzer.project_context) if analyzer.project_context else {},
+        'files': {path: asdict(FileMetadata(**metadata.to_dict(), degraded=metadata.degraded))
+                  for path, metadata in analyzer.file_metadata.items()},
+        'statistics': analyzer._generate_statistics(),
+        'dependencies': analyzer._generate_dependency_graph(),
+        'changes': analyzer._analyze_changes()
+    }
+    with open(f"{base_path}.json", 'w') as f:
+        json.dump(report, f, indent=2)
+    with open(f"{base_path}.txt", 'w') as f:
+        for section in ('project', 'statistics', 'changes'):
+            for key, value in report[section].items():
+                f.write(f"{key}: {value}\n")
+        for module, deps in report['dependencies'].items():
+            f.write(f"\n{module}:\n")
+            for dep in deps:
+                f.write(f"  - {dep}\n")
+        for path, metadata in report['files'].items():
+            f.write(f"\n{path}:\n")
+            f.write(f"  Language: {metadata['language']}\n")
+            f.write(f"  Size: {metadata['size']} bytes\n")
+            if metadata['functions']:
+                f.write("  Functions:\n")
+                for func in metadata['functions']:
+                    f.write(f"    - {func}\n")
+            if metadata['classes']:
+                f.write("  Classes:\n")
+                for cls in metadata['classes']:
+                    f.write(f"    - {cls}\n")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_report_writer(args) -> None:
+    """Subprocess body for bench_report: scan, then write the report one way"""
+    analyzer = make_analyzer()
+    analyzer.analyze_project(args.root)
+    rss_before = peak_rss_mb()
+
+    base_path = os.path.join(args.out, args.mode)
+    start = time.perf_counter()
+    if args.mode == 'legacy':
+        legacy_generate_report(analyzer, base_path)
+    else:
+        analyzer.generate_report(base_path, output_format=args.mode)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({'seconds': elapsed, 'rss_before': rss_before, 'rss_peak': peak_rss_mb()}))
+
+
+def bench_report(args) -> None:
+    """Measure wall time and peak RSS of report writing, each mode in a fresh process"""
+    root_dir = tempfile.mkdtemp(prefix='analyzer-bench-')
+    try:
+        print(f"Generating {args.files} files in {root_dir}")
+        generate_tree(root_dir, args.files)
+
+        print(f"{'mode':>8} {'seconds':>8} {'scan MB':>8} {'peak MB':>8} {'write MB':>9}")
+        for mode in ('legacy', 'json', 'compact', 'ndjson'):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), 'report-writer',
+                 '--mode', mode, '--root', root_dir, '--out', root_dir],
+                check=True, capture_output=True, text=True, cwd=root_dir
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:>8} {result['seconds']:>8.2f} {result['rss_before']:>8.1f} "
+                f"{result['rss_peak']:>8.1f} {result['rss_peak'] - result['rss_before']:>9.1f}"
+            )
+    finally:
+        shutil.rmtree(root_dir, ignore_errors=True)
+
+
+PACKAGES = ['react', 'lodash', 'axios', 'os', 'json', 're', 'typing', 'dataclasses', 'express', 'vue']
+
+
+# FileMetadata as it was before __slots__, for the memory baseline
+LegacyFileMetadata = make_dataclass('LegacyFileMetadata', [(f.name, f.type) for f in fields(FileMetadata)])
+
+
+def synthetic_metadata(index: int, rng: random.Random, record=FileMetadata):
+    """FileMetadata shaped like extractor output, with fresh strings as regex matches produce"""
+    module = f"mod_{index}"
+    imports = rng.sample(PACKAGES, 3) + [f"./mod_{rng.randrange(index + 1)}" for _ in range(3)]
+    return record(
+        path=f"/repo/src/pkg{index // 100}/{module}.js",
+        language='javascript',
+        size=rng.randrange(200, 20000),
+        last_modified=1.7e9 + index,
+        hash=f"{rng.getrandbits(128):032x}",
+        dependencies=[''.join(name) for name in imports],
+        exports=[f"{module}_{name}" for name in ('component', 'use')],
+        doc_strings=[f"{module} component"],
+        functions=[''.join(name) for name in ('render', 'handleClick', 'useEffect', f"{module}_use")],
+        classes=[f"{module}Store"],
+        complexity={'cyclomatic_complexity': rng.randrange(1, 30), 'cognitive_complexity': rng.randrange(30),
+                    'nesting_depth': rng.randrange(6), 'lines_of_code': rng.randrange(10, 500),
+                    'comment_ratio': round(rng.random(), 2)},
+        degraded=None
+    )
+
+
+def measure_store(factory, record, file_count: int) -> Dict[str, float]:
+    """Build a store of synthetic metadata, then time full report- and history-style passes"""
+    rng = random.Random(0)
+    tracemalloc.start()
+    store = factory()
+    for index in range(file_count):
+        metadata = synthetic_metadata(index, rng, record)
+        store[metadata.path] = metadata
+    memory_mb = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    tracemalloc.stop()
+
+    to_dict = asdict if isinstance(store, dict) else (lambda view: view.to_dict())
+    start = time.perf_counter()
+    for metadata in store.values():
+        to_dict(metadata)
+    dict_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for metadata in store.values():
+        (metadata.hash, metadata.language, metadata.last_modified)
+    scan_seconds = time.perf_counter() - start
+    return {'memory_mb': memory_mb, 'dict_seconds': dict_seconds, 'scan_seconds': scan_seconds}
+
+
+def bench_memory(args) -> None:
+    """Compare dicts of (slotted) dataclasses with MetadataStore"""
+    layouts = (
+        ('legacy', dict, LegacyFileMetadata),
+        ('slots', dict, FileMetadata),
+        ('store', MetadataStore, FileMetadata),
+    )
+    print(f"{'files':>8} {'layout':>8} {'MB':>8} {'B/file':>7} {'to dict s':>10} {'fields s':>9}")
+    for file_count in args.files:
+        for name, factory, record in layouts:
+            result = measure_store(factory, record, file_count)
+            print(
+                f"{file_count:>8} {name:>8} {result['memory_mb']:>8.1f} "
+                f"{result['memory_mb'] * 1024 * 1024 / file_count:>7.0f} "
+                f"{result['dict_seconds']:>10.3f} {result['scan_seconds']:>9.3f}"
+            )
+
+
+SUITE_PHASES = ('walk', 'extract', 'scan', 'dependencies', 'report', 'history')
+
+
+def run_suite_phase(phase: str, root_dir: str, work_dir: str,
+                    analyzer: UniversalCodebaseAnalyzer, workers: int) -> float:
+    """Time one isolated run of a suite phase, starting from ``analyzer``'s completed analysis"""
+    if phase == 'walk':
+        fresh = make_analyzer()
+        start = time.perf_counter()
+        fresh._walk_project(root_dir)
+    elif phase == 'extract':
+        paths = analyzer._walk_project(root_dir)[0]
+        fresh = make_analyzer(workers=workers)
+        start = time.perf_counter()
+        fresh._extract_files(paths)
+    elif phase == 'scan':
+        fresh = make_analyzer(workers=workers)
+        start = time.perf_counter()
+        fresh._scan_files(root_dir)
+    elif phase == 'dependencies':
+        start = time.perf_counter()
+        analyzer._analyze_dependencies()
+    elif phase == 'report':
+        start = time.perf_counter()
+        analyzer.generate_report(os.path.join(work_dir, 'report'))
+    elif phase == 'history':
+        # Time recording a full run into an empty history log
+        history_path = analyzer._state_path(analyzer.config['history_file'])
+        if os.path.exists(history_path):
+            os.remove(history_path)
+        analyzer.history_store = None
+        analyzer._history_baseline = None
+        start = time.perf_counter()
+        analyzer._update_history()
+    else:
+        raise ValueError(f"unknown phase {phase}")
+    return time.perf_counter() - start
+
+
+def compare_results(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print current vs baseline minimum times and return the phases that regressed"""
+    if results['meta']['generator'] != baseline['meta'].get('generator'):
+        print(f"warning: baseline was generated with {baseline['meta'].get('generator')}")
+
+    regressions = []
+    print(f"{'phase':>13} {'baseline s':>11} {'current s':>10} {'ratio':>7}")
+    for phase, current in results['phases'].items():
+        previous = baseline['phases'].get(phase)
+        if previous is None:
+            print(f"{phase:>13} {'-':>11} {current['min']:>10.4f} {'new':>7}")
+            continue
+        ratio = current['min'] / previous['min'] if previous['min'] else float('inf')
+        verdict = ''
+        if ratio > 1 + threshold:
+            verdict = 'slower'
+            regressions.append(phase)
+        elif ratio < 1 - threshold:
+            verdict = 'faster'
+        print(f"{phase:>13} {previous['min']:>11.4f} {current['min']:>10.4f} {ratio:>6.2f}x {verdict}")
+    return regressions
+
+
+def bench_suite(args) -> None:
+    """Time each analyzer phase in isolation on a generated tree and record JSON results"""
+    generator = {
+        'files': args.files, 'imports': args.imports, 'cycle_rate': args.cycle_rate,
+        'size': args.size, 'vendored': args.vendored, 'seed': args.seed
+    }
+    root_dir = tempfile.mkdtemp(prefix='analyzer-bench-')
+    work_dir = tempfile.mkdtemp(prefix='analyzer-bench-out-')
+    cwd = os.getcwd()
+    try:
+        print(f"Generating {args.files} files ({args.vendored} vendored) in {root_dir}")
+        generate_tree(root_dir, args.files, args.seed, args.imports, args.cycle_rate, args.size)
+        if args.vendored:
+            generate_vendored(root_dir, args.vendored)
+
+        # History and other state files are written relative to the working directory
+        os.chdir(work_dir)
+        analyzer = make_analyzer(workers=args.workers)
+        analyzer.analyze_project(root_dir)
+
+        phases = {}
+        print(f"{'phase':>13} {'min s':>9} {'median s':>9}")
+        for phase in args.phases:
+            runs = [run_suite_phase(phase, root_dir, work_dir, analyzer, args.workers)
+                    for _ in range(args.repeat)]
+            phases[phase] = {'min': min(runs), 'median': statistics.median(runs), 'runs': runs}
+            print(f"{phase:>13} {phases[phase]['min']:>9.4f} {phases[phase]['median']:>9.4f}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root_dir, ignore_errors=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'workers': args.workers,
+            'repeat': args.repeat,
+            'generator': generator
+        },
+        'phases': phases
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+# Modules generate_report only imports once a code path needs them
+LAZY_MODULES = ('yaml', 'subprocess', 'concurrent.futures', 'multiprocessing', 'asyncio', 'sqlite3',
+                'difflib', 'glob')
+
+
+def time_command(argv: List[str], cwd: str, repeat: int, before=None) -> float:
+    """Median milliseconds ``argv`` takes in a fresh interpreter, calling ``before()`` ahead of each run"""
+    samples = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def bench_startup(args) -> None:
+    """Measure CLI startup and the unchanged-tree fast path of scan and diff"""
+    root_dir = tempfile.mkdtemp(prefix='analyzer-bench-')
+    work_dir = tempfile.mkdtemp(prefix='analyzer-bench-out-')
+    try:
+        print(f"Generating {args.files} files in {root_dir}")
+        paths = generate_tree(root_dir, args.files)
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        launcher = [sys.executable, os.path.join(package_dir, 'report_cli.py')]
+        script = [sys.executable, os.path.join(package_dir, 'generate_report.py')]
+        import_module = f"import sys; sys.path.insert(0, {package_dir!r}); import generate_report"
+
+        # Fill the cache (and the bytecode cache); state files land in work_dir
+        subprocess.run(launcher + ['scan', root_dir], cwd=work_dir, check=True, stdout=subprocess.DEVNULL)
+
+        rows = [
+            ('interpreter', [sys.executable, '-c', 'pass'], None),
+            ('import generate_report', [sys.executable, '-c', import_module], None),
+            ('--help', launcher + ['--help'], None),
+            ('diff, unchanged', launcher + ['diff', root_dir], None),
+            ('scan, unchanged', launcher + ['scan', root_dir], None),
+            ('scan, unchanged, script', script + ['scan', root_dir], None),
+            ('scan, one file touched', launcher + ['scan', root_dir], lambda: os.utime(paths[0])),
+        ]
+        print(f"{'command':<26} {'median ms':>10}")
+        for name, argv, before in rows:
+            print(f"{name:<26} {time_command(argv, work_dir, args.repeat, before):>10.1f}")
+
+        # The fast path should not pull in any of the lazily imported modules
+        probe = (f"{import_module}; generate_report.main(['scan', {root_dir!r}]); "
+                 f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules) or 'none')")
+        output = subprocess.run([sys.executable, '-c', probe], cwd=work_dir, check=True,
+                                capture_output=True, text=True).stdout
+        print(f"lazy modules loaded by an unchanged scan: {output.strip().splitlines()[-1]}")
+    finally:
+        shutil.rmtree(root_dir, ignore_errors=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scan = subparsers.add_parser('scan', help='parallel scan throughput by worker count')
+    scan.add_argument('--files', type=int, default=100000, help='synthetic files to generate')
+    scan.add_argument('--workers', type=lambda v: [int(w) for w in v.split(',')],
+                      default=[1, 2, 4, 8], help='comma-separated worker counts')
+    scan.add_argument('--executor', default='process', choices=['process', 'thread', 'pipeline', 'auto'])
+    scan.add_argument('--tier', default='full', choices=sorted(UniversalCodebaseAnalyzer.EXTRACTION_TIERS),
+                      help='fields extracted during the scan')
+    scan.add_argument('--latency-ms', type=float, default=0.0,
+                      help='simulated per-stat filesystem latency, e.g. for NFS')
+    scan.add_argument('--root', help='benchmark an existing tree instead of generating one')
+    scan.add_argument('--keep', action='store_true', help='keep the generated tree')
+    scan.set_defaults(func=bench_scan)
+
+    graph = subparsers.add_parser('graph', help='dependency graph engine scaling')
+    graph.add_argument('--nodes', type=lambda v: [int(n) for n in v.split(',')],
+                       default=[10000, 50000, 100000], help='comma-separated node counts')
+    graph.add_argument('--degree', type=int, default=8, help='imports per file')
+    graph.set_defaults(func=bench_graph)
+
+    extract = subparsers.add_parser('extract', help='compiled extractor vs per-pattern scans')
+    extract.add_argument('--modules', type=int, default=50, help='modules concatenated per sample')
+    extract.add_argument('--repeat', type=int, default=100, help='iterations per language')
+    extract.set_defaults(func=bench_extract)
+
+    walk = subparsers.add_parser('walk', help='tree traversal with a heavy node_modules')
+    walk.add_argument('--files', type=int, default=5000, help='synthetic source files')
+    walk.add_argument('--vendored', type=int, default=50000, help='files under node_modules')
+    walk.set_defaults(func=bench_walk)
+
+    report = subparsers.add_parser('report', help='report writing time and peak memory')
+    report.add_argument('--files', type=int, default=100000, help='synthetic files to generate')
+    report.set_defaults(func=bench_report)
+
+    memory = subparsers.add_parser('memory', help='FileMetadata storage footprint and dict conversion')
+    memory.add_argument('--files', type=lambda v: [int(n) for n in v.split(',')],
+                        default=[100000, 300000], help='comma-separated file counts')
+    memory.set_defaults(func=bench_memory)
+
+    suite = subparsers.add_parser('suite', help='isolated per-phase timings with baseline comparison')
+    suite.add_argument('--files', type=int, default=5000, help='synthetic source files')
+    suite.add_argument('--imports', type=int, default=3, help='imports per file')
+    suite.add_argument('--cycle-rate', type=float, default=0.05,
+                       help='probability that an import points back and can form a cycle')
+    suite.add_argument('--size', type=int, default=1, help='code size multiplier per file')
+    suite.add_argument('--vendored', type=int, default=0, help='files under node_modules')
+    suite.add_argument('--seed', type=int, default=0)
+    suite.add_argument('--workers', type=int, default=1, help='extraction workers')
+    suite.add_argument('--repeat', type=int, default=5, help='timed runs per phase')
+    suite.add_argument('--phases', type=lambda v: v.split(','), default=list(SUITE_PHASES),
+                       help='comma-separated subset of ' + ','.join(SUITE_PHASES))
+    suite.add_argument('--output', help='write results JSON here')
+    suite.add_argument('--baseline', help='compare against a previous results JSON')
+    suite.add_argument('--threshold', type=float, default=0.10,
+                       help='relative slowdown reported as a regression')
+    suite.set_defaults(func=bench_suite)
+
+    startup = subparsers.add_parser('startup', help='CLI startup and unchanged-tree fast path, per process')
+    startup.add_argument('--files', type=int, default=2000, help='synthetic source files')
+    startup.add_argument('--repeat', type=int, default=20, help='runs per command')
+    startup.set_defaults(func=bench_startup)
+
+    # Internal: runs one report mode in isolation so peak RSS is per mode
+    writer = subparsers.add_parser('report-writer')
+    writer.add_argument('--mode', required=True)
+    writer.add_argument('--root', required=True)
+    writer.add_argument('--out', required=True)
+    writer.set_defaults(func=run_report_writer)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,26 @@
 import os
+import sys
 import json
 import re
+import fnmatch
 from datetime import datetime
 import hashlib
-from typing import Dict, List, Optional, Set
-import difflib
-import yaml
-import glob
+import bisect
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
-import subprocess
-from pathlib import Path
+import time
+from array import array
+from collections.abc import MutableMapping
+from contextlib import contextmanager, nullcontext
 
 @dataclass
 class FileMetadata:
-    """Metadata for tracked files"""
+    """Metadata for tracked files; None fields are deferred, ``degraded`` an exceeded budget or 'stale'"""
+    __slots__ = (
+        'path', 'language', 'size', 'last_modified', 'hash', 'dependencies',
+        'exports', 'doc_strings', 'functions', 'classes', 'complexity', 'degraded'
+    )
     path: str
     language: str
     size: int
@@ -24,6 +31,8 @@ class FileMetadata:
     doc_strings: List[str]
     functions: List[str]
     classes: List[str]
+    complexity: Dict[str, float]
+    degraded: Optional[str]
 
 @dataclass
 class ProjectContext:
@@ -35,37 +44,1634 @@ class ProjectContext:
     entry_points: List[str]
     config_files: List[str]
 
+class FileMetadataView:
+    """Read-through view of one MetadataStore row, usable like FileMetadata or its asdict() form"""
+
+    __slots__ = ('_store', '_row', 'path')
+
+    FIELDS = (
+        'path', 'language', 'size', 'last_modified', 'hash', 'dependencies',
+        'exports', 'doc_strings', 'functions', 'classes', 'complexity'
+    )
+
+    def __init__(self, store: 'MetadataStore', row: int, path: str):
+        self._store = store
+        self._row = row
+        self.path = path
+
+    @property
+    def language(self) -> str:
+        return self._store._language_names[self._store._languages[self._row]]
+
+    @property
+    def size(self) -> int:
+        return self._store._sizes[self._row]
+
+    @property
+    def last_modified(self) -> float:
+        return self._store._mtimes[self._row]
+
+    @property
+    def hash(self) -> str:
+        return self._store._get_hash(self._row)
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        self._store._require(self._row, self.path, 0)
+        return self._store._get_symbols(self._row, 0)
+
+    @property
+    def exports(self) -> Tuple[str, ...]:
+        self._store._require(self._row, self.path, 1)
+        return self._store._get_symbols(self._row, 1)
+
+    @property
+    def doc_strings(self) -> Tuple[str, ...]:
+        self._store._require(self._row, self.path, 2)
+        return self._store._get_symbols(self._row, 2)
+
+    @property
+    def functions(self) -> Tuple[str, ...]:
+        self._store._require(self._row, self.path, 3)
+        return self._store._get_symbols(self._row, 3)
+
+    @property
+    def classes(self) -> Tuple[str, ...]:
+        self._store._require(self._row, self.path, 4)
+        return self._store._get_symbols(self._row, 4)
+
+    @property
+    def complexity(self) -> Dict[str, float]:
+        self._store._require(self._row, self.path, 5)
+        return self._store._get_complexity(self._row)
+
+    @complexity.setter
+    def complexity(self, value: Dict[str, float]) -> None:
+        self._store._set_complexity(self._row, value)
+        self._store._pending[self._row] &= 0b011111
+
+    @property
+    def degraded(self) -> Optional[str]:
+        return self._store._degraded.get(self.path)
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def items(self):
+        self._store._require_all(self._row, self.path, self.FIELDS)
+        return ((key, getattr(self, key)) for key in self.FIELDS)
+
+    def to_dict(self, fields: Tuple[str, ...] = FIELDS) -> Dict:
+        """asdict() equivalent sharing the stored strings, limited to ``fields``"""
+        self._store._require_all(self._row, self.path, fields)
+        return {key: getattr(self, key) for key in fields}
+
+    def __repr__(self) -> str:
+        return f"FileMetadataView({self.to_dict()!r})"
+
+class MetadataStore(MutableMapping):
+    """Compact columnar path -> FileMetadata mapping whose None fields are loaded on first access"""
+
+    # Fields that can be deferred, in bit order; the first five are symbol slots
+    DEFERRABLE = ('dependencies', 'exports', 'doc_strings', 'functions', 'classes', 'complexity')
+
+    # Deferred fields loaded together when one is read: the symbol names share
+    # one pattern pass, while doc strings and complexity are costlier alone
+    _SYMBOL_GROUP = 0b011010
+    LOAD_MASKS = (0b000001, _SYMBOL_GROUP, 0b000100, _SYMBOL_GROUP, _SYMBOL_GROUP, 0b100000)
+
+    def __init__(self, items=(), loader=None):
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._language_names: List[str] = []
+        self._language_codes: Dict[str, int] = {}
+        self._languages = array('H')
+        self._sizes = array('q')
+        self._mtimes = array('d')
+        self._hashes = bytearray()
+        self._hash_lengths = array('B')
+        self._hash_width = 0
+        self._symbols: List[Optional[tuple]] = []
+        self._symbol_bounds = array('I')
+        self._complexity: List = []
+        self._complexity_keys: Optional[Tuple[str, ...]] = None
+        self._strings: Dict[str, str] = {}
+        self._pending = array('B')
+        self._degraded: Dict[str, str] = {}
+        self.loader = loader
+        self.update(items)
+
+    def __getitem__(self, path: str) -> FileMetadataView:
+        return FileMetadataView(self, self._rows[path], path)
+
+    def __setitem__(self, path: str, metadata) -> None:
+        if isinstance(metadata, FileMetadataView):
+            # Copy without forcing its deferred fields to be extracted
+            metadata = metadata._store._snapshot(metadata._row, path)
+        row = self._rows.get(path)
+        if row is None:
+            row = self._allocate()
+            self._rows[path] = row
+
+        code = self._language_codes.get(metadata.language)
+        if code is None:
+            code = self._language_codes[metadata.language] = len(self._language_names)
+            self._language_names.append(metadata.language)
+        self._languages[row] = code
+        self._sizes[row] = metadata.size
+        self._mtimes[row] = metadata.last_modified
+        self._set_hash(row, metadata.hash)
+        if metadata.degraded:
+            self._degraded[path] = metadata.degraded
+        else:
+            self._degraded.pop(path, None)
+        pending = 0
+        values = []
+        for bit, name in enumerate(self.DEFERRABLE):
+            value = getattr(metadata, name)
+            if value is None:
+                pending |= 1 << bit
+            values.append(value or ())
+        self._pending[row] = pending
+
+        intern = self._intern
+        symbols = [intern(name) for name in values[0]]
+        bounds = self._symbol_bounds
+        bounds[4 * row] = len(symbols)
+        symbols.extend(intern(name) for name in values[1])
+        bounds[4 * row + 1] = len(symbols)
+        # Doc strings are rarely shared, so they are not worth interning
+        symbols.extend(values[2])
+        bounds[4 * row + 2] = len(symbols)
+        symbols.extend(intern(name) for name in values[3])
+        bounds[4 * row + 3] = len(symbols)
+        symbols.extend(intern(name) for name in values[4])
+        self._symbols[row] = tuple(symbols)
+        self._set_complexity(row, values[5])
+
+    def __delitem__(self, path: str) -> None:
+        row = self._rows.pop(path)
+        self._degraded.pop(path, None)
+        self._symbols[row] = None
+        self._complexity[row] = None
+        self._free.append(row)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, path) -> bool:
+        return path in self._rows
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        self._languages.append(0)
+        self._sizes.append(0)
+        self._mtimes.append(0.0)
+        self._hashes.extend(bytes(self._hash_width))
+        self._hash_lengths.append(0)
+        self._symbols.append(None)
+        self._symbol_bounds.extend((0, 0, 0, 0))
+        self._complexity.append(None)
+        self._pending.append(0)
+        return len(self._symbols) - 1
+
+    def _require(self, row: int, path: str, bit: int) -> None:
+        """Extract deferred field ``bit`` of a row, with its load group, if still pending"""
+        pending = self._pending[row]
+        if pending >> bit & 1:
+            self._load(row, path, pending & self.LOAD_MASKS[bit])
+
+    def _require_all(self, row: int, path: str, fields) -> None:
+        """Extract every deferred field among ``fields`` in one load"""
+        if self._pending[row]:
+            mask = sum(1 << bit for bit, name in enumerate(self.DEFERRABLE) if name in fields)
+            if self._pending[row] & mask:
+                self._load(row, path, self._pending[row] & mask)
+
+    def _load(self, row: int, path: str, mask: int) -> None:
+        names = [name for bit, name in enumerate(self.DEFERRABLE) if mask >> bit & 1]
+        values = (self.loader(path, names) if self.loader else None) or {}
+        metadata = self._snapshot(row, path)
+        for name in names:
+            # Fields the loader could not produce are stored empty rather than retried
+            value = values.get(name)
+            setattr(metadata, name, value if value is not None else ({} if name == 'complexity' else []))
+        if values.get('degraded'):
+            metadata.degraded = values['degraded']
+        self[path] = metadata
+
+    def _snapshot(self, row: int, path: str) -> FileMetadata:
+        """The row as a FileMetadata record, deferred fields left as None"""
+        pending = self._pending[row]
+        symbols = [None if pending >> index & 1 else list(self._get_symbols(row, index))
+                   for index in range(5)]
+        return FileMetadata(
+            path,
+            self._language_names[self._languages[row]],
+            self._sizes[row],
+            self._mtimes[row],
+            self._get_hash(row),
+            *symbols,
+            None if pending >> 5 & 1 else self._get_complexity(row),
+            self._degraded.get(path)
+        )
+
+    def _intern(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def _get_symbols(self, row: int, field_index: int) -> Tuple[str, ...]:
+        bounds = self._symbol_bounds
+        start = bounds[4 * row + field_index - 1] if field_index else 0
+        end = bounds[4 * row + field_index] if field_index < 4 else None
+        return self._symbols[row][start:end]
+
+    def _set_hash(self, row: int, file_hash: str) -> None:
+        digest = bytes.fromhex(file_hash)
+        if len(digest) > self._hash_width:
+            self._widen_hashes(len(digest))
+        start = row * self._hash_width
+        self._hashes[start:start + len(digest)] = digest
+        self._hash_lengths[row] = len(digest)
+
+    def _get_hash(self, row: int) -> str:
+        start = row * self._hash_width
+        return self._hashes[start:start + self._hash_lengths[row]].hex()
+
+    def _widen_hashes(self, width: int) -> None:
+        """Re-stride the digest column for a longer hash algorithm"""
+        old_width, old = self._hash_width, self._hashes
+        self._hashes = bytearray(width * len(self._hash_lengths))
+        for row in range(len(self._hash_lengths)):
+            self._hashes[row * width:row * width + old_width] = old[row * old_width:(row + 1) * old_width]
+        self._hash_width = width
+
+    def _set_complexity(self, row: int, complexity: Dict[str, float]) -> None:
+        if not complexity:
+            self._complexity[row] = None
+            return
+        keys = tuple(complexity)
+        if self._complexity_keys is None:
+            self._complexity_keys = keys
+        # Every analyzer result shares one key layout, so only values are kept
+        if keys == self._complexity_keys:
+            self._complexity[row] = tuple(complexity.values())
+        else:
+            self._complexity[row] = dict(complexity)
+
+    def _get_complexity(self, row: int) -> Dict[str, float]:
+        values = self._complexity[row]
+        if values is None:
+            return {}
+        if isinstance(values, dict):
+            return dict(values)
+        return dict(zip(self._complexity_keys, values))
+
+class DelimitedScanner:
+    """``findall`` for the text between fixed delimiters, in time linear in the content"""
+
+    def __init__(self, opening: str, closing: str):
+        self.opening = opening
+        self.closing = closing
+
+    def findall(self, content: str) -> List[str]:
+        matches = []
+        opening, closing = self.opening, self.closing
+        start = content.find(opening)
+        while start != -1:
+            end = content.find(closing, start + len(opening))
+            if end == -1:
+                break
+            matches.append(content[start + len(opening):end])
+            start = content.find(opening, end + len(closing))
+        return matches
+
+class PatternExtractor:
+    """Precompiled extractor for every PATTERNS field plus doc comments"""
+
+    FIELDS = {
+        'import': 'dependencies',
+        'export': 'exports',
+        'doc': 'doc_strings',
+        'function': 'functions',
+        'class': 'classes',
+    }
+
+    def __init__(self, patterns: Dict[str, str], doc_delimiters: Optional[Tuple[str, str]],
+                 triggers: Dict[str, tuple]):
+        self.rules = []
+        for kind, pattern in patterns.items():
+            compiled = re.compile(pattern)
+            convert = self.join_import if compiled.groups > 1 else None
+            self.rules.append((self.FIELDS[kind], compiled, triggers[kind], convert))
+        if doc_delimiters:
+            self.rules.append(('doc_strings', DelimitedScanner(*doc_delimiters), triggers['doc'], str.strip))
+
+    @staticmethod
+    def join_import(groups: Tuple[str, str]) -> str:
+        """One specifier from a (from-module, imported name) match, e.g. 'pkg.name' or '.name'"""
+        module, name = groups
+        if not module:
+            return name
+        if name == '*':
+            return module
+        return module + name if module.endswith('.') else f"{module}.{name}"
+
+    def extract(self, content: str, timings: Optional[Dict[str, float]] = None,
+                fields=None, deadline: Optional[float] = None) -> Optional[Dict[str, Optional[List[str]]]]:
+        """Return FileMetadata field name -> matches, or None once ``deadline`` passes"""
+        results = {field: [] for field in self.FIELDS.values()}
+        for field, pattern, literals, convert in self.rules:
+            if fields is not None and field not in fields:
+                results[field] = None
+                continue
+            if not any(literal in content for literal in literals):
+                continue
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+            if timings is None:
+                matches = pattern.findall(content)
+            else:
+                start = time.perf_counter()
+                matches = pattern.findall(content)
+                timings[field] = timings.get(field, 0.0) + time.perf_counter() - start
+            results[field] = [convert(match) for match in matches] if convert else matches
+        return results
+
+class RunMetrics:
+    """Phase timings, throughput and hot spots collected during one profiled analysis"""
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.files = 0
+        self.bytes = 0
+        self.pattern_seconds: Dict[str, float] = {}
+        self.errors: List[str] = []
+        self._slowest_files: List[Tuple[float, str]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one call of phase ``name``"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.phases.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'calls': 0})
+            totals['wall_seconds'] += time.perf_counter() - wall
+            totals['cpu_seconds'] += time.process_time() - cpu
+            totals['calls'] += 1
+
+    def record_file(self, path: str, size: int, language: str, seconds: float,
+                    timings: Dict[str, float]) -> None:
+        """Account for one extracted file and the time its patterns took"""
+        self.files += 1
+        self.bytes += size
+        # Min-heap of the top_n slowest files seen so far
+        if len(self._slowest_files) < self.top_n:
+            heapq.heappush(self._slowest_files, (seconds, path))
+        elif seconds > self._slowest_files[0][0]:
+            heapq.heapreplace(self._slowest_files, (seconds, path))
+        for field, field_seconds in timings.items():
+            key = f"{language}:{field}"
+            self.pattern_seconds[key] = self.pattern_seconds.get(key, 0.0) + field_seconds
+
+    def as_dict(self) -> Dict:
+        """Metrics as a JSON-ready dict for the report"""
+        scan_seconds = self.phases.get('scan_files', {}).get('wall_seconds', 0.0)
+        slowest_patterns = heapq.nlargest(self.top_n, self.pattern_seconds.items(), key=lambda item: item[1])
+        return {
+            'phases': {
+                name: {
+                    'wall_seconds': round(totals['wall_seconds'], 6),
+                    'cpu_seconds': round(totals['cpu_seconds'], 6),
+                    'calls': totals['calls']
+                }
+                for name, totals in self.phases.items()
+            },
+            'files_extracted': self.files,
+            'bytes_extracted': self.bytes,
+            'files_per_second': round(self.files / scan_seconds, 1) if scan_seconds else None,
+            'bytes_per_second': round(self.bytes / scan_seconds, 1) if scan_seconds else None,
+            'slowest_files': [
+                {'path': path, 'seconds': round(seconds, 6)}
+                for seconds, path in sorted(self._slowest_files, reverse=True)
+            ],
+            'slowest_patterns': [
+                {'pattern': key, 'seconds': round(seconds, 6)} for key, seconds in slowest_patterns
+            ],
+            'errors': list(self.errors)
+        }
+
+class ImportResolver:
+    """Resolves import specifiers against an in-memory index of scanned files"""
+
+    def __init__(self, file_paths, extensions: List[str], index_files: List[str],
+                 aliases: List[tuple] = (), python_roots: List[str] = ()):
+        self.files = {os.path.normpath(path): path for path in file_paths}
+        self.extensions = list(extensions)
+        self.index_files = list(index_files)
+        # Longest pattern first so '@utils/*' wins over '@/*'
+        self.aliases = sorted(
+            ((pattern, os.path.normpath(target)) for pattern, target in aliases),
+            key=lambda alias: len(alias[0]),
+            reverse=True
+        )
+        self.python_roots = [os.path.normpath(root) for root in python_roots]
+        self._cache: Dict[tuple, Optional[str]] = {}
+        # Last components of the base paths each memoized resolution probed, and the reverse
+        # index, so adding or removing a file only forgets the resolutions it could change
+        self._probed: Dict[tuple, Set[str]] = {}
+        self._keys_by_name: Dict[str, Set[tuple]] = {}
+
+    def with_scope(self, aliases: List[tuple], python_roots: List[str]) -> 'ImportResolver':
+        """A resolver over the same file index with its own aliases and Python roots"""
+        scoped = ImportResolver((), self.extensions, self.index_files, aliases, python_roots)
+        scoped.files = self.files
+        return scoped
+
+    def add_file(self, file_path: str) -> None:
+        self.files[os.path.normpath(file_path)] = file_path
+        self._forget(file_path)
+
+    def remove_file(self, file_path: str) -> None:
+        self.files.pop(os.path.normpath(file_path), None)
+        self._forget(file_path)
+
+    def base_names(self, file_path: str) -> Set[str]:
+        """Last components of the base paths a lookup resolving to ``file_path`` probes"""
+        name = os.path.basename(file_path)
+        names = {name}
+        stem, ext = os.path.splitext(name)
+        if ext == '.py' or ext in self.extensions:
+            names.add(stem)
+        if name == '__init__.py' or name in self.index_files:
+            names.add(os.path.basename(os.path.dirname(file_path)))
+        return names
+
+    def _forget(self, file_path: str) -> None:
+        """Drop the memoized resolutions that probed a base path ``file_path`` could match"""
+        for name in self.base_names(file_path):
+            for key in self._keys_by_name.pop(name, ()):
+                self._cache.pop(key, None)
+                self._probed.pop(key, None)
+
+    def resolve(self, source_file: str, specifier: str) -> Optional[str]:
+        """Return the indexed path ``specifier`` refers to from ``source_file``, if any"""
+        source_dir = os.path.dirname(source_file)
+        is_python = source_file.endswith('.py')
+        key = (source_dir, specifier, is_python)
+        if key not in self._cache:
+            probed = set()
+            if is_python:
+                self._cache[key] = self._resolve_python(source_dir, specifier, probed)
+            else:
+                self._cache[key] = self._resolve_module(source_dir, specifier, probed)
+            self._probed[key] = probed
+            for name in probed:
+                self._keys_by_name.setdefault(name, set()).add(key)
+        return self._cache[key]
+
+    def probed_names(self, source_file: str, specifier: str) -> Set[str]:
+        """Base names resolve() looked up for this import; files named otherwise cannot change its result"""
+        key = (os.path.dirname(source_file), specifier, source_file.endswith('.py'))
+        return self._probed.get(key, set())
+
+    def _resolve_module(self, source_dir: str, specifier: str, probed: Set[str]) -> Optional[str]:
+        """Resolve a JS/TS specifier: relative paths and configured aliases"""
+        if specifier.startswith('.'):
+            return self._probe(os.path.normpath(os.path.join(source_dir, specifier)), probed)
+
+        for pattern, target in self.aliases:
+            if pattern.endswith('*'):
+                prefix = pattern[:-1]
+                if specifier.startswith(prefix):
+                    return self._probe(os.path.normpath(target.replace('*', specifier[len(prefix):])), probed)
+            elif specifier == pattern:
+                return self._probe(target, probed)
+        return None
+
+    def _probe(self, base_path: str, probed: Set[str]) -> Optional[str]:
+        """Look up a path as given, with each extension, then as a directory index"""
+        probed.add(os.path.basename(base_path))
+        if base_path in self.files:
+            return self.files[base_path]
+        for ext in self.extensions:
+            if base_path + ext in self.files:
+                return self.files[base_path + ext]
+        for index_file in self.index_files:
+            index_path = os.path.join(base_path, index_file)
+            if index_path in self.files:
+                return self.files[index_path]
+        return None
+
+    def _resolve_python(self, source_dir: str, specifier: str, probed: Set[str]) -> Optional[str]:
+        """Resolve dotted and relative Python module names"""
+        module = specifier.lstrip('.')
+        level = len(specifier) - len(module)
+        parts = [part for part in module.split('.') if part]
+
+        if level:
+            base_dir = source_dir
+            for _ in range(level - 1):
+                base_dir = os.path.dirname(base_dir)
+            search_dirs = [base_dir]
+        else:
+            # The importing script's directory comes first, as on sys.path
+            search_dirs = [source_dir] + self.python_roots
+
+        for search_dir in search_dirs:
+            base_path = os.path.normpath(os.path.join(search_dir, *parts))
+            found = self._probe_python(base_path, probed)
+            # The last part of 'pkg.name' (from pkg import name) is a submodule only
+            # when pkg is a package holding it; otherwise the import is pkg itself
+            if found is None and (level or len(parts) > 1) and parts:
+                found = self._probe_python(os.path.dirname(base_path), probed)
+            if found is not None:
+                return found
+        return None
+
+    def _probe_python(self, base_path: str, probed: Set[str]) -> Optional[str]:
+        """Look up a Python module path as a module file, then as a package"""
+        probed.add(os.path.basename(base_path))
+        for candidate in (base_path + '.py', os.path.join(base_path, '__init__.py')):
+            if candidate in self.files:
+                return self.files[candidate]
+        return None
+
+class ComplexityAnalyzer:
+    """Complexity metrics from the ast for Python and a token scan for JavaScript/TypeScript"""
+
+    JS_TOKEN = re.compile(
+        r'(?P<comment>//[^\n]*|/\*.*?\*/)'
+        r'|(?P<string>\'(?:\\.|[^\'\\\n])*\'?|"(?:\\.|[^"\\\n])*"?|`(?:\\.|[^`\\])*`?)'
+        r'|(?P<word>[A-Za-z_$][\w$]*)'
+        r'|(?P<optional>\?\.|\?(?=\s*[:),=]))'
+        r'|(?P<op>\?\?|&&|\|\||[{}()?;])',
+        re.DOTALL
+    )
+    PY_TOKEN = re.compile(
+        r'(?P<string>[rRbBuUfF]{0,2}(?:"""(?:\\[\s\S]|[^\\])*?(?:"""|\\?\Z)'
+        r'|\'\'\'(?:\\[\s\S]|[^\\])*?(?:\'\'\'|\\?\Z)'
+        r'|"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?))'
+        r'|(?P<comment>#[^\n]*)'
+    )
+
+    JS_BRANCHES = {'if', 'for', 'while', 'catch', 'case'}
+    JS_STRUCTURES = {'if', 'for', 'while', 'switch', 'catch'}
+    JS_BLOCK_OPENERS = JS_STRUCTURES | {'else', 'do', 'try', 'finally'}
+
+    @classmethod
+    def measure(cls, content: str, language: str) -> Dict[str, float]:
+        """Return cyclomatic/cognitive complexity, nesting depth, LOC and comment ratio"""
+        metrics = {
+            'cyclomatic_complexity': 0,
+            'cognitive_complexity': 0,
+            'nesting_depth': 0,
+            'lines_of_code': len(content.splitlines()),
+            'comment_ratio': 0.0
+        }
+        if language == 'python':
+            metrics.update(cls._measure_python(content))
+        elif language in ('javascript', 'typescript'):
+            metrics.update(cls._measure_js(content))
+        return metrics
+
+    @staticmethod
+    def _comment_ratio(content: str, comment_spans: List[tuple]) -> float:
+        """Share of non-blank lines that hold a comment"""
+        code_lines = sum(1 for line in content.splitlines() if line.strip())
+        if not code_lines:
+            return 0.0
+
+        line_starts = [0] + [match.end() for match in re.finditer('\n', content)]
+        comment_lines = set()
+        for start, end in comment_spans:
+            first = bisect.bisect_right(line_starts, start)
+            last = bisect.bisect_right(line_starts, max(start, end - 1))
+            comment_lines.update(range(first, last + 1))
+        return round(len(comment_lines) / code_lines, 3)
+
+    @classmethod
+    def _measure_python(cls, content: str) -> Dict[str, float]:
+        import ast
+
+        comment_spans = [match.span() for match in cls.PY_TOKEN.finditer(content)
+                         if match.lastgroup == 'comment']
+        metrics = {'comment_ratio': cls._comment_ratio(content, comment_spans)}
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            return metrics
+
+        counts = {'cyclomatic': 1, 'cognitive': 0, 'nesting': 0}
+        loops = (ast.For, ast.AsyncFor, ast.While)
+        functions = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+        match_type = getattr(ast, 'Match', ())
+        # Nodes that can never contain a decision point
+        leaves = (ast.Name, ast.Constant, ast.expr_context, ast.alias, ast.operator,
+                  ast.unaryop, ast.cmpop, ast.boolop, ast.Import, ast.ImportFrom, ast.Pass)
+
+        def structure(nesting: int) -> None:
+            counts['cyclomatic'] += 1
+            counts['cognitive'] += 1 + nesting
+            counts['nesting'] = max(counts['nesting'], nesting + 1)
+
+        def visit_all(nodes, nesting: int, in_function: bool) -> None:
+            for node in nodes:
+                visit(node, nesting, in_function)
+
+        def visit_if(node, nesting: int, in_function: bool) -> None:
+            visit(node.test, nesting, in_function)
+            visit_all(node.body, nesting + 1, in_function)
+            orelse = node.orelse
+            if len(orelse) == 1 and isinstance(orelse[0], ast.If):
+                # elif: one flat increment, nested at the same level as its if
+                counts['cyclomatic'] += 1
+                counts['cognitive'] += 1
+                visit_if(orelse[0], nesting, in_function)
+            elif orelse:
+                counts['cognitive'] += 1
+                visit_all(orelse, nesting + 1, in_function)
+
+        def visit(node, nesting: int, in_function: bool) -> None:
+            if isinstance(node, leaves):
+                return
+            if isinstance(node, ast.If):
+                structure(nesting)
+                visit_if(node, nesting, in_function)
+            elif isinstance(node, loops):
+                structure(nesting)
+                for header in ('target', 'iter', 'test'):
+                    if hasattr(node, header):
+                        visit(getattr(node, header), nesting, in_function)
+                visit_all(node.body, nesting + 1, in_function)
+                if node.orelse:
+                    counts['cognitive'] += 1
+                    visit_all(node.orelse, nesting + 1, in_function)
+            elif isinstance(node, ast.ExceptHandler):
+                structure(nesting)
+                visit_all(node.body, nesting + 1, in_function)
+            elif isinstance(node, ast.IfExp):
+                structure(nesting)
+                visit_all((node.test, node.body, node.orelse), nesting + 1, in_function)
+            elif match_type and isinstance(node, match_type):
+                counts['cognitive'] += 1 + nesting
+                counts['cyclomatic'] += len(node.cases)
+                counts['nesting'] = max(counts['nesting'], nesting + 1)
+                visit(node.subject, nesting, in_function)
+                for case in node.cases:
+                    visit_all(case.body, nesting + 1, in_function)
+            elif isinstance(node, ast.BoolOp):
+                counts['cyclomatic'] += len(node.values) - 1
+                counts['cognitive'] += 1
+                visit_all(node.values, nesting, in_function)
+            elif isinstance(node, ast.comprehension):
+                counts['cyclomatic'] += 1 + len(node.ifs)
+                visit_all(ast.iter_child_nodes(node), nesting, in_function)
+            elif isinstance(node, functions):
+                # Only functions nested in other functions add nesting
+                inner = nesting + 1 if in_function else nesting
+                visit_all(ast.iter_child_nodes(node), inner, True)
+            else:
+                visit_all(ast.iter_child_nodes(node), nesting, in_function)
+
+        try:
+            visit(tree, 0, False)
+        except RecursionError:
+            return metrics
+
+        metrics.update({
+            'cyclomatic_complexity': counts['cyclomatic'],
+            'cognitive_complexity': counts['cognitive'],
+            'nesting_depth': counts['nesting']
+        })
+        return metrics
+
+    @staticmethod
+    def _mask_unclosed_comments(content: str) -> str:
+        """Blank every '/*' after the last '*/', which JS_TOKEN would otherwise scan on from"""
+        last_close = content.rfind('*/')
+        tail = last_close + 2 if last_close != -1 else 0
+        if content.find('/*', tail) == -1:
+            return content
+        return content[:tail] + content[tail:].replace('/*', '/ ')
+
+    @classmethod
+    def _measure_js(cls, content: str) -> Dict[str, float]:
+        tokens = [(match.lastgroup, match.group(), match.span())
+                  for match in cls.JS_TOKEN.finditer(cls._mask_unclosed_comments(content))]
+        comment_spans = [span for kind, _, span in tokens if kind == 'comment']
+        tokens = [(kind, text) for kind, text, _ in tokens if kind in ('word', 'op')]
+
+        cyclomatic, cognitive, max_nesting = 1, 0, 0
+        # One entry per open brace: True when it opened a control structure's block
+        braces: List[bool] = []
+        nesting = 0
+        parens = 0
+        block_pending = False
+        last_logical = None
+
+        for index, (kind, text) in enumerate(tokens):
+            if kind == 'word':
+                previous = tokens[index - 1][1] if index else None
+                if text == 'if' and previous == 'else':
+                    # else if: one flat increment, no nesting penalty
+                    cyclomatic += 1
+                    cognitive += 1
+                elif text in cls.JS_STRUCTURES:
+                    cognitive += 1 + nesting
+                    if text in cls.JS_BRANCHES:
+                        cyclomatic += 1
+                elif text == 'case':
+                    cyclomatic += 1
+                elif text == 'else':
+                    following = tokens[index + 1][1] if index + 1 < len(tokens) else None
+                    if following != 'if':
+                        cognitive += 1
+                if text in cls.JS_BLOCK_OPENERS:
+                    block_pending = True
+            elif text == '{':
+                braces.append(block_pending)
+                if block_pending:
+                    nesting += 1
+                    max_nesting = max(max_nesting, nesting)
+                block_pending = False
+                last_logical = None
+            elif text == '}':
+                if braces and braces.pop():
+                    nesting -= 1
+                last_logical = None
+            elif text == '?':
+                cyclomatic += 1
+                cognitive += 1 + nesting
+            elif text in ('&&', '||', '??'):
+                cyclomatic += 1
+                if text != last_logical:
+                    cognitive += 1
+                last_logical = text
+            else:
+                if text == '(':
+                    parens += 1
+                elif text == ')':
+                    parens = max(0, parens - 1)
+                elif parens == 0:
+                    # A statement ended before any block opened, e.g. if (x) return;
+                    block_pending = False
+                last_logical = None
+
+        return {
+            'cyclomatic_complexity': cyclomatic,
+            'cognitive_complexity': cognitive,
+            'nesting_depth': max_nesting,
+            'comment_ratio': cls._comment_ratio(content, comment_spans)
+        }
+
+class DependencyGraph:
+    """Directed import graph between files with incrementally maintained cycle detection"""
+
+    def __init__(self):
+        self.edges: Dict[str, List[str]] = {}
+        self.reverse_edges: Dict[str, Set[str]] = {}
+        # Node -> its component, a set shared by all members; None until first needed
+        self._components: Optional[Dict[str, Set[str]]] = None
+        self._cyclic: Set[str] = set()
+
+    def set_edges(self, node: str, targets: List[str]) -> None:
+        """Replace the outgoing edges of ``node``"""
+        old_targets = self.edges.get(node, ())
+        for target in old_targets:
+            self.reverse_edges[target].discard(node)
+            if not self.reverse_edges[target]:
+                del self.reverse_edges[target]
+
+        unique_targets = list(dict.fromkeys(targets))
+        self.edges[node] = unique_targets
+        for target in unique_targets:
+            self.reverse_edges.setdefault(target, set()).add(node)
+
+        if self._components is not None:
+            self._update_components(node, old_targets, unique_targets)
+
+    def remove_node(self, node: str) -> None:
+        """Drop a node's outgoing edges; edges into it go once importers are updated"""
+        self.set_edges(node, [])
+        del self.edges[node]
+        if not self.reverse_edges.get(node):
+            self.reverse_edges.pop(node, None)
+            self._forget(node)
+
+    def nodes(self) -> Set[str]:
+        """All files that import or are imported"""
+        return set(self.edges) | set(self.reverse_edges)
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """Tarjan's algorithm in O(V+E), returning components sinks first"""
+        return self._tarjan(self.edges)
+
+    def _tarjan(self, roots, within: Optional[Set[str]] = None) -> List[List[str]]:
+        """Components reachable from ``roots``, following only edges into ``within`` if given"""
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components = []
+
+        def successors_of(node: str):
+            targets = self.edges.get(node, ())
+            if within is None:
+                return iter(targets)
+            return (target for target in targets if target in within)
+
+        for root in roots:
+            if root in index:
+                continue
+
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            # Explicit work stack so deep import chains don't hit the recursion limit
+            work = [(root, successors_of(root))]
+
+            while work:
+                node, successors = work[-1]
+                for succ in successors:
+                    if succ not in index:
+                        index[succ] = lowlink[succ] = len(index)
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, successors_of(succ)))
+                        break
+                    if succ in on_stack:
+                        lowlink[node] = min(lowlink[node], index[succ])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        return components
+
+    def cycles(self) -> List[List[str]]:
+        """Components that form an import cycle, including self-imports"""
+        return [
+            component for component in self.strongly_connected_components()
+            if len(component) > 1 or component[0] in self.edges.get(component[0], ())
+        ]
+
+    def circular_nodes(self) -> Set[str]:
+        """Files that take part in at least one import cycle"""
+        if self._components is None:
+            self._components = {}
+            self._cyclic = set()
+            for component in self.strongly_connected_components():
+                self._assign_component(set(component))
+        return set(self._cyclic)
+
+    def _update_components(self, node: str, old_targets: List[str], new_targets: List[str]) -> None:
+        """Bring the maintained components up to date after ``node``'s edges changed"""
+        components = self._components
+        for member in (node, *new_targets):
+            if member not in components:
+                components[member] = {member}
+
+        kept = set(new_targets)
+        component = components[node]
+        dropped = {target for target in old_targets if target in component and target not in kept}
+        if dropped and not self._reaches_all(node, dropped):
+            # A dropped edge the component cannot route around splits it
+            for part in self._tarjan(component, within=component):
+                self._assign_component(set(part))
+
+        previous = set(old_targets)
+        for target in new_targets:
+            if target not in previous:
+                self._merge_cycle(node, target)
+        if len(components[node]) == 1:
+            # A lone file is cyclic only while it imports itself
+            self._assign_component(components[node])
+
+        for target in old_targets:
+            if target not in kept and target not in self.edges and target not in self.reverse_edges:
+                self._forget(target)
+
+    def _reaches_all(self, source: str, targets: Set[str]) -> bool:
+        """Whether ``source`` still reaches every one of ``targets``, stopping once it does"""
+        remaining = set(targets)
+        remaining.discard(source)
+        seen = {source}
+        pending = [source]
+        while pending and remaining:
+            for succ in self.edges.get(pending.pop(), ()):
+                if succ not in seen:
+                    seen.add(succ)
+                    remaining.discard(succ)
+                    pending.append(succ)
+        return not remaining
+
+    def _merge_cycle(self, source: str, target: str) -> None:
+        """Merge the components on the cycle a new ``source`` -> ``target`` edge closes, if any"""
+        components = self._components
+        source_component, target_component = components[source], components[target]
+        if source_component is target_component:
+            return
+
+        # Search forward from target and backward from source in lockstep, so
+        # the cheaper side decides whether target reaches source. Neither
+        # search passes through the other end's component: anything reached
+        # beyond it that leads back is already a member.
+        forward, backward = {target}, {source}
+        forward_pending, backward_pending = [target], [source]
+        while forward_pending and backward_pending:
+            node = forward_pending.pop()
+            if node not in source_component:
+                for succ in self.edges.get(node, ()):
+                    if succ not in forward:
+                        forward.add(succ)
+                        forward_pending.append(succ)
+            node = backward_pending.pop()
+            if node not in target_component:
+                for importer in self.reverse_edges.get(node, ()):
+                    if importer not in backward:
+                        backward.add(importer)
+                        backward_pending.append(importer)
+
+        # Every node on a path from target back to source joins the component
+        if not forward_pending:
+            hits = forward & source_component
+            if not hits:
+                return
+            merged = self._closure(hits, self.reverse_edges, forward, target_component)
+        else:
+            hits = backward & target_component
+            if not hits:
+                return
+            merged = self._closure(hits, self.edges, backward, source_component)
+
+        # Grow the larger component in place so only the newcomers are reassigned
+        base, other = sorted((source_component, target_component), key=len, reverse=True)
+        newcomers = (merged | other) - base
+        was_cyclic = next(iter(base)) in self._cyclic
+        base |= newcomers
+        self._assign_component(base, newcomers if was_cyclic else base)
+
+    @staticmethod
+    def _closure(starts, adjacency: Dict, within: Set[str], stop: Set[str]) -> Set[str]:
+        """``starts`` plus the nodes reachable from them inside ``within``, not expanding ``stop``"""
+        seen = set(starts)
+        pending = list(seen)
+        while pending:
+            node = pending.pop()
+            if node in stop:
+                continue
+            for succ in adjacency.get(node, ()):
+                if succ in within and succ not in seen:
+                    seen.add(succ)
+                    pending.append(succ)
+        return seen
+
+    def _assign_component(self, component: Set[str], members: Optional[Set[str]] = None) -> None:
+        """Record ``component`` for ``members`` (all by default) and whether it forms a cycle"""
+        members = component if members is None else members
+        for member in members:
+            self._components[member] = component
+        member = next(iter(component))
+        if len(component) > 1 or member in self.edges.get(member, ()):
+            self._cyclic |= members
+        else:
+            self._cyclic.discard(member)
+
+    def _forget(self, node: str) -> None:
+        """Drop a node that no longer has any edges from the maintained components"""
+        if self._components is not None:
+            self._components.pop(node, None)
+            self._cyclic.discard(node)
+
+    def transitive_dependencies(self, node: str) -> Set[str]:
+        """Everything ``node`` imports directly or indirectly"""
+        return self._reachable(node, self.edges)
+
+    def transitive_dependents(self, node: str) -> Set[str]:
+        """Everything that imports ``node`` directly or indirectly"""
+        return self._reachable(node, self.reverse_edges)
+
+    def impacted(self, nodes) -> Set[str]:
+        """``nodes`` plus everything importing any of them directly or indirectly"""
+        seen: Set[str] = set()
+        pending = list(nodes)
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            pending.extend(self.reverse_edges.get(current, ()))
+        return seen
+
+    @staticmethod
+    def _reachable(node: str, adjacency: Dict) -> Set[str]:
+        """Nodes reachable from ``node`` in one traversal, excluding itself unless cyclic"""
+        seen: Set[str] = set()
+        pending = list(adjacency.get(node, ()))
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            pending.extend(adjacency.get(current, ()))
+        return seen
+
+class HistoryStore:
+    """Append-only JSON Lines log of per-run deltas, storing metadata once per content blob"""
+
+    # Blob lines start with a fixed prefix so loading can skip parsing them
+    BLOB_PREFIX = b'{"type": "blob", "key": "'
+
+    # Fields that differ between copies of the same content
+    PATH_FIELDS = ('path', 'last_modified')
+
+    def __init__(self, path: str, max_runs: int = 10):
+        self.path = path
+        self.max_runs = max_runs
+        self.runs: List[Dict] = []
+        self._run_offsets: List[int] = []
+        self._blob_offsets: Dict[str, int] = {}
+        self._head: Dict[str, list] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """Index blob and run offsets and replay runs into the latest file state"""
+        self.runs, self._run_offsets, self._blob_offsets, self._head = [], [], {}, {}
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Left by a run interrupted mid-append
+                    break
+                if line.startswith(self.BLOB_PREFIX):
+                    start = len(self.BLOB_PREFIX)
+                    key = line[start:line.index(b'"', start)].decode()
+                    self._blob_offsets[key] = offset
+                elif line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None
+                    if record is not None:
+                        self._apply_run(self._head, record)
+                        self.runs.append({'timestamp': record['timestamp'], 'changes': record['changes']})
+                        self._run_offsets.append(offset)
+                offset += len(line)
+
+        if offset < os.path.getsize(self.path):
+            # Drop the partial record so the next append starts on a line of its own
+            try:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(offset)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _apply_run(state: Dict[str, list], record: Dict) -> None:
+        state.update(record['set'])
+        for path in record['removed']:
+            state.pop(path, None)
+
+    @staticmethod
+    def blob_key(metadata: Dict) -> str:
+        return f"{metadata['hash']}:{metadata['language']}"
+
+    def latest_hashes(self) -> Dict[str, str]:
+        """Content hash per path as of the most recent run"""
+        return {path: key.split(':', 1)[0] for path, (key, _) in self._head.items()}
+
+    def latest_keys(self) -> Dict[str, str]:
+        """Blob key per path as of the most recent run"""
+        return {path: key for path, (key, _) in self._head.items()}
+
+    def load_blob(self, key: str) -> Optional[Dict]:
+        """Read the stored metadata for one content blob"""
+        offset = self._blob_offsets.get(key)
+        if offset is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())['data']
+
+    def snapshot(self, index: int = -1) -> Dict[str, Dict]:
+        """Rebuild the full per-file metadata recorded by run ``index``"""
+        run_count = len(self._run_offsets)
+        if index < 0:
+            index += run_count
+        if not 0 <= index < run_count:
+            raise IndexError(f"no history run {index}")
+
+        state: Dict[str, list] = {}
+        blobs: Dict[str, Dict] = {}
+        with open(self.path, 'rb') as f:
+            for offset in self._run_offsets[:index + 1]:
+                f.seek(offset)
+                self._apply_run(state, json.loads(f.readline()))
+            for key in {key for key, _ in state.values()}:
+                f.seek(self._blob_offsets[key])
+                blobs[key] = json.loads(f.readline())['data']
+
+        return {
+            path: {'path': path, 'last_modified': mtime, **blobs[key]}
+            for path, (key, mtime) in state.items()
+        }
+
+    def append(self, files: Dict[str, Dict], timestamp: str, changes: Dict) -> None:
+        """Record a run given asdict-style metadata (or FileMetadataView) for every current file"""
+        lines = []
+        changed = {}
+        for path, metadata in files.items():
+            key = self.blob_key(metadata)
+            entry = [key, metadata['last_modified']]
+            if self._head.get(path) == entry:
+                continue
+            changed[path] = entry
+            if key not in self._blob_offsets:
+                data = {k: v for k, v in metadata.items() if k not in self.PATH_FIELDS}
+                lines.append(('blob', key, json.dumps({'type': 'blob', 'key': key, 'data': data})))
+
+        removed = [path for path in self._head if path not in files]
+        run = {'type': 'run', 'timestamp': timestamp, 'set': changed, 'removed': removed, 'changes': changes}
+        lines.append(('run', None, json.dumps(run)))
+
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            for kind, key, line in lines:
+                encoded = line.encode() + b'\n'
+                if kind == 'blob':
+                    self._blob_offsets[key] = offset
+                else:
+                    self._run_offsets.append(offset)
+                f.write(encoded)
+                offset += len(encoded)
+
+        self._apply_run(self._head, run)
+        self.runs.append({'timestamp': timestamp, 'changes': changes})
+
+        # Compacting only once the log holds twice the retained runs keeps it amortized O(changes)
+        if self.max_runs and len(self.runs) > 2 * self.max_runs:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the log keeping the last ``max_runs`` runs and the blobs they use"""
+        keep_from = max(0, len(self.runs) - self.max_runs)
+        base = self.snapshot(keep_from)
+        tmp_path = f"{self.path}.tmp"
+
+        with open(self.path, 'rb') as source, open(tmp_path, 'wb') as f:
+            records = []
+            for offset in self._run_offsets[keep_from + 1:]:
+                source.seek(offset)
+                records.append(json.loads(source.readline()))
+
+            base_run = self.runs[keep_from]
+            first = {
+                'type': 'run',
+                'timestamp': base_run['timestamp'],
+                'set': {path: [self.blob_key(meta), meta['last_modified']] for path, meta in base.items()},
+                'removed': [],
+                'changes': base_run['changes']
+            }
+
+            keys = {key for key, _ in first['set'].values()}
+            for record in records:
+                keys.update(key for key, _ in record['set'].values())
+            for key in sorted(keys):
+                source.seek(self._blob_offsets[key])
+                f.write(source.readline())
+
+            for record in [first] + records:
+                f.write(json.dumps(record).encode() + b'\n')
+
+        os.replace(tmp_path, self.path)
+        self._load()
+
+class SymbolIndex:
+    """Inverted indexes answering where symbols are defined and who imports what"""
+
+    VERSION = 1
+    KINDS = {'function': 'functions', 'class': 'classes', 'export': 'exports'}
+
+    def __init__(self, root_dir: Optional[str] = None):
+        self.root_dir = root_dir
+        self.definitions: Dict[str, Dict[str, List[str]]] = {kind: {} for kind in self.KINDS}
+        self.modules: Dict[str, List[str]] = {}
+        self.importers: Dict[str, List[str]] = {}
+
+    @classmethod
+    def build(cls, file_metadata, dependency_tree: Dict[str, List[str]],
+              root_dir: Optional[str] = None, fields: Optional[Tuple[str, ...]] = None) -> 'SymbolIndex':
+        """Index the symbols and imports of every analyzed file, limited to ``fields`` when given"""
+        index = cls(root_dir)
+        # Kinds outside the extraction tier stay empty instead of forcing deferred loads
+        kinds = [(kind, field_name) for kind, field_name in cls.KINDS.items()
+                 if fields is None or field_name in fields]
+        for path, metadata in file_metadata.items():
+            for kind, field_name in kinds:
+                symbols = index.definitions[kind]
+                for name in dict.fromkeys(getattr(metadata, field_name)):
+                    symbols.setdefault(name, []).append(path)
+            for specifier in dict.fromkeys(metadata.dependencies):
+                index.modules.setdefault(specifier, []).append(path)
+
+        for path, dependencies in dependency_tree.items():
+            for dependency in dependencies:
+                index.importers.setdefault(dependency, []).append(path)
+        return index
+
+    def find_definitions(self, name: str, kind: Optional[str] = None) -> Dict[str, List[str]]:
+        """Files defining ``name``, per kind, optionally restricted to one kind"""
+        kinds = [kind] if kind else list(self.KINDS)
+        return {k: self.definitions[k][name] for k in kinds if name in self.definitions[k]}
+
+    def find_importers(self, module: str) -> List[str]:
+        """Files importing ``module``, given as a file path or a raw import specifier"""
+        found = dict.fromkeys(self.modules.get(module, ()))
+        found.update(dict.fromkeys(self.importers.get(self._absolute(module), ())))
+        return list(found)
+
+    def impacted_files(self, paths: List[str]) -> List[str]:
+        """``paths`` plus every file importing them directly or indirectly, sorted"""
+        seen = set()
+        pending = [self._absolute(path) for path in paths]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            pending.extend(self.importers.get(current, ()))
+        return sorted(seen)
+
+    def _absolute(self, path: str) -> str:
+        """Normalize a file path, joining relative ones with the indexed root"""
+        if self.root_dir and not os.path.isabs(path):
+            path = os.path.join(self.root_dir, path)
+        return os.path.normpath(path)
+
+    def save(self, path: str) -> None:
+        """Write the index as JSON, replacing any previous one atomically"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.VERSION,
+                'root': self.root_dir,
+                'definitions': self.definitions,
+                'modules': self.modules,
+                'importers': self.importers
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SymbolIndex':
+        """Read an index written by ``save``"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"unsupported symbol index version {data.get('version')}")
+
+        index = cls(data['root'])
+        index.definitions = data['definitions']
+        index.modules = data['modules']
+        index.importers = data['importers']
+        return index
+
+class ExtractionCache:
+    """Content-addressed SQLite cache of extraction results, shared between processes"""
+
+    # Access times are refreshed at most this often so warm runs stay read-only
+    TOUCH_INTERVAL = 24 * 60 * 60
+
+    def __init__(self, path: str, version: str, max_bytes: int):
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        import threading
+        self._local = threading.local()
+
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS extractions ('
+            ' hash TEXT NOT NULL, language TEXT NOT NULL, version TEXT NOT NULL,'
+            ' data TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL,'
+            ' PRIMARY KEY (hash, language, version)) WITHOUT ROWID'
+        )
+        self._connect().execute(
+            'CREATE INDEX IF NOT EXISTS extractions_last_access ON extractions (last_access)'
+        )
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            import sqlite3
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def get(self, file_hash: str, language: str) -> Optional[Dict]:
+        """Cached content fields for a blob, or None"""
+        connection = self._connect()
+        row = connection.execute(
+            'SELECT data, last_access FROM extractions WHERE hash = ? AND language = ? AND version = ?',
+            (file_hash, language, self.version)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row[1] > self.TOUCH_INTERVAL:
+            connection.execute(
+                'UPDATE extractions SET last_access = ? WHERE hash = ? AND language = ? AND version = ?',
+                (now, file_hash, language, self.version)
+            )
+        return json.loads(row[0])
+
+    def put(self, file_hash: str, language: str, fields: Dict) -> None:
+        """Store the content fields extracted for a blob"""
+        data = json.dumps(fields)
+        self._connect().execute(
+            'INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?, ?, ?)',
+            (file_hash, language, self.version, data, len(data), time.time())
+        )
+
+    def prune(self) -> None:
+        """Evict least recently used entries until the cache fits in max_bytes"""
+        connection = self._connect()
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM extractions').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to 90% so pruning is not needed again on the next run
+        excess = total - int(self.max_bytes * 0.9)
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            rows = connection.execute(
+                'SELECT hash, language, version, size FROM extractions ORDER BY last_access'
+            )
+            victims = []
+            for file_hash, language, version, size in rows:
+                if excess <= 0:
+                    break
+                victims.append((file_hash, language, version))
+                excess -= size
+            connection.executemany(
+                'DELETE FROM extractions WHERE hash = ? AND language = ? AND version = ?', victims
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+class PollingWatcher:
+    """Detects file changes by comparing stat signatures between tree walks"""
+
+    def __init__(self, analyzer: 'UniversalCodebaseAnalyzer', root_dir: str):
+        self.analyzer = analyzer
+        self.root_dir = root_dir
+        self.signatures = self._stat_all()
+
+    def _stat_all(self) -> Dict[str, tuple]:
+        self.analyzer._walk_cache = None
+        signatures = {}
+        for file_path in self.analyzer._iter_source_files(self.root_dir):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            signatures[file_path] = (stat.st_mtime, stat.st_size)
+        return signatures
+
+    def drain(self) -> Set[str]:
+        """Paths added, modified or deleted since the previous call"""
+        current = self._stat_all()
+        dirty = {path for path, signature in current.items() if self.signatures.get(path) != signature}
+        dirty.update(path for path in self.signatures if path not in current)
+        self.signatures = current
+        return dirty
+
+    def stop(self) -> None:
+        pass
+
+class EventWatcher:
+    """Collects paths from filesystem events using the optional watchdog package"""
+
+    # Directory events that can add or remove files without an event per file
+    DIRECTORY_EVENTS = ('created', 'deleted', 'moved')
+
+    def __init__(self, analyzer: 'UniversalCodebaseAnalyzer', root_dir: str):
+        import threading
+        from watchdog.observers import Observer
+        self.analyzer = analyzer
+        self._lock = threading.Lock()
+        self._dirty: Set[str] = set()
+        self._dirty_dirs: Set[str] = set()
+        self._observer = Observer()
+        self._observer.schedule(self, root_dir, recursive=True)
+        self._observer.start()
+
+    def dispatch(self, event) -> None:
+        """Called by the observer thread for every event"""
+        if event.is_directory and event.event_type not in self.DIRECTORY_EVENTS:
+            return
+        paths = [event.src_path, getattr(event, 'dest_path', None)]
+        with self._lock:
+            dirty = self._dirty_dirs if event.is_directory else self._dirty
+            dirty.update(os.fsdecode(path) for path in paths if path)
+
+    def drain(self) -> Set[str]:
+        """Paths with events since the previous call, with files under moved or removed directories"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            directories, self._dirty_dirs = self._dirty_dirs, set()
+        for directory in directories:
+            prefix = os.path.join(directory, '')
+            dirty.update(path for path in self.analyzer.file_metadata if path.startswith(prefix))
+            # Files moved in with their directory raise no events of their own
+            for root, files in self.analyzer._walk_directories(directory):
+                dirty.update(os.path.join(root, name) for name in files)
+        return dirty
+
+    def stop(self) -> None:
+        self._observer.stop()
+        self._observer.join()
+
 class UniversalCodebaseAnalyzer:
     """Analyzes any codebase and maintains development context"""
 
-    # Language-specific patterns
+    # Language-specific patterns. Keep them linear in the content: no adjacent
+    # repeats that can match the same characters (\s*(?:=\s*)? rather than
+    # \s*=?\s*), and repeats that stop where another match could start
+    # ([^\[\]]+ rather than [^\]]+), so failed attempts never overlap
     PATTERNS = {
         'javascript': {
             'import': r'(?:import|require)\s*\(?[\'"]([^\'"]+)[\'"]',
             'export': r'export\s+(?:default\s+)?(?:class|function|const|let|var)\s+([A-Za-z0-9_]+)',
-            'function': r'(?:function|const|let|var)\s+([A-Za-z0-9_]+)\s*=?\s*(?:\(|=>)',
+            'function': r'(?:function|const|let|var)\s+([A-Za-z0-9_]+)\s*(?:=\s*)?(?:\(|=>)',
             'class': r'class\s+([A-Za-z0-9_]+)',
         },
         'python': {
-            'import': r'(?:from|import)\s+([A-Za-z0-9_.]+)',
-            'export': r'__all__\s*=\s*\[([^\]]+)\]',
+            # 'from X import Y' is one specifier, 'X.Y', resolved to the submodule when X is a package
+            'import': r'(?:from\s+([A-Za-z0-9_.]+)\s+)?import\s+\(?\s*([A-Za-z0-9_.]+|\*)',
+            'export': r'__all__\s*=\s*\[([^\[\]]+)\]',
             'function': r'def\s+([A-Za-z0-9_]+)',
             'class': r'class\s+([A-Za-z0-9_]+)',
         },
         'typescript': {
             'import': r'(?:import|require)\s*\(?[\'"]([^\'"]+)[\'"]',
             'export': r'export\s+(?:default\s+)?(?:class|function|const|let|var|interface|type)\s+([A-Za-z0-9_]+)',
-            'function': r'(?:function|const|let|var)\s+([A-Za-z0-9_]+)\s*=?\s*(?:\(|=>)',
+            'function': r'(?:function|const|let|var)\s+([A-Za-z0-9_]+)\s*(?:=\s*)?(?:\(|=>)',
             'class': r'(?:class|interface)\s+([A-Za-z0-9_]+)',
         }
     }
 
+    # Opening and closing delimiters of doc comments, scanned by DelimitedScanner
+    DOC_DELIMITERS = {
+        'python': ('"""', '"""'),
+        'javascript': ('/**', '*/'),
+        'typescript': ('/**', '*/')
+    }
+
+    # Literals every match of the corresponding pattern starts with, used to
+    # skip patterns that cannot match; keep in sync with PATTERNS and DOC_DELIMITERS
+    TRIGGERS = {
+        'javascript': {
+            'import': ('import', 'require'),
+            'export': ('export',),
+            'function': ('function', 'const', 'let', 'var'),
+            'class': ('class',),
+            'doc': ('/**',),
+        },
+        'python': {
+            'import': ('from', 'import'),
+            'export': ('__all__',),
+            'function': ('def',),
+            'class': ('class',),
+            'doc': ('"""',),
+        },
+        'typescript': {
+            'import': ('import', 'require'),
+            'export': ('export',),
+            'function': ('function', 'const', 'let', 'var'),
+            'class': ('class', 'interface'),
+            'doc': ('/**',),
+        }
+    }
+
+    # Files marking a project root, in detection priority order
+    PROJECT_INDICATORS = {
+        'package.json': 'node',
+        'setup.py': 'python',
+        'pom.xml': 'java',
+        'cargo.toml': 'rust',
+        'go.mod': 'go',
+        'composer.json': 'php'
+    }
+
+    # Filename globs of files listed as project configuration, in report order
+    CONFIG_PATTERNS = [
+        '*.json',
+        '*.yaml',
+        '*.yml',
+        '*.toml',
+        '*.ini',
+        '*.cfg',
+        '.env*',
+        '.git*',
+        'requirements.txt',
+        'setup.cfg',
+        'tox.ini',
+        'Dockerfile',
+        'docker-compose.yml'
+    ]
+
+    # Matches vite resolve.alias entries such as '@': path.resolve(__dirname, './src')
+    VITE_ALIAS_PATTERN = re.compile(
+        r'[\'"]?([@~$\w][\w@~$/.-]*)[\'"]?\s*:\s*(?:'
+        r'(?:path\.)?(?:resolve|join)\(\s*__dirname\s*,\s*[\'"]([^\'"]+)[\'"]\s*\)'
+        r'|fileURLToPath\(\s*new\s+URL\(\s*[\'"]([^\'"]+)[\'"]'
+        r')'
+    )
+
+    # Compiled PatternExtractor per language, shared by all instances
+    _extractors: Dict[str, Optional['PatternExtractor']] = {}
+
+    # Bumped whenever ComplexityAnalyzer output changes
+    COMPLEXITY_VERSION = 2
+
+    # Bumped whenever the cached FileMetadata layout changes
+    CACHE_VERSION = 6
+
+    # Below this many files the 'auto' executor uses threads instead of processes
+    PROCESS_POOL_MIN_FILES = 500
+
+    # FileMetadata fields each 'extraction_tier' extracts during the scan and
+    # writes to reports; the others are extracted when first accessed
+    EXTRACTION_TIERS = {
+        'deps': ('dependencies',),
+        'symbols': ('dependencies', 'exports', 'functions', 'classes'),
+        'full': ('dependencies', 'exports', 'doc_strings', 'functions', 'classes', 'complexity'),
+    }
+
     def __init__(self, config_path: str = None):
         """Initialize with optional custom configuration"""
         self.config = self._load_config(config_path)
-        self.file_metadata: Dict[str, FileMetadata] = {}
+        self.file_metadata = MetadataStore(loader=self._extract_deferred_fields)
         self.project_context: Optional[ProjectContext] = None
         self.history: List[Dict] = []
+        self.history_store: Optional[HistoryStore] = None
+        self._extraction_cache: Optional[ExtractionCache] = None
+        self.symbol_index: Optional[SymbolIndex] = None
+        self._git_untracked: Optional[Set[str]] = None
+        self.metrics: Optional[RunMetrics] = None
+        # Blob keys of the previous run, captured before this run is recorded
+        self._history_baseline: Optional[Dict[str, str]] = None
+        self._cache_changes: Optional[Dict] = None
+        self.dependency_graph = DependencyGraph()
+        self.dependency_tree: Dict[str, List[str]] = {}
+        self.circular_dependencies: Set[str] = set()
+        self.root_dir: Optional[str] = None
+        self.import_resolver: Optional[ImportResolver] = None
+        # (root, source files, config files, directories holding a project indicator)
+        self._walk_cache: Optional[Tuple[str, List[str], List[str], List[str]]] = None
+        # Directory -> mtime from the last filesystem walk, when the scan keeps a cache
+        self._dir_mtimes: Optional[Dict[str, float]] = None
+        # Workspace (monorepo) mode: package directory -> analyzer, and the
+        # workspace analyzer a package belongs to
+        self.packages: Dict[str, 'UniversalCodebaseAnalyzer'] = {}
+        self.workspace: Optional['UniversalCodebaseAnalyzer'] = None
+        self._package_dirs: Set[str] = set()
+        self._package_owners: Dict[str, str] = {}
+        # Importing files by the base names their imports probed, and the reverse
+        self._importers_by_name: Dict[str, Set[str]] = {}
+        self._import_names: Dict[str, Set[str]] = {}
 
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from file or use defaults"""
@@ -78,9 +1684,45 @@ class UniversalCodebaseAnalyzer:
                 '.DS_Store', '*.pyc', '*.pyo', '*.pyd', '*.so', '*.dylib',
                 '*.log', '*.pot', '*.pid', '*.swp', '.env', '*.lock'
             },
-            'max_file_size': 1024 * 1024,  # 1MB
+            'max_file_size': 1024 * 1024,  # 1MB; larger files are hashed but not parsed
+            # Seconds of extraction per file; slower files are kept hash-only like
+            # oversized ones and listed in the report. None disables the budget
+            'extraction_time_budget': 5.0,
+            'hash_algorithm': 'md5',  # any hashlib name, e.g. 'blake2b' or 'sha1'
+            'mmap_threshold': 256 * 1024,  # memory-map files at least this large
             'track_history': True,
-            'history_file': '.codebase_history.json',
+            'history_file': '.codebase_history.jsonl',
+            'history_limit': 10,  # runs kept when the log is compacted
+            'report_format': 'json',  # 'json', 'compact' or 'ndjson'
+            'report_compress': False,
+            'complexity_metrics': True,
+            # Fields extracted up front and reported: 'deps' (inventory and the
+            # dependency graph), 'symbols' (plus exports, functions, classes) or
+            # 'full'; other fields are extracted only if accessed
+            'extraction_tier': 'full',
+            'symbol_index': True,  # write <report>.index.json for queries
+            'profile': False,  # add phase timings and hot spots to the report
+            'profile_top': 10,  # slowest files and patterns listed
+            'profile_output': None,  # write a cProfile dump of analyze_project here
+            # Shared SQLite cache of extraction results keyed by content hash,
+            # e.g. '~/.cache/codebase-analyzer/extractions.sqlite'; off when empty
+            'extraction_cache': None,
+            'extraction_cache_max_bytes': 256 * 1024 * 1024,
+            'watch_backend': 'auto',  # 'auto', 'watchdog' or 'poll'
+            'watch_interval': 0.5,  # seconds between checks when idle
+            'watch_debounce': 0.2,  # quiet period that ends a burst of changes
+            'incremental': False,
+            # 'git' lists files with git ls-files (honouring .gitignore) and only
+            # re-checks files git reports as changed since the last run
+            'change_detection': 'stat',
+            'cache_file': '.codebase_cache.json',
+            'resolve_extensions': ['.js', '.jsx', '.ts', '.tsx', '.py'],
+            'resolve_index_files': ['index.js', 'index.jsx', 'index.ts', 'index.tsx'],
+            'path_aliases': {},  # e.g. {'@': 'src'}, relative to the project root
+            'workers': 1,  # 0 means one worker per CPU
+            'executor': 'auto',  # 'process', 'thread', 'pipeline' or 'auto'
+            'read_concurrency': 32,  # pipeline: files stat'ed and read at once
+            'pipeline_queue_size': 64,  # pipeline: read files waiting for extraction
             'languages': {
                 '.py': 'python',
                 '.js': 'javascript',
@@ -101,6 +1743,7 @@ class UniversalCodebaseAnalyzer:
         }
 
         if config_path and os.path.exists(config_path):
+            import yaml
             with open(config_path, 'r') as f:
                 user_config = yaml.safe_load(f)
                 if user_config:
@@ -117,93 +1760,1193 @@ class UniversalCodebaseAnalyzer:
 
     def analyze_project(self, root_dir: str) -> None:
         """Analyze entire project and generate context"""
-        self.project_context = self._detect_project_type(root_dir)
-        self._scan_files(root_dir)
-        self._analyze_dependencies()
-        if self.config['track_history']:
-            self._update_history()
-
-    def generate_report(self, output_path: str) -> None:
+        self.root_dir = root_dir
+        self._walk_cache = None
+        self._history_baseline = None
+        self.metrics = RunMetrics(self.config['profile_top']) if self.config['profile'] else None
+
+        with self._profiled():
+            with self._phase('detect_project_type'):
+                self.project_context = self._detect_project_type(root_dir)
+            with self._phase('scan_files'):
+                self._scan_files(root_dir)
+                self._prune_extraction_cache()
+            with self._phase('analyze_dependencies'):
+                self._analyze_dependencies()
+            if self.config['track_history']:
+                with self._phase('update_history'):
+                    self._update_history()
+
+    def analyze_workspace(self, root_dir: str) -> None:
+        """Analyze a monorepo, treating every sub-project under ``root_dir`` as a package"""
+        self.root_dir = root_dir
+        self._walk_cache = None
+        self._history_baseline = None
+        self.metrics = RunMetrics(self.config['profile_top']) if self.config['profile'] else None
+
+        with self._profiled():
+            with self._phase('detect_project_type'):
+                self.project_context = self._detect_project_type(root_dir)
+            with self._phase('discover_packages'):
+                self.packages = self._discover_packages(root_dir)
+            with self._phase('scan_files'):
+                self._scan_files(root_dir)
+                self._prune_extraction_cache()
+                self._distribute_files()
+            with self._phase('analyze_dependencies'):
+                self._analyze_workspace_dependencies()
+            if self.config['track_history']:
+                with self._phase('update_history'):
+                    for package in self.packages.values():
+                        package._update_history()
+
+    @contextmanager
+    def _profiled(self):
+        """Run the body under cProfile when 'profile_output' is set"""
+        if not self.config['profile_output']:
+            yield
+            return
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(self.config['profile_output'])
+
+    def _phase(self, name: str):
+        """Context manager timing a phase when profiling, a no-op otherwise"""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.phase(name)
+
+    def _record_error(self, message: str) -> None:
+        """Report a recoverable error on stderr, keeping it for the run metrics when profiling"""
+        print(message, file=sys.stderr)
+        if self.metrics is not None:
+            self.metrics.errors.append(message)
+
+    def generate_report(self, output_path: str, output_format: Optional[str] = None,
+                        compress: Optional[bool] = None) -> None:
         """Generate comprehensive report of the codebase"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-        report = {
-            'timestamp': timestamp,
+        output_format = output_format or self.config['report_format']
+        if compress is None:
+            compress = self.config['report_compress']
+
+        summary = {
+            'timestamp': datetime.now().strftime("%Y%m%d_%H%M"),
             'project': asdict(self.project_context) if self.project_context else {},
-            'files': {path: asdict(metadata) for path, metadata in self.file_metadata.items()},
             'statistics': self._generate_statistics(),
-            'dependencies': self._generate_dependency_graph(),
-            'changes': self._analyze_changes()
+            'changes': self._analyze_changes(),
+            'degraded_files': self._degraded_files()
         }
 
         # Save as both JSON and human-readable format
         base_path = os.path.splitext(output_path)[0]
 
         # JSON format for programmatic use
-        with open(f"{base_path}.json", 'w') as f:
-            json.dump(report, f, indent=2)
+        extension = 'ndjson' if output_format == 'ndjson' else 'json'
+        with self._open_report(f"{base_path}.{extension}", compress) as f:
+            if output_format == 'ndjson':
+                self._write_ndjson_report(f, summary)
+            else:
+                self._write_json_report(f, summary, indent=2 if output_format == 'json' else None)
 
         # Human-readable format
-        with open(f"{base_path}.txt", 'w') as f:
-            self._write_human_readable_report(f, report)
+        with self._open_report(f"{base_path}.txt", compress) as f:
+            self._write_human_readable_report(f, summary)
+
+        # Symbol index for queries without loading the report
+        if self.config['symbol_index']:
+            self.get_symbol_index().save(f"{base_path}.index.json")
+
+    def generate_workspace_report(self, output_path: str, output_format: Optional[str] = None,
+                                  compress: Optional[bool] = None) -> None:
+        """Generate a report per package plus an aggregate report after analyze_workspace"""
+        output_format = output_format or self.config['report_format']
+        if compress is None:
+            compress = self.config['report_compress']
+        base_path = os.path.splitext(output_path)[0]
+
+        cross_package = self._cross_package_dependencies()
+        packages = {}
+        changes = {}
+        degraded_files = {}
+        for package_dir, package in self.packages.items():
+            relative_dir = os.path.relpath(package_dir, self.root_dir)
+            slug = 'root' if relative_dir == '.' else re.sub(r'[^\w.-]+', '_', relative_dir)
+            package_base = f"{base_path}.{slug}"
+            package.generate_report(f"{package_base}.json", output_format, compress)
+
+            depends_on = {
+                os.path.relpath(self._package_of(dep), self.root_dir)
+                for file_path in package.file_metadata for dep in cross_package.get(file_path, ())
+            }
+            packages[relative_dir] = {
+                'name': package.project_context.name,
+                'type': package.project_context.type,
+                'report': os.path.basename(package_base),
+                'statistics': package._generate_statistics(),
+                'circular_dependencies': sorted(package.circular_dependencies),
+                'depends_on': sorted(depends_on)
+            }
+            for change_type, files in package._analyze_changes().items():
+                changes.setdefault(change_type, []).extend(files)
+            degraded_files.update(package._degraded_files())
+
+        summary = {
+            'timestamp': datetime.now().strftime("%Y%m%d_%H%M"),
+            'project': asdict(self.project_context) if self.project_context else {},
+            'packages': packages,
+            'statistics': self._merge_statistics([entry['statistics'] for entry in packages.values()]),
+            'cross_package_dependencies': cross_package,
+            'cross_package_cycles': [
+                cycle for cycle in self.dependency_graph.cycles()
+                if len({self._package_of(path) for path in cycle}) > 1
+            ],
+            'changes': changes
+        }
+        if degraded_files:
+            summary['degraded_files'] = degraded_files
+        if self.metrics is not None:
+            summary['metrics'] = self.metrics.as_dict()
+
+        with self._open_report(f"{base_path}.json", compress) as f:
+            json.dump(summary, f, indent=2 if output_format == 'json' else None)
+            f.write('\n')
+        with self._open_report(f"{base_path}.txt", compress) as f:
+            self._write_workspace_text_report(f, summary)
+
+        # Workspace-wide index, so importer and impact queries cross packages
+        if self.config['symbol_index']:
+            self.get_symbol_index().save(f"{base_path}.index.json")
+
+    @staticmethod
+    def _merge_statistics(statistics: List[Dict]) -> Dict:
+        """Sum per-package statistics into workspace totals"""
+        merged = {}
+        for stats in statistics:
+            for key, value in stats.items():
+                if isinstance(value, dict):
+                    totals = merged.setdefault(key, {})
+                    for name, count in value.items():
+                        totals[name] = totals.get(name, 0) + count
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def get_symbol_index(self) -> SymbolIndex:
+        """Symbol and importer indexes for the current analysis, built on first use"""
+        if self.symbol_index is None:
+            file_metadata = self.file_metadata
+            if self.packages:
+                # Workspace files live in the package stores
+                file_metadata = {path: metadata for package in self.packages.values()
+                                 for path, metadata in package.file_metadata.items()}
+            self.symbol_index = SymbolIndex.build(
+                file_metadata, self.dependency_tree, self.root_dir,
+                fields=self.EXTRACTION_TIERS[self.config['extraction_tier']]
+            )
+        return self.symbol_index
+
+    def find_definitions(self, name: str, kind: Optional[str] = None) -> Dict[str, List[str]]:
+        """Files defining a function, class or export named ``name``"""
+        return self.get_symbol_index().find_definitions(name, kind)
+
+    def find_importers(self, module: str) -> List[str]:
+        """Files importing a file (absolute or root-relative) or raw module specifier"""
+        return self.get_symbol_index().find_importers(module)
+
+    def impacted_files(self, paths: List[str]) -> List[str]:
+        """Changed files plus everything importing them directly or indirectly"""
+        if self.root_dir:
+            paths = [path if os.path.isabs(path) else os.path.join(self.root_dir, path) for path in paths]
+        return sorted(self.dependency_graph.impacted(paths))
+
+    @staticmethod
+    def _open_report(path: str, compress: bool):
+        """Open a report output for text writing, gzipped when requested"""
+        if compress:
+            import gzip
+            return gzip.open(f"{path}.gz", 'wt', encoding='utf-8')
+        return open(path, 'w', encoding='utf-8')
+
+    def _iter_report_sections(self, summary: Dict):
+        """Yield (key, value) per report section, with files and dependencies as iterators"""
+        yield 'timestamp', summary['timestamp']
+        yield 'project', summary['project']
+        fields = self._report_fields()
+        yield 'files', ((path, metadata.to_dict(fields)) for path, metadata in self.file_metadata.items())
+        yield 'statistics', summary['statistics']
+        yield 'dependencies', ((path, list(metadata.dependencies))
+                               for path, metadata in self.file_metadata.items())
+        yield 'changes', summary['changes']
+        if summary['degraded_files']:
+            yield 'degraded_files', summary['degraded_files']
+        if self.metrics is not None:
+            yield 'metrics', self.metrics.as_dict()
+
+    def _degraded_files(self) -> Dict[str, str]:
+        """Path -> exceeded budget setting, or 'stale', for every file kept hash-only"""
+        return {path: metadata.degraded for path, metadata in self.file_metadata.items() if metadata.degraded}
+
+    @staticmethod
+    def _degraded_reason(reason: str) -> str:
+        """Human-readable reason a file was kept hash-only"""
+        return 'changed since the scan' if reason == 'stale' else f"over {reason}"
+
+    def _report_fields(self) -> Tuple[str, ...]:
+        """FileMetadata fields reported per file: the identity fields plus the extraction tier's"""
+        tier = self.EXTRACTION_TIERS[self.config['extraction_tier']]
+        return tuple(
+            field for field in FileMetadataView.FIELDS
+            if field not in MetadataStore.DEFERRABLE or field in tier
+        )
+
+    def _write_json_report(self, f, summary: Dict, indent: Optional[int] = 2) -> None:
+        """Stream the report as one JSON object, byte-identical to json.dump(report, indent=indent)"""
+        if indent is None:
+            item_separator, key_separator = ',', ':'
+            open_section, close_section, entry_prefix = '{', '}', ''
+        else:
+            item_separator, key_separator = ',', ': '
+            open_section, close_section = '{', '\n' + ' ' * indent + '}'
+            entry_prefix = '\n' + ' ' * 2 * indent
+
+        encoder = json.JSONEncoder(indent=indent, separators=(item_separator, key_separator))
+
+        def encode(value, depth: int) -> str:
+            if indent is None:
+                return encoder.encode(value)
+            # Re-indent nested output so it lines up at this depth
+            return encoder.encode(value).replace('\n', '\n' + ' ' * indent * depth)
+
+        f.write('{')
+        for index, (key, value) in enumerate(self._iter_report_sections(summary)):
+            if index:
+                f.write(item_separator)
+            if indent is not None:
+                f.write('\n' + ' ' * indent)
+            f.write(json.dumps(key) + key_separator)
+
+            if key not in ('files', 'dependencies'):
+                f.write(encode(value, 1))
+                continue
+
+            f.write(open_section)
+            written = False
+            for path, entry in value:
+                if written:
+                    f.write(item_separator)
+                f.write(entry_prefix + json.dumps(path) + key_separator + encode(entry, 2))
+                written = True
+            f.write(close_section if written else '}')
+
+        f.write('\n}' if indent is not None else '}')
+
+    def _write_ndjson_report(self, f, summary: Dict) -> None:
+        """Stream the report as newline-delimited JSON records, one per file"""
+        for key, value in self._iter_report_sections(summary):
+            if key == 'files':
+                for path, metadata in value:
+                    f.write(json.dumps({'type': 'file', **metadata}) + '\n')
+            elif key == 'dependencies':
+                for path, dependencies in value:
+                    f.write(json.dumps({'type': 'dependencies', 'path': path,
+                                        'dependencies': dependencies}) + '\n')
+            else:
+                f.write(json.dumps({'type': key, 'value': value}) + '\n')
+
+    def watch(self, root_dir: str, output_path: str) -> None:
+        """Keep the model live, updating it and the report as files change"""
+        self.analyze_project(root_dir)
+        self.generate_report(output_path)
+        watcher = self._start_watcher(root_dir)
+
+        try:
+            while True:
+                dirty = watcher.drain()
+                if not dirty:
+                    time.sleep(self.config['watch_interval'])
+                    continue
+
+                # Debounce bursts such as git checkouts: wait until the tree is quiet
+                while True:
+                    time.sleep(self.config['watch_debounce'])
+                    more = watcher.drain()
+                    if not more:
+                        break
+                    dirty |= more
+
+                if self._apply_changes(dirty):
+                    self.generate_report(output_path)
+        finally:
+            watcher.stop()
+
+    def _start_watcher(self, root_dir: str):
+        """Start an event-based watcher if possible, falling back to polling"""
+        backend = self.config['watch_backend']
+        if backend in ('auto', 'watchdog'):
+            try:
+                return EventWatcher(self, root_dir)
+            except ImportError:
+                if backend == 'watchdog':
+                    raise
+        return PollingWatcher(self, root_dir)
+
+    def _apply_changes(self, paths: Set[str]) -> bool:
+        """Re-extract changed files and drop deleted ones; return whether contents changed"""
+        candidates, removed = [], []
+        for file_path in sorted(paths):
+            if os.path.isfile(file_path) and self._is_source_path(file_path):
+                candidates.append(file_path)
+            elif file_path in self.file_metadata:
+                removed.append(file_path)
+
+        extracted = self._extract_files(candidates)
+        modified, added, dependency_changes = [], [], []
+        for file_path, metadata in extracted.items():
+            previous = self.file_metadata.get(file_path)
+            if previous is None:
+                added.append(file_path)
+            elif previous.hash != metadata.hash:
+                modified.append(file_path)
+                if list(previous.dependencies) != list(metadata.dependencies):
+                    dependency_changes.append(file_path)
+            # Touched files still get their new mtime
+            self.file_metadata[file_path] = metadata
+
+        for file_path in removed:
+            del self.file_metadata[file_path]
+
+        if self._cache_changes is not None:
+            self._update_cache(extracted, removed)
+
+        if not (modified or added or removed):
+            return False
+
+        if self._cache_changes is not None:
+            # Report this update's changes, not those of the initial scan
+            self._cache_changes = {
+                'new_files': added,
+                'modified_files': modified,
+                'deleted_files': removed,
+                'dependency_changes': dependency_changes
+            }
+        self._walk_cache = None
+        self._update_dependencies(modified, added, removed)
+        if self.config['track_history']:
+            self._history_baseline = None
+            self._update_history()
+        return True
+
+    def _update_cache(self, extracted: Dict[str, FileMetadata], removed: List[str]) -> None:
+        """Write re-extracted and removed files through to the incremental cache"""
+        cache = self._load_cache()
+        entries = cache.pop('files', {})
+        cache.pop('version', None)
+        for file_path, metadata in extracted.items():
+            # _read_file stats before reading, so these match the file as extracted
+            entries[file_path] = {
+                'signature': [metadata.last_modified, metadata.size],
+                'metadata': asdict(metadata)
+            }
+        for file_path in removed:
+            entries.pop(file_path, None)
+        self._save_cache(entries, cache)
+
+    def _is_source_path(self, file_path: str) -> bool:
+        """Whether a path found outside the walk would have been scanned by it"""
+        relative_parts = os.path.relpath(file_path, self.root_dir).split(os.sep)
+        excluded_dirs = self.config['excluded_dirs']
+        if relative_parts[0] == '..' or any(part in excluded_dirs for part in relative_parts[:-1]):
+            return False
+
+        filename = relative_parts[-1]
+        excluded_files = self._compile_globs(self.config['excluded_files'])
+        if excluded_files and excluded_files.match(filename):
+            return False
+        return self._should_analyze_file(filename)
 
     def _detect_project_type(self, root_dir: str) -> ProjectContext:
         """Detect project type and load relevant configuration"""
-        indicators = {
-            'package.json': 'node',
-            'setup.py': 'python',
-            'pom.xml': 'java',
-            'cargo.toml': 'rust',
-            'go.mod': 'go',
-            'composer.json': 'php'
-        }
+        context = self._read_project_context(root_dir)
+        context.config_files = self._find_config_files(root_dir)
+        return context
 
-        for indicator, proj_type in indicators.items():
+    def _read_project_context(self, root_dir: str) -> ProjectContext:
+        """Project context from the indicator file alone, without walking the tree for config files"""
+        for indicator, proj_type in self.PROJECT_INDICATORS.items():
             if os.path.exists(os.path.join(root_dir, indicator)):
                 return self._load_project_context(root_dir, indicator, proj_type)
 
         return self._create_generic_context(root_dir)
 
+    def _discover_packages(self, root_dir: str) -> Dict[str, 'UniversalCodebaseAnalyzer']:
+        """Create an analyzer per package, splitting the workspace walk between them"""
+        source_files, config_files = self._walk_project(root_dir)
+        self._package_dirs = {root_dir, *self._walk_cache[3]}
+        self._package_owners = {}
+
+        # Root first, then packages in walk order
+        package_files = {root_dir: ([], [])}
+        for package_dir in self._walk_cache[3]:
+            package_files.setdefault(package_dir, ([], []))
+        for file_path in source_files:
+            package_files[self._package_of(file_path)][0].append(file_path)
+        for relative_path in config_files:
+            file_path = os.path.join(root_dir, relative_path)
+            package_dir = self._package_of(file_path)
+            package_files[package_dir][1].append(os.path.relpath(file_path, package_dir))
+
+        packages = {}
+        for package_dir, (package_sources, package_configs) in package_files.items():
+            if package_dir == root_dir and not package_sources and root_dir not in self._walk_cache[3]:
+                # Nothing lives at the root itself
+                continue
+            packages[package_dir] = self._create_package_analyzer(
+                package_dir, package_sources, package_configs
+            )
+        return packages
+
+    def _create_package_analyzer(self, package_dir: str, source_files: List[str],
+                                 config_files: List[str]) -> 'UniversalCodebaseAnalyzer':
+        """Analyzer for one workspace package, sharing this analyzer's config and caches"""
+        package = UniversalCodebaseAnalyzer()
+        package.config = self.config
+        package.workspace = self
+        package.root_dir = package_dir
+        package._extraction_cache = self._get_extraction_cache()
+        # Seed the walk so detection uses the package's share of the workspace walk
+        package._walk_cache = (package_dir, source_files, config_files, [])
+        package.project_context = package._detect_project_type(package_dir)
+        if not package.project_context.name:
+            # Unnamed packages would otherwise share state files
+            package.project_context.name = os.path.relpath(package_dir, self.root_dir)
+        return package
+
+    def _package_of(self, file_path: str) -> str:
+        """Directory of the workspace package owning ``file_path``: the nearest enclosing one"""
+        directory = os.path.dirname(file_path)
+        owner = self._package_owners.get(directory)
+        if owner is None:
+            owner = directory
+            while owner not in self._package_dirs and len(owner) > len(self.root_dir):
+                owner = os.path.dirname(owner)
+            if owner not in self._package_dirs:
+                owner = self.root_dir
+            self._package_owners[directory] = owner
+        return owner
+
+    def _distribute_files(self) -> None:
+        """Move scanned metadata from the workspace store into each package's store"""
+        for file_path, metadata in self.file_metadata.items():
+            self.packages[self._package_of(file_path)].file_metadata[file_path] = metadata
+        self.file_metadata = MetadataStore(loader=self._extract_deferred_fields)
+
+        if self._cache_changes is not None:
+            for package_dir, package in self.packages.items():
+                package._cache_changes = {
+                    change_type: [path for path in paths if self._package_of(path) == package_dir]
+                    for change_type, paths in self._cache_changes.items()
+                }
+
     def _scan_files(self, root_dir: str) -> None:
         """Scan and analyze all relevant files in the project"""
-        for root, dirs, files in os.walk(root_dir):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in self.config['excluded_dirs']]
+        if self.config['change_detection'] == 'git':
+            self._scan_files_git(root_dir)
+            return
+        if self.config['incremental']:
+            self._scan_files_incremental(root_dir)
+            return
+
+        file_paths = list(self._iter_source_files(root_dir))
+        if self.config['executor'] == 'pipeline':
+            # Stream results into the store instead of collecting them first
+            self._extract_files_pipeline(file_paths, self.file_metadata.__setitem__)
+        else:
+            self.file_metadata.update(self._extract_files(file_paths))
+
+    def _iter_source_files(self, root_dir: str):
+        """Yield paths of all files that should be analyzed, in sorted walk order"""
+        return iter(self._walk_project(root_dir)[0])
+
+    def _scan_files_git(self, root_dir: str) -> None:
+        """Incremental scan that asks git which files changed since the last run"""
+        source_files = self._walk_project(root_dir)[0]
+        head = self._git(root_dir, 'rev-parse', 'HEAD')
+        if self._git_untracked is None or head is None:
+            self._scan_files_incremental(root_dir)
+            return
+        head = head.strip()
+        # Taken before git diffs the tree, so a reused file's signature never postdates its content
+        listed_signatures = self._stat_signatures(source_files)
+
+        state = self._load_cache().get('git') or {}
+        commit = state.get('commit')
+        since_commit = self._git_changed_paths(root_dir, commit) if commit else None
+        since_head = since_commit if commit == head else self._git_changed_paths(root_dir, head)
+
+        # Untracked files and files that were dirty last run may differ from the cache too
+        dirty = set(self._git_untracked) | (since_head or set())
+        candidates = None
+        if since_commit is not None:
+            candidates = since_commit | dirty | set(state.get('dirty', ()))
+
+        self._scan_files_incremental(
+            root_dir,
+            candidates=candidates,
+            state={'git': {'commit': head, 'dirty': sorted(dirty)}},
+            listed_signatures=listed_signatures
+        )
 
-            for file in files:
-                if self._should_analyze_file(file):
-                    file_path = os.path.join(root, file)
-                    self._analyze_file(file_path)
+    @staticmethod
+    def _stat_signatures(file_paths: List[str]) -> Dict[str, list]:
+        """[mtime, size] of each file that can still be stat'ed"""
+        signatures = {}
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            signatures[file_path] = [stat.st_mtime, stat.st_size]
+        return signatures
+
+    def _git_changed_paths(self, root_dir: str, commit: str) -> Optional[Set[str]]:
+        """Paths under ``root_dir`` whose working tree content differs from ``commit``"""
+        output = self._git(
+            root_dir, 'diff', '--name-status', '-z', '--no-renames', '--relative', commit, '--'
+        )
+        if output is None:
+            # Unknown commit, e.g. after a rebase and gc
+            return None
+        # -z output alternates status letters and paths
+        return {os.path.join(root_dir, path) for path in output.split('\0')[1::2] if path}
+
+    @staticmethod
+    def _git(root_dir: str, *args: str) -> Optional[str]:
+        """Run a git command in ``root_dir``, returning stdout or None on failure"""
+        import subprocess
+        try:
+            result = subprocess.run(
+                ['git', *args], cwd=root_dir, capture_output=True, check=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return result.stdout.decode('utf-8', errors='surrogateescape')
+
+    def _scan_files_incremental(self, root_dir: str, candidates: Optional[Set[str]] = None,
+                                state: Optional[Dict] = None,
+                                listed_signatures: Optional[Dict[str, list]] = None) -> None:
+        """Scan files, re-extracting only those whose stat signature changed"""
+        cached_files = self._load_cache().get('files', {})
+        signatures = {}
+        stale_paths = []
+
+        for file_path in self._iter_source_files(root_dir):
+            cached = cached_files.get(file_path)
+            if candidates is not None and cached and file_path not in candidates:
+                signatures[file_path] = (listed_signatures or {}).get(file_path, cached['signature'])
+                continue
+
+            try:
+                # Stat before reading so a write racing the read is picked up next run
+                stat = os.stat(file_path)
+            except OSError as e:
+                self._record_error(f"Error analyzing {file_path}: {str(e)}")
+                continue
+
+            signatures[file_path] = [stat.st_mtime, stat.st_size]
+            if not cached or cached['signature'] != signatures[file_path]:
+                stale_paths.append(file_path)
+
+        extracted = self._extract_files(stale_paths)
+        stale_paths = set(stale_paths)
+        entries = {}
+        changes = {
+            'new_files': [],
+            'modified_files': [],
+            'deleted_files': [],
+            'dependency_changes': []
+        }
+
+        for file_path, signature in signatures.items():
+            cached = cached_files.get(file_path)
+            if file_path not in stale_paths:
+                self.file_metadata[file_path] = FileMetadata(**cached['metadata'])
+                # Files touched without a content change keep the stat index current
+                entries[file_path] = {**cached, 'signature': signature}
+                continue
+
+            metadata = extracted.get(file_path)
+            if metadata is None:
+                if cached is not None:
+                    # The error is already reported; keep the file as last scanned and retry it next run
+                    self.file_metadata[file_path] = FileMetadata(**cached['metadata'])
+                    entries[file_path] = cached
+                continue
+
+            self.file_metadata[file_path] = metadata
+            entries[file_path] = {'signature': signature, 'metadata': asdict(metadata)}
+            if cached is None:
+                changes['new_files'].append(file_path)
+            elif cached['metadata']['hash'] != metadata.hash:
+                changes['modified_files'].append(file_path)
+                if cached['metadata']['dependencies'] != metadata.dependencies:
+                    changes['dependency_changes'].append(file_path)
+
+        changes['deleted_files'] = [path for path in cached_files if path not in entries]
+
+        self._cache_changes = changes
+        self._save_cache(entries, state)
+
+    def _extract_files(self, file_paths: List[str]) -> Dict[str, FileMetadata]:
+        """Extract metadata for many files, in parallel when configured"""
+        if self.config['executor'] == 'pipeline':
+            extracted = {}
+            self._extract_files_pipeline(file_paths, extracted.__setitem__)
+            return extracted
+        if self.metrics is not None:
+            return self._extract_files_profiled(file_paths)
+
+        workers = self._worker_count(len(file_paths))
+        if workers <= 1:
+            results = map(self._extract_file_metadata, file_paths)
+            return {path: metadata for path, metadata in zip(file_paths, results) if metadata}
+
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        # Small chunks keep workers busy; large ones amortize pickling
+        chunksize = max(1, min(256, len(file_paths) // (workers * 8)))
+        if self._use_process_pool(len(file_paths)):
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.config,)
+            )
+            task = _extract_file_metadata_worker
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            task = self._extract_file_metadata
+
+        with executor:
+            results = list(executor.map(task, file_paths, chunksize=chunksize))
+        return {path: metadata for path, metadata in zip(file_paths, results) if metadata}
+
+    def _extract_files_pipeline(self, file_paths: List[str], sink) -> None:
+        """Extract files through an asyncio read -> extract pipeline"""
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        async def run() -> None:
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue(maxsize=self.config['pipeline_queue_size'])
+            readers = max(1, min(self.config['read_concurrency'], len(file_paths)))
+            workers = self._worker_count(len(file_paths))
+            paths = iter(enumerate(file_paths))
+            pending: Dict[int, Optional[FileMetadata]] = {}
+            next_index = 0
+
+            def read(file_path: str):
+                try:
+                    return self._read_file(file_path), None
+                except Exception as e:
+                    return None, e
+
+            async def reader() -> None:
+                # Tasks share one iterator, so each path is read exactly once
+                for index, file_path in paths:
+                    read_result = await loop.run_in_executor(io_pool, read, file_path)
+                    await queue.put((index, file_path, read_result))
+
+            async def extractor() -> None:
+                nonlocal next_index
+                while True:
+                    entry = await queue.get()
+                    if entry is None:
+                        return
+                    index, file_path, (read_result, error) = entry
+                    if error is not None:
+                        self._record_error(f"Error analyzing {file_path}: {str(error)}")
+                        metadata = None
+                    elif self.metrics is not None:
+                        if cpu_pool is not None:
+                            metadata, seconds, timings, errors = await loop.run_in_executor(
+                                cpu_pool, _metadata_from_read_timed_worker, file_path, *read_result
+                            )
+                            # Errors were printed in the worker; keep them for the metrics here
+                            self.metrics.errors.extend(errors)
+                        else:
+                            metadata, seconds, timings = self._metadata_from_read_timed(
+                                file_path, *read_result
+                            )
+                        if metadata:
+                            self.metrics.record_file(file_path, metadata.size, metadata.language,
+                                                     seconds, timings)
+                    elif cpu_pool is not None:
+                        metadata = await loop.run_in_executor(
+                            cpu_pool, _metadata_from_read_worker, file_path, *read_result
+                        )
+                    else:
+                        metadata = self._metadata_from_read(file_path, *read_result)
+
+                    # Reorder buffer: release results strictly in input order
+                    pending[index] = metadata
+                    while next_index in pending:
+                        ready = pending.pop(next_index)
+                        if ready:
+                            sink(file_paths[next_index], ready)
+                        next_index += 1
+
+            cpu_pool = None
+            if workers > 1:
+                cpu_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                               initargs=(self.config,))
+            io_pool = ThreadPoolExecutor(max_workers=readers)
+            try:
+                extractors = [asyncio.ensure_future(extractor()) for _ in range(workers)]
+                await asyncio.gather(*(reader() for _ in range(readers)))
+                for _ in extractors:
+                    await queue.put(None)
+                await asyncio.gather(*extractors)
+            finally:
+                io_pool.shutdown()
+                if cpu_pool is not None:
+                    cpu_pool.shutdown()
+
+        if file_paths:
+            asyncio.run(run())
+
+    def _extract_files_profiled(self, file_paths: List[str]) -> Dict[str, FileMetadata]:
+        """_extract_files that also times every file and pattern into the run metrics"""
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        workers = self._worker_count(len(file_paths))
+        if workers <= 1:
+            results = list(map(self._extract_file_timed, file_paths))
+        elif self._use_process_pool(len(file_paths)):
+            chunksize = max(1, min(256, len(file_paths) // (workers * 8)))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.config,)) as executor:
+                results = []
+                for metadata, seconds, timings, errors in executor.map(
+                        _extract_file_timed_worker, file_paths, chunksize=chunksize):
+                    # Errors were printed in the worker; keep them for the metrics here
+                    self.metrics.errors.extend(errors)
+                    results.append((metadata, seconds, timings))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._extract_file_timed, file_paths))
+
+        extracted = {}
+        for path, (metadata, seconds, timings) in zip(file_paths, results):
+            if metadata:
+                self.metrics.record_file(path, metadata.size, metadata.language, seconds, timings)
+                extracted[path] = metadata
+        return extracted
+
+    def _extract_file_timed(self, file_path: str) -> Tuple[Optional[FileMetadata], float, Dict[str, float]]:
+        """Extract one file, returning (metadata, seconds, seconds per pattern field)"""
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        metadata = self._extract_file_metadata(file_path, timings)
+        return metadata, time.perf_counter() - start, timings
+
+    def _metadata_from_read_timed(
+            self, file_path: str, stat: os.stat_result, data: Optional[bytes],
+            file_hash: Optional[str]) -> Tuple[Optional[FileMetadata], float, Dict[str, float]]:
+        """_metadata_from_read returning (metadata, seconds, seconds per pattern field)"""
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        metadata = self._metadata_from_read(file_path, stat, data, file_hash, timings)
+        return metadata, time.perf_counter() - start, timings
+
+    def _prune_extraction_cache(self) -> None:
+        """Evict least recently used extraction cache entries beyond the size limit"""
+        cache = self._get_extraction_cache()
+        if cache is not None:
+            try:
+                cache.prune()
+            except Exception as e:
+                self._record_error(f"Error pruning extraction cache: {str(e)}")
+
+    def _worker_count(self, file_count: int) -> int:
+        """Resolve the configured worker count (0 or None means one per CPU)"""
+        workers = self.config['workers']
+        if not workers:
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, file_count))
+
+    def _use_process_pool(self, file_count: int) -> bool:
+        """Decide between a process pool and a thread pool for extraction"""
+        executor = self.config['executor']
+        if executor == 'auto':
+            # Process start-up only pays off once there is enough regex work to spread
+            return file_count >= self.PROCESS_POOL_MIN_FILES
+        return executor == 'process'
+
+    def _load_cache(self) -> Dict:
+        """Load the cache of the previous incremental run: per-file 'files' plus any saved state"""
+        cache_path = self._state_path(self.config['cache_file'])
+        try:
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self._record_error(f"Error loading cache: {str(e)}")
+            return {}
+
+        if cache.get('version') != self._cache_version():
+            return {}
+        return cache
+
+    def _save_cache(self, entries: Dict[str, Dict], state: Optional[Dict] = None) -> None:
+        """Persist per-file metadata, extra state and the stat index for the next incremental run"""
+        cache_path = self._state_path(self.config['cache_file'])
+        stat_path = self._stat_index_path()
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': self._cache_version(), **(state or {}), 'files': entries}, f)
+            # Atomic swap so an interrupted run never leaves a truncated cache
+            os.replace(tmp_path, cache_path)
+
+            if self._dir_mtimes is None:
+                if os.path.exists(stat_path):
+                    os.remove(stat_path)
+                return
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'version': self._cache_version(),
+                    'root': self.root_dir,
+                    'walk': self._walk_fingerprint(),
+                    'dirs': self._dir_mtimes,
+                    'files': {path: entry['signature'] for path, entry in entries.items()}
+                }, f)
+            os.replace(tmp_path, stat_path)
+        except Exception as e:
+            self._record_error(f"Error saving cache: {str(e)}")
+
+    def _cache_version(self) -> List:
+        """Version stamp of the cache and stat index; hashes from another algorithm never compare equal"""
+        return [self.CACHE_VERSION, self.config['hash_algorithm']]
+
+    def _stat_index_path(self) -> str:
+        """Path of the stat index saved next to the cache, e.g. '.codebase_cache.stat.json'"""
+        return os.path.splitext(self._state_path(self.config['cache_file']))[0] + '.stat.json'
+
+    def _walk_fingerprint(self) -> str:
+        """Digest of the settings deciding which files a walk finds"""
+        keys = ('excluded_dirs', 'excluded_files', 'languages', 'change_detection')
+        settings = [self.config[key] for key in keys]
+        return hashlib.md5(json.dumps(settings, sort_keys=True, default=sorted).encode()).hexdigest()
+
+    def unchanged_since_last_scan(self, root_dir: str) -> bool:
+        """Whether nothing under ``root_dir`` changed since the last incremental scan"""
+        self.root_dir = root_dir
+        self.project_context = self._read_project_context(root_dir)
+        try:
+            with open(self._stat_index_path(), 'r') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self._record_error(f"Error loading cache: {str(e)}")
+            return False
+
+        if (index.get('version') != self._cache_version() or index.get('root') != root_dir
+                or index.get('walk') != self._walk_fingerprint()):
+            return False
+        try:
+            for path, mtime in index['dirs'].items():
+                if os.stat(path).st_mtime != mtime:
+                    return False
+            for path, (mtime, size) in index['files'].items():
+                stat = os.stat(path)
+                if stat.st_mtime != mtime or stat.st_size != size:
+                    return False
+        except OSError:
+            return False
+        return True
+
+    def changes_since_last_scan(self, root_dir: str) -> Dict[str, List[str]]:
+        """New, modified and deleted files since the last incremental scan, without extracting"""
+        changes = {'new_files': [], 'modified_files': [], 'deleted_files': []}
+        if self.unchanged_since_last_scan(root_dir):
+            return changes
+
+        self._walk_cache = None
+        cached_files = self._load_cache().get('files', {})
+        seen = set()
+        for file_path in self._iter_source_files(root_dir):
+            seen.add(file_path)
+            cached = cached_files.get(file_path)
+            if cached is None:
+                changes['new_files'].append(file_path)
+                continue
+            try:
+                stat = os.stat(file_path)
+                if cached['signature'] == [stat.st_mtime, stat.st_size]:
+                    continue
+                if self._hash_file_chunked(file_path) != cached['metadata']['hash']:
+                    changes['modified_files'].append(file_path)
+            except OSError as e:
+                self._record_error(f"Error analyzing {file_path}: {str(e)}")
+        changes['deleted_files'] = [path for path in cached_files if path not in seen]
+        return changes
+
+    def _state_path(self, filename: str) -> str:
+        """Return the path of a state file kept next to the project history"""
+        state_path = os.path.join(self.project_context.name, filename)
+
+        # Ensure the directory exists
+        state_dir = os.path.dirname(state_path)
+        if state_dir and not os.path.exists(state_dir):
+            os.makedirs(state_dir, exist_ok=True)
+
+        return state_path
 
     def _analyze_file(self, file_path: str) -> None:
         """Analyze individual file and extract metadata"""
+        metadata = self._extract_file_metadata(file_path)
+        if metadata is not None:
+            self.file_metadata[file_path] = metadata
+
+    def _extract_file_metadata(self, file_path: str,
+                               timings: Optional[Dict[str, float]] = None) -> Optional[FileMetadata]:
+        """Read a file and extract its metadata without touching analyzer state"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            stat = os.stat(file_path)
+            file_ext = os.path.splitext(file_path)[1]
+            language = self.config['languages'].get(file_ext, 'unknown')
+
+            if stat.st_size > self.config['max_file_size']:
+                # Too large to parse: track it for change detection only
+                return self._hash_only_metadata(file_path, language, stat, self._hash_file_chunked(file_path),
+                                                'max_file_size')
+
+            content, file_hash = self._read_and_hash(file_path, stat.st_size)
+            fields = self._extract_content_fields(content, language, file_hash, timings)
+            if fields is None:
+                return self._hash_only_metadata(file_path, language, stat, file_hash,
+                                                'extraction_time_budget')
 
+            return FileMetadata(
+                path=file_path,
+                language=language,
+                size=stat.st_size,
+                last_modified=stat.st_mtime,
+                hash=file_hash,
+                degraded=None,
+                **fields
+            )
+        except Exception as e:
+            self._record_error(f"Error analyzing {file_path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _hash_only_metadata(file_path: str, language: str, stat: os.stat_result, file_hash: str,
+                            reason: str) -> FileMetadata:
+        """Metadata for a file over the budget setting ``reason``: hashed, never parsed"""
+        return FileMetadata(
+            path=file_path,
+            language=language,
+            size=stat.st_size,
+            last_modified=stat.st_mtime,
+            hash=file_hash,
+            dependencies=[],
+            exports=[],
+            doc_strings=[],
+            functions=[],
+            classes=[],
+            complexity={},
+            degraded=reason
+        )
+
+    def _read_file(self, file_path: str) -> Tuple[os.stat_result, Optional[bytes], Optional[str]]:
+        """I/O half of extraction: (stat, raw bytes, None), or (stat, None, hash) for oversized files"""
+        stat = os.stat(file_path)
+        if stat.st_size > self.config['max_file_size']:
+            return stat, None, self._hash_file_chunked(file_path)
+        with open(file_path, 'rb') as f:
+            return stat, f.read(), None
+
+    def _metadata_from_read(self, file_path: str, stat: os.stat_result, data: Optional[bytes],
+                            file_hash: Optional[str],
+                            timings: Optional[Dict[str, float]] = None) -> Optional[FileMetadata]:
+        """CPU half of extraction, for a file already read by _read_file"""
+        try:
             file_ext = os.path.splitext(file_path)[1]
             language = self.config['languages'].get(file_ext, 'unknown')
+            if data is None:
+                return self._hash_only_metadata(file_path, language, stat, file_hash, 'max_file_size')
+
+            file_hash = self._calculate_file_hash(data)
+            content = self._decode_source(data)
+            fields = self._extract_content_fields(content, language, file_hash, timings)
+            if fields is None:
+                return self._hash_only_metadata(file_path, language, stat, file_hash,
+                                                'extraction_time_budget')
 
-            self.file_metadata[file_path] = FileMetadata(
+            return FileMetadata(
                 path=file_path,
                 language=language,
-                size=len(content),
-                last_modified=os.path.getmtime(file_path),
-                hash=self._calculate_file_hash(content),
-                dependencies=self._extract_dependencies(content, language),
-                exports=self._extract_exports(content, language),
-                doc_strings=self._extract_doc_strings(content, language),
-                functions=self._extract_functions(content, language),
-                classes=self._extract_classes(content, language)
+                size=stat.st_size,
+                last_modified=stat.st_mtime,
+                hash=file_hash,
+                degraded=None,
+                **fields
             )
         except Exception as e:
-            print(f"Error analyzing {file_path}: {str(e)}")
+            self._record_error(f"Error analyzing {file_path}: {str(e)}")
+            return None
+
+    def _read_and_hash(self, file_path: str, size: int) -> Tuple[str, str]:
+        """Read a file once, hashing the raw bytes and decoding them as UTF-8 text"""
+        with open(file_path, 'rb') as f:
+            if size >= self.config['mmap_threshold'] > 0:
+                import mmap
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    file_hash = self._calculate_file_hash(mapped)
+                    content = str(mapped, 'utf-8')
+            else:
+                data = f.read()
+                file_hash = self._calculate_file_hash(data)
+                content = data.decode('utf-8')
+
+        return self._normalize_newlines(content), file_hash
+
+    def _decode_source(self, data: bytes) -> str:
+        """Decode raw file bytes the way _read_and_hash does"""
+        return self._normalize_newlines(data.decode('utf-8'))
+
+    @staticmethod
+    def _normalize_newlines(content: str) -> str:
+        """Match the universal newline handling of text-mode reads"""
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def _hash_file_chunked(self, file_path: str) -> str:
+        """Hash a file in fixed-size chunks without holding it in memory"""
+        hasher = self._new_hasher()
+        buffer = bytearray(1024 * 1024)
+        view = memoryview(buffer)
+        with open(file_path, 'rb') as f:
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                hasher.update(view[:read])
+        return hasher.hexdigest()
+
+    def _extract_content_fields(self, content: str, language: str, file_hash: str,
+                                timings: Optional[Dict[str, float]] = None) -> Optional[Dict]:
+        """Fields derived purely from content, or None over 'extraction_time_budget'"""
+        cache = self._get_extraction_cache()
+        if cache is not None:
+            try:
+                fields = cache.get(file_hash, language)
+            except Exception as e:
+                self._record_error(f"Error reading extraction cache: {str(e)}")
+                fields = cache = None
+            if fields is not None:
+                return fields
+
+        tier = self.EXTRACTION_TIERS[self.config['extraction_tier']]
+        deadline = self._extraction_deadline()
+        fields = self._extract_symbols(content, language, timings, tier, deadline)
+        if fields is None:
+            return None
+        if 'complexity' not in tier:
+            fields['complexity'] = None
+        elif deadline is not None and time.perf_counter() > deadline:
+            return None
+        elif timings is None:
+            fields['complexity'] = self._measure_complexity(content, language)
+        else:
+            start = time.perf_counter()
+            fields['complexity'] = self._measure_complexity(content, language)
+            timings['complexity'] = time.perf_counter() - start
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+        if cache is not None:
+            try:
+                cache.put(file_hash, language, fields)
+            except Exception as e:
+                self._record_error(f"Error writing extraction cache: {str(e)}")
+        return fields
+
+    def _extract_deferred_fields(self, file_path: str, fields: List[str]) -> Optional[Dict]:
+        """MetadataStore loader: extract fields the extraction tier skipped, on first access"""
+        try:
+            stat = os.stat(file_path)
+            if stat.st_size > self.config['max_file_size']:
+                return {'degraded': 'max_file_size'}
+            content, file_hash = self._read_and_hash(file_path, stat.st_size)
+        except Exception as e:
+            self._record_error(f"Error analyzing {file_path}: {str(e)}")
+            return None
+
+        stored = self.file_metadata.get(file_path)
+        if stored is not None and stored.hash != file_hash:
+            # The file changed since it was scanned; its symbols would not match the rest of the row
+            return {'degraded': 'stale'}
+
+        language = self.config['languages'].get(os.path.splitext(file_path)[1], 'unknown')
+        deadline = self._extraction_deadline()
+        values = self._extract_symbols(content, language, fields=fields, deadline=deadline)
+        if values is None:
+            return {'degraded': 'extraction_time_budget'}
+        if 'complexity' in fields:
+            if deadline is not None and time.perf_counter() > deadline:
+                return {'degraded': 'extraction_time_budget'}
+            values['complexity'] = self._measure_complexity(content, language)
+            if deadline is not None and time.perf_counter() > deadline:
+                return {'degraded': 'extraction_time_budget'}
+        return values
+
+    def _extraction_deadline(self) -> Optional[float]:
+        """``time.perf_counter()`` value by which a file's extraction must finish, if budgeted"""
+        budget = self.config['extraction_time_budget']
+        return time.perf_counter() + budget if budget else None
+
+    def _get_extraction_cache(self) -> Optional['ExtractionCache']:
+        """Open the shared extraction cache configured by 'extraction_cache', if any"""
+        if self._extraction_cache is None and self.config['extraction_cache']:
+            self._extraction_cache = ExtractionCache(
+                os.path.expanduser(self.config['extraction_cache']),
+                version=self._extractor_version(),
+                max_bytes=self.config['extraction_cache_max_bytes']
+            )
+        return self._extraction_cache
+
+    def _extractor_version(self) -> str:
+        """Fingerprint of everything that shapes extraction output"""
+        fingerprint = json.dumps([
+            self.PATTERNS,
+            self.DOC_DELIMITERS,
+            self.COMPLEXITY_VERSION,
+            bool(self.config['complexity_metrics']),
+            self.EXTRACTION_TIERS[self.config['extraction_tier']]
+        ], sort_keys=True)
+        return hashlib.md5(fingerprint.encode()).hexdigest()[:16]
 
     def _analyze_changes(self) -> Dict:
         """Analyze changes since last analysis"""
-        if not self.history:
+        if self._cache_changes is not None:
+            # Incremental runs already diffed against the cache
+            return self._cache_changes
+        if not self.config['track_history']:
+            return {}
+
+        store = self._get_history_store()
+        if self._history_baseline is None:
+            self._history_baseline = store.latest_keys()
+        last_keys = self._history_baseline
+        if not last_keys:
             return {}
 
-        last_analysis = self.history[-1]
         changes = {
             'new_files': [],
             'modified_files': [],
@@ -212,23 +2955,36 @@ class UniversalCodebaseAnalyzer:
         }
 
         # Compare with last analysis
-        last_files = last_analysis['files']
-        current_files = {path: asdict(metadata) for path, metadata in self.file_metadata.items()}
-
-        for file_path, metadata in current_files.items():
-            if file_path not in last_files:
+        for file_path, metadata in self.file_metadata.items():
+            if file_path not in last_keys:
                 changes['new_files'].append(file_path)
-            elif metadata['hash'] != last_files[file_path]['hash']:
+            elif metadata.hash != last_keys[file_path].split(':', 1)[0]:
                 changes['modified_files'].append(file_path)
+                previous = store.load_blob(last_keys[file_path])
+                if previous is not None and previous['dependencies'] != list(metadata.dependencies):
+                    changes['dependency_changes'].append(file_path)
 
-        for file_path in last_files:
-            if file_path not in current_files:
+        for file_path in last_keys:
+            if file_path not in self.file_metadata:
                 changes['deleted_files'].append(file_path)
 
         return changes
 
+    def _get_history_store(self) -> HistoryStore:
+        """Open the project's history log, loading it on first use"""
+        history_file = self.config['history_file']
+        if self.config['extraction_tier'] != 'full':
+            # Partial records are kept apart so blobs never mix tiers
+            base, ext = os.path.splitext(history_file)
+            history_file = f"{base}.{self.config['extraction_tier']}{ext}"
+        history_path = self._state_path(history_file)
+        if self.history_store is None or self.history_store.path != history_path:
+            self.history_store = HistoryStore(history_path, max_runs=self.config['history_limit'])
+            self.history = self.history_store.runs
+        return self.history_store
+
     def _write_human_readable_report(self, f, report: Dict) -> None:
-        """Write report in human-readable format"""
+        """Write report in human-readable format, streaming files from file_metadata"""
         f.write(f"Codebase Analysis Report - {report['timestamp']}\n")
         f.write("=" * 80 + "\n\n")
 
@@ -259,38 +3015,150 @@ class UniversalCodebaseAnalyzer:
                         f.write(f"  - {file}\n")
             f.write("\n")
 
+        # Files over a budget
+        if report['degraded_files']:
+            f.write("Hash-Only Files\n")
+            f.write("-" * 50 + "\n")
+            for path, reason in report['degraded_files'].items():
+                f.write(f"  - {path} ({self._degraded_reason(reason)})\n")
+            f.write("\n")
+
         # Dependencies
         f.write("Dependency Graph\n")
         f.write("-" * 50 + "\n")
-        for module, deps in report['dependencies'].items():
+        for module, metadata in self.file_metadata.items():
             f.write(f"\n{module}:\n")
-            for dep in deps:
+            for dep in metadata.dependencies:
                 f.write(f"  - {dep}\n")
 
         # File Details
+        tier = self.EXTRACTION_TIERS[self.config['extraction_tier']]
         f.write("\nFile Details\n")
         f.write("-" * 50 + "\n")
-        for path, metadata in report['files'].items():
+        for path, metadata in self.file_metadata.items():
             f.write(f"\n{path}:\n")
-            f.write(f"  Language: {metadata['language']}\n")
-            f.write(f"  Size: {metadata['size']} bytes\n")
-            if metadata['functions']:
+            f.write(f"  Language: {metadata.language}\n")
+            f.write(f"  Size: {metadata.size} bytes\n")
+            if 'complexity' in tier and metadata.complexity:
+                c = metadata.complexity
+                f.write(
+                    f"  Complexity: cyclomatic {c['cyclomatic_complexity']}, "
+                    f"cognitive {c['cognitive_complexity']}, nesting {c['nesting_depth']}, "
+                    f"comment ratio {c['comment_ratio']}\n"
+                )
+            if 'functions' in tier and metadata.functions:
                 f.write("  Functions:\n")
-                for func in metadata['functions']:
+                for func in metadata.functions:
                     f.write(f"    - {func}\n")
-            if metadata['classes']:
+            if 'classes' in tier and metadata.classes:
                 f.write("  Classes:\n")
-                for cls in metadata['classes']:
+                for cls in metadata.classes:
                     f.write(f"    - {cls}\n")
 
-    def _calculate_file_hash(self, content: str) -> str:
-        """Calculate hash of file content"""
-        return hashlib.md5(content.encode()).hexdigest()
+        # Run metrics, when profiling
+        if self.metrics is not None:
+            metrics = self.metrics.as_dict()
+            f.write("\nRun Metrics\n")
+            f.write("-" * 50 + "\n")
+            for name, totals in metrics['phases'].items():
+                f.write(f"{name}: {totals['wall_seconds']:.3f}s wall, {totals['cpu_seconds']:.3f}s cpu\n")
+            f.write(f"files/sec: {metrics['files_per_second']}, bytes/sec: {metrics['bytes_per_second']}\n")
+            if metrics['slowest_files']:
+                f.write("Slowest files:\n")
+                for entry in metrics['slowest_files']:
+                    f.write(f"  - {entry['path']}: {entry['seconds']:.4f}s\n")
+            if metrics['slowest_patterns']:
+                f.write("Slowest patterns:\n")
+                for entry in metrics['slowest_patterns']:
+                    f.write(f"  - {entry['pattern']}: {entry['seconds']:.4f}s\n")
+            if metrics['errors']:
+                f.write(f"Errors ({len(metrics['errors'])}):\n")
+                for message in metrics['errors']:
+                    f.write(f"  - {message}\n")
+
+    def _write_workspace_text_report(self, f, summary: Dict) -> None:
+        """Write the aggregate workspace report in human-readable format"""
+        f.write(f"Workspace Analysis Report - {summary['timestamp']}\n")
+        f.write("=" * 80 + "\n\n")
+
+        f.write("Statistics\n")
+        f.write("-" * 50 + "\n")
+        for key, value in summary['statistics'].items():
+            f.write(f"{key}: {value}\n")
+        f.write("\n")
+
+        f.write("Packages\n")
+        f.write("-" * 50 + "\n")
+        for relative_dir, package in summary['packages'].items():
+            f.write(f"\n{relative_dir} ({package['name']}, {package['type']}):\n")
+            f.write(f"  Files: {package['statistics']['total_files']}\n")
+            f.write(f"  Report: {package['report']}\n")
+            if package['depends_on']:
+                f.write(f"  Depends on: {', '.join(package['depends_on'])}\n")
+            if package['circular_dependencies']:
+                f.write(f"  Files in cycles: {len(package['circular_dependencies'])}\n")
+
+        f.write("\nCross-Package Dependencies\n")
+        f.write("-" * 50 + "\n")
+        for file_path, targets in summary['cross_package_dependencies'].items():
+            f.write(f"\n{file_path}:\n")
+            for target in targets:
+                f.write(f"  - {target}\n")
+
+        if summary['cross_package_cycles']:
+            f.write("\nCross-Package Cycles\n")
+            f.write("-" * 50 + "\n")
+            for cycle in summary['cross_package_cycles']:
+                f.write(f"  - {' -> '.join(cycle)}\n")
+
+        if summary.get('degraded_files'):
+            f.write("\nHash-Only Files\n")
+            f.write("-" * 50 + "\n")
+            for path, reason in summary['degraded_files'].items():
+                f.write(f"  - {path} ({self._degraded_reason(reason)})\n")
+
+    def _calculate_file_hash(self, data) -> str:
+        """Calculate hash of raw file bytes"""
+        hasher = self._new_hasher()
+        hasher.update(data)
+        return hasher.hexdigest()
+
+    def _new_hasher(self):
+        """Create a hash object for the configured 'hash_algorithm'"""
+        algorithm = self.config['hash_algorithm']
+        if algorithm == 'blake2b':
+            # 128-bit digests keep hashes as compact as MD5's
+            return hashlib.blake2b(digest_size=16)
+        return hashlib.new(algorithm)
 
     def _should_analyze_file(self, filename: str) -> bool:
         """Determine if file should be analyzed"""
         return any(filename.endswith(ext) for ext in self.config['languages'].keys())
 
+    def _extract_symbols(self, content: str, language: str,
+                         timings: Optional[Dict[str, float]] = None,
+                         fields=None,
+                         deadline: Optional[float] = None) -> Optional[Dict[str, Optional[List[str]]]]:
+        """Extract the symbol fields (all, or those in ``fields``) in a single pass"""
+        extractor = self._get_extractor(language)
+        if extractor is None:
+            return {field: [] for field in PatternExtractor.FIELDS.values()}
+        return extractor.extract(content, timings, fields, deadline)
+
+    @classmethod
+    def _get_extractor(cls, language: str) -> Optional['PatternExtractor']:
+        """Return the compiled extractor for a language, building it on first use"""
+        if language not in cls._extractors:
+            if language in cls.PATTERNS:
+                cls._extractors[language] = PatternExtractor(
+                    cls.PATTERNS[language],
+                    cls.DOC_DELIMITERS.get(language),
+                    cls.TRIGGERS[language]
+                )
+            else:
+                cls._extractors[language] = None
+        return cls._extractors[language]
+
     def _extract_patterns(self, content: str, language: str, pattern_type: str) -> List[str]:
         """Extract patterns from file content based on language"""
         if language not in self.PATTERNS:
@@ -301,6 +3169,8 @@ class UniversalCodebaseAnalyzer:
             return []
 
         matches = re.finditer(pattern, content)
+        if re.compile(pattern).groups > 1:
+            return [PatternExtractor.join_import(match.groups()) for match in matches]
         return [match.group(1) for match in matches]
 
     def _extract_dependencies(self, content: str, language: str) -> List[str]:
@@ -317,16 +3187,11 @@ class UniversalCodebaseAnalyzer:
 
     def _extract_doc_strings(self, content: str, language: str) -> List[str]:
         """Extract documentation strings based on language"""
-        doc_patterns = {
-            'python': r'"""(.*?)"""',
-            'javascript': r'/\*\*(.*?)\*/',
-            'typescript': r'/\*\*(.*?)\*/'
-        }
-
-        if language not in doc_patterns:
+        if language not in self.DOC_DELIMITERS:
             return []
 
-        pattern = doc_patterns[language]
+        opening, closing = self.DOC_DELIMITERS[language]
+        pattern = re.escape(opening) + '(.*?)' + re.escape(closing)
         matches = re.finditer(pattern, content, re.DOTALL)
         return [match.group(1).strip() for match in matches]
 
@@ -340,12 +3205,18 @@ class UniversalCodebaseAnalyzer:
             'total_classes': 0,
             'files_by_type': {}
         }
+        # Symbol counts would force deferred fields to be extracted
+        tier = self.EXTRACTION_TIERS[self.config['extraction_tier']]
+        count_symbols = 'functions' in tier
+        if not count_symbols:
+            del stats['total_functions'], stats['total_classes']
 
         for metadata in self.file_metadata.values():
             stats['languages'][metadata.language] = stats['languages'].get(metadata.language, 0) + 1
             stats['total_size'] += metadata.size
-            stats['total_functions'] += len(metadata.functions)
-            stats['total_classes'] += len(metadata.classes)
+            if count_symbols:
+                stats['total_functions'] += len(metadata.functions)
+                stats['total_classes'] += len(metadata.classes)
 
             file_ext = os.path.splitext(metadata.path)[1]
             stats['files_by_type'][file_ext] = stats['files_by_type'].get(file_ext, 0) + 1
@@ -371,7 +3242,7 @@ class UniversalCodebaseAnalyzer:
                         dependencies=data.get('dependencies', {}),
                         dev_dependencies=data.get('devDependencies', {}),
                         entry_points=[data.get('main', 'index.js')],
-                        config_files=self._find_config_files(root_dir)
+                        config_files=[]
                     )
                 elif proj_type == 'python':
                     # Handle setup.py
@@ -393,205 +3264,616 @@ class UniversalCodebaseAnalyzer:
                         dependencies=setup_args.get('install_requires', []),
                         dev_dependencies=setup_args.get('extras_require', {}).get('dev', []),
                         entry_points=setup_args.get('entry_points', []),
-                        config_files=self._find_config_files(root_dir)
+                        config_files=[]
                     )
                 # Add other project types as needed
         except Exception as e:
-            print(f"Error loading project context: {str(e)}")
+            self._record_error(f"Error loading project context: {str(e)}")
             return self._create_generic_context(root_dir)
 
-    def _create_generic_context(self, root_dir: str) -> ProjectContext:
+        # Types whose configuration is not parsed yet keep their detected type
+        return self._create_generic_context(root_dir, proj_type)
+
+    def _create_generic_context(self, root_dir: str, proj_type: str = 'generic') -> ProjectContext:
         """Create a generic project context when type cannot be determined"""
         return ProjectContext(
             name=os.path.basename(root_dir),
-            type='generic',
+            type=proj_type,
             dependencies={},
             dev_dependencies={},
             entry_points=[],
-            config_files=self._find_config_files(root_dir)
+            config_files=[]
         )
 
     def _find_config_files(self, root_dir: str) -> List[str]:
         """Find all configuration files in the project"""
-        config_patterns = [
-            '*.json',
-            '*.yaml',
-            '*.yml',
-            '*.toml',
-            '*.ini',
-            '*.cfg',
-            '.env*',
-            '.git*',
-            'requirements.txt',
-            'setup.cfg',
-            'tox.ini',
-            'Dockerfile',
-            'docker-compose.yml'
+        with self._phase('find_config_files'):
+            return self._walk_project(root_dir)[1]
+
+    def _walk_project(self, root_dir: str) -> Tuple[List[str], List[str]]:
+        """Walk the tree once, returning (source file paths, relative config file paths)"""
+        if self._walk_cache is not None and self._walk_cache[0] == root_dir:
+            return self._walk_cache[1], self._walk_cache[2]
+
+        excluded_files = self._compile_globs(self.config['excluded_files'])
+        # One named group per pattern so configs stay grouped in CONFIG_PATTERNS order
+        config_pattern = re.compile('|'.join(
+            f"(?P<p{index}>{fnmatch.translate(pattern)})"
+            for index, pattern in enumerate(self.CONFIG_PATTERNS)
+        ))
+
+        directories = None
+        self._git_untracked = None
+        self._dir_mtimes = None
+        if self.config['incremental'] or self.config['change_detection'] == 'git':
+            # Saved with the cache, so unchanged_since_last_scan() can spot added and removed files
+            self._dir_mtimes = {}
+        if self.config['change_detection'] == 'git':
+            directories = self._git_directories(root_dir, self._dir_mtimes)
+        if directories is None:
+            if self._dir_mtimes is not None:
+                self._dir_mtimes = {}
+            directories = self._walk_directories(root_dir, self._dir_mtimes)
+
+        source_files = []
+        config_groups = [[] for _ in self.CONFIG_PATTERNS]
+        package_dirs = []
+        for root, files in directories:
+            for file in files:
+                if excluded_files and excluded_files.match(file):
+                    continue
+
+                if file in self.PROJECT_INDICATORS and (not package_dirs or package_dirs[-1] != root):
+                    package_dirs.append(root)
+
+                file_path = os.path.join(root, file)
+                if self._should_analyze_file(file):
+                    source_files.append(file_path)
+
+                config_match = config_pattern.match(file)
+                if config_match:
+                    group_index = int(config_match.lastgroup[1:])
+                    config_groups[group_index].append(os.path.relpath(file_path, root_dir))
+
+        config_files = [path for group in config_groups for path in group]
+        self._walk_cache = (root_dir, source_files, config_files, package_dirs)
+        return source_files, config_files
+
+    def _walk_directories(self, root_dir: str, mtimes: Optional[Dict[str, float]] = None):
+        """Yield (directory, sorted file names) in walk order, pruning excluded directories"""
+        excluded_dirs = self.config['excluded_dirs']
+        if mtimes is not None:
+            self._record_mtimes(mtimes, [root_dir])
+        for root, dirs, files in os.walk(root_dir):
+            # Skip excluded directories
+            dirs[:] = sorted(d for d in dirs if d not in excluded_dirs)
+            if mtimes is not None:
+                self._record_mtimes(mtimes, [os.path.join(root, d) for d in dirs])
+            yield root, sorted(files)
+
+    @staticmethod
+    def _record_mtimes(mtimes: Dict[str, float], paths: List[str]) -> None:
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime
+            except OSError:
+                # Gone already; its parent's recorded mtime predates the removal
+                pass
+
+    def _git_directories(self, root_dir: str,
+                         mtimes: Optional[Dict[str, float]] = None) -> Optional[List[Tuple[str, List[str]]]]:
+        """Files git tracks or would track under ``root_dir``, grouped like _walk_directories"""
+        if mtimes is not None and not self._record_git_mtimes(root_dir, mtimes):
+            return None
+        listings = [
+            self._git(root_dir, 'ls-files', '-z', '--cached'),
+            self._git(root_dir, 'ls-files', '-z', '--others', '--exclude-standard'),
+            self._git(root_dir, 'ls-files', '-z', '--deleted')
         ]
+        if any(listing is None for listing in listings):
+            return None
+        tracked, untracked, deleted = (set(filter(None, listing.split('\0'))) for listing in listings)
+
+        excluded_dirs = self.config['excluded_dirs']
+        paths = []
+        for path in (tracked - deleted) | untracked:
+            parts = path.split('/')
+            if not any(part in excluded_dirs for part in parts[:-1]):
+                paths.append(parts)
+
+        # Walk order: a directory's files come before its subdirectories, each sorted
+        paths.sort(key=lambda parts: [(1, part) for part in parts[:-1]] + [(0, parts[-1])])
+        directories = []
+        for parts in paths:
+            root = os.path.join(root_dir, *parts[:-1])
+            if not directories or directories[-1][0] != root:
+                directories.append((root, []))
+            directories[-1][1].append(parts[-1])
+
+        self._git_untracked = {os.path.join(root_dir, path) for path in untracked}
+        return directories
+
+    def _record_git_mtimes(self, root_dir: str, mtimes: Dict[str, float]) -> bool:
+        """Record the mtimes of non-ignored directories and of ignore files; False outside git"""
+        ignored = self._git(
+            root_dir, 'ls-files', '-z', '--others', '--ignored', '--exclude-standard', '--directory'
+        )
+        exclude_file = self._git(root_dir, 'rev-parse', '--git-path', 'info/exclude')
+        if ignored is None or exclude_file is None:
+            return False
 
-        config_files = []
-        for pattern in config_patterns:
-            config_files.extend(
-                str(p.relative_to(root_dir))
-                for p in Path(root_dir).rglob(pattern)
-                if not any(excluded in str(p) for excluded in self.config['excluded_dirs'])
-            )
-        return config_files
+        # Directories git ignores as a whole are listed with a trailing slash
+        ignored_dirs = {
+            os.path.join(root_dir, path[:-1]) for path in ignored.split('\0') if path.endswith('/')
+        }
+        excluded_dirs = self.config['excluded_dirs']
+        self._record_mtimes(mtimes, [root_dir, os.path.join(root_dir, exclude_file.strip())])
+        for root, dirs, files in os.walk(root_dir):
+            dirs[:] = [d for d in dirs
+                       if d not in excluded_dirs and os.path.join(root, d) not in ignored_dirs]
+            self._record_mtimes(mtimes, [os.path.join(root, d) for d in dirs])
+            if '.gitignore' in files:
+                self._record_mtimes(mtimes, [os.path.join(root, '.gitignore')])
+        return True
+
+    @staticmethod
+    def _compile_globs(globs) -> Optional[re.Pattern]:
+        """Compile shell-style filename globs into a single regex"""
+        if not globs:
+            return None
+        return re.compile('|'.join(fnmatch.translate(pattern) for pattern in sorted(globs)))
 
     def _analyze_dependencies(self) -> None:
         """Analyze project dependencies and their relationships"""
         dependency_tree = {}
-        circular_deps = set()
-
-        def build_dep_tree(file_path: str, visited: Set[str] = None):
-            if visited is None:
-                visited = set()
-
-            if file_path in visited:
-                circular_deps.add(file_path)
-                return
+        graph = DependencyGraph()
+        self.import_resolver = self._build_import_resolver()
+        self._importers_by_name = {}
+        self._import_names = {}
 
-            visited.add(file_path)
-            metadata = self.file_metadata.get(file_path)
-            if metadata:
-                dependencies = []
-                for dep in metadata.dependencies:
-                    # Resolve relative imports
-                    full_dep_path = self._resolve_import_path(file_path, dep)
-                    if full_dep_path:
-                        dependencies.append(full_dep_path)
-                        build_dep_tree(full_dep_path, visited.copy())
+        # Resolve every import edge exactly once
+        for file_path in self.file_metadata:
+            dependencies = self._resolve_dependencies(file_path)
+            dependency_tree[file_path] = dependencies
+            graph.set_edges(file_path, dependencies)
 
+        self.dependency_tree = dependency_tree
+        self.dependency_graph = graph
+        self.circular_dependencies = graph.circular_nodes()
+        self.symbol_index = None
+
+    def _resolve_dependencies(self, file_path: str) -> List[str]:
+        """Resolve a file's imports to distinct other files, indexing it by the base names they probed"""
+        # Ordered set: a target imported twice is still one edge
+        dependencies: Dict[str, None] = {}
+        names = set()
+        for dep in self.file_metadata[file_path].dependencies:
+            full_dep_path = self._resolve_import_path(file_path, dep)
+            names |= self.import_resolver.probed_names(file_path, dep)
+            if full_dep_path is not None and full_dep_path != file_path:
+                dependencies[full_dep_path] = None
+
+        self._index_importer(file_path, names)
+        return list(dependencies)
+
+    def _index_importer(self, file_path: str, names: Set[str]) -> None:
+        """Replace the base names ``file_path`` is indexed under as an importer"""
+        for name in self._import_names.pop(file_path, ()):
+            importers = self._importers_by_name[name]
+            importers.discard(file_path)
+            if not importers:
+                del self._importers_by_name[name]
+        if names:
+            self._import_names[file_path] = names
+            for name in names:
+                self._importers_by_name.setdefault(name, set()).add(file_path)
+
+    def _update_dependencies(self, modified: List[str], added: List[str], removed: List[str]) -> None:
+        """Update the dependency graph for changed files without re-resolving everything"""
+        for file_path in added:
+            self.import_resolver.add_file(file_path)
+        for file_path in removed:
+            self.import_resolver.remove_file(file_path)
+
+        affected = set(modified) | set(added)
+        # An added or deleted file can only change imports that probed one of its base
+        # names: ones that matched nothing, its importers, or e.g. utils/index.js for utils.js
+        for file_path in added + removed:
+            for name in self.import_resolver.base_names(file_path):
+                affected.update(self._importers_by_name.get(name, ()))
+
+        for file_path in removed:
+            self.dependency_tree.pop(file_path, None)
+            self._index_importer(file_path, set())
+            self.dependency_graph.remove_node(file_path)
+
+        for file_path in affected:
+            if file_path in self.file_metadata:
+                dependencies = self._resolve_dependencies(file_path)
+                self.dependency_tree[file_path] = dependencies
+                self.dependency_graph.set_edges(file_path, dependencies)
+
+        self.circular_dependencies = self.dependency_graph.circular_nodes()
+        self.symbol_index = None
+
+    def _analyze_workspace_dependencies(self) -> None:
+        """Resolve every package's imports against the whole workspace"""
+        self.import_resolver = ImportResolver(
+            (path for package in self.packages.values() for path in package.file_metadata),
+            extensions=self.config['resolve_extensions'],
+            index_files=self.config['resolve_index_files']
+        )
+        dependency_tree = {}
+        graph = DependencyGraph()
+        for package in self.packages.values():
+            package._analyze_dependencies()
+            for file_path, dependencies in package.dependency_tree.items():
                 dependency_tree[file_path] = dependencies
-
-        for file_path in self.file_metadata:
-            build_dep_tree(file_path)
+                graph.set_edges(file_path, dependencies)
 
         self.dependency_tree = dependency_tree
-        self.circular_dependencies = circular_deps
+        self.dependency_graph = graph
+        self.circular_dependencies = graph.circular_nodes()
+        self.symbol_index = None
+
+    def _workspace_scope(self) -> Tuple[List[tuple], List[str]]:
+        """Aliases resolving node package names, and the Python roots, of every workspace package"""
+        aliases = []
+        python_roots = []
+        for package_dir, package in self.packages.items():
+            context = package.project_context
+            if context.type == 'python':
+                python_roots.extend([package_dir, os.path.join(package_dir, 'src')])
+            elif context.type == 'node':
+                # The bare name resolves to the entry point when it was scanned, else the index file
+                entry = os.path.normpath(os.path.join(package_dir, (context.entry_points or [''])[0] or ''))
+                target = entry if entry in self.import_resolver.files else package_dir
+                aliases.append((context.name, target))
+                aliases.append((f"{context.name}/*", os.path.join(package_dir, '*')))
+        return aliases, python_roots
+
+    def _cross_package_dependencies(self) -> Dict[str, List[str]]:
+        """Resolved import edges whose target lies in another workspace package"""
+        edges = {}
+        for file_path, dependencies in self.dependency_tree.items():
+            owner = self._package_of(file_path)
+            targets = [dep for dep in dependencies if self._package_of(dep) != owner]
+            if targets:
+                edges[file_path] = targets
+        return edges
 
     def _resolve_import_path(self, source_file: str, import_path: str) -> Optional[str]:
-        """Resolve relative import paths to absolute paths"""
+        """Resolve an import specifier to the path of a scanned file"""
+        if self.import_resolver is None:
+            self.import_resolver = self._build_import_resolver()
         try:
-            if import_path.startswith('.'):
-                # Relative import
-                source_dir = os.path.dirname(source_file)
-                parts = import_path.split('/')
-                current_path = source_dir
-
-                for part in parts:
-                    if part == '.':
-                        continue
-                    elif part == '..':
-                        current_path = os.path.dirname(current_path)
-                    else:
-                        current_path = os.path.join(current_path, part)
-
-                # Try common extensions
-                for ext in ['.js', '.jsx', '.ts', '.tsx', '.py']:
-                    potential_path = current_path + ext
-                    if os.path.exists(potential_path):
-                        return potential_path
-
-                # Try index files
-                for ext in ['.js', '.jsx', '.ts', '.tsx']:
-                    index_path = os.path.join(current_path, 'index' + ext)
-                    if os.path.exists(index_path):
-                        return index_path
-
-            return None
+            return self.import_resolver.resolve(source_file, import_path)
         except Exception:
             return None
 
-    def _update_history(self) -> None:
-        """Update the project history with current analysis"""
-        history_path = os.path.join(self.project_context.name, self.config['history_file'])
+    def _build_import_resolver(self) -> 'ImportResolver':
+        """Index the scanned files and the project's path aliases for import resolution"""
+        root_dir = self.root_dir or os.path.commonpath(list(self.file_metadata) or ['.'])
+        if self.workspace is not None:
+            # Packages share the workspace file index but keep their own aliases
+            aliases, python_roots = self.workspace._workspace_scope()
+            return self.workspace.import_resolver.with_scope(
+                self._load_path_aliases(root_dir) + aliases,
+                [root_dir, os.path.join(root_dir, 'src')] + python_roots
+            )
+        return ImportResolver(
+            self.file_metadata.keys(),
+            extensions=self.config['resolve_extensions'],
+            index_files=self.config['resolve_index_files'],
+            aliases=self._load_path_aliases(root_dir),
+            python_roots=[root_dir, os.path.join(root_dir, 'src')]
+        )
 
-        # Ensure the directory exists
-        history_dir = os.path.dirname(history_path)
-        if not os.path.exists(history_dir):
-            os.makedirs(history_dir, exist_ok=True)
-
-        current_analysis = {
-            'timestamp': datetime.now().isoformat(),
-            'files': {
-                path: asdict(metadata)
-                for path, metadata in self.file_metadata.items()
-            },
-            'changes': self._analyze_changes()
-        }
+    def _load_path_aliases(self, root_dir: str) -> List[tuple]:
+        """Collect (pattern, target) import aliases from config, tsconfig/jsconfig and vite"""
+        aliases = []
+        for key, target in self.config['path_aliases'].items():
+            aliases.extend(self._alias_patterns(key, os.path.join(root_dir, target)))
 
-        try:
-            if os.path.exists(history_path):
-                with open(history_path, 'r') as f:
-                    history = json.load(f)
-                    self.history = history.get('analyses', [])
-            else:
-                self.history = []
+        for config_name in ('tsconfig.json', 'jsconfig.json'):
+            config_path = os.path.join(root_dir, config_name)
+            if not os.path.exists(config_path):
+                continue
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    options = self._parse_jsonc(f.read()).get('compilerOptions', {})
+                base_dir = os.path.join(root_dir, options.get('baseUrl', '.'))
+                for key, targets in options.get('paths', {}).items():
+                    # Only the first target is used; fallbacks are rare in practice
+                    if targets:
+                        aliases.append((key, os.path.join(base_dir, targets[0])))
+            except Exception as e:
+                self._record_error(f"Error loading path aliases from {config_name}: {str(e)}")
+
+        for config_name in ('vite.config.js', 'vite.config.ts', 'vite.config.mjs', 'vite.config.mts'):
+            config_path = os.path.join(root_dir, config_name)
+            if not os.path.exists(config_path):
+                continue
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                for match in self.VITE_ALIAS_PATTERN.finditer(content):
+                    key = match.group(1)
+                    target = next(group for group in match.groups()[1:] if group is not None)
+                    aliases.extend(self._alias_patterns(key, os.path.join(root_dir, target)))
+            except Exception as e:
+                self._record_error(f"Error loading path aliases from {config_name}: {str(e)}")
 
-            self.history.append(current_analysis)
+        return aliases
 
-            # Keep only last 10 analyses to manage file size
-            if len(self.history) > 10:
-                self.history = self.history[-10:]
+    @staticmethod
+    def _alias_patterns(key: str, target: str) -> List[tuple]:
+        """Expand a vite-style prefix alias into exact and wildcard patterns"""
+        key = key.rstrip('/')
+        return [(key, target), (f"{key}/*", os.path.join(target, '*'))]
 
-            with open(history_path, 'w') as f:
-                json.dump({'analyses': self.history}, f, indent=2)
+    @staticmethod
+    def _parse_jsonc(content: str) -> Dict:
+        """Parse JSON that may contain comments and trailing commas, as tsconfig allows"""
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+            content = re.sub(r'^\s*//.*$', '', content, flags=re.MULTILINE)
+            content = re.sub(r',(\s*[}\]])', r'\1', content)
+            return json.loads(content)
 
+    def _update_history(self) -> None:
+        """Update the project history with current analysis"""
+        try:
+            store = self._get_history_store()
+            # Diff against the previous run before this one is appended
+            changes = self._analyze_changes()
+            files = self.file_metadata
+            if self.config['extraction_tier'] != 'full':
+                # Record only what the tier extracted instead of forcing the rest
+                fields = self._report_fields()
+                files = {path: metadata.to_dict(fields) for path, metadata in files.items()}
+            store.append(
+                files,
+                datetime.now().isoformat(),
+                changes
+            )
+            self.history = store.runs
         except Exception as e:
-            print(f"Error updating history: {str(e)}")
+            self._record_error(f"Error updating history: {str(e)}")
 
     def analyze_complexity(self) -> Dict[str, Dict]:
         """Analyze code complexity metrics for each file"""
         complexity_metrics = {}
 
         for file_path, metadata in self.file_metadata.items():
+            if metadata.complexity:
+                complexity_metrics[file_path] = metadata.complexity
+                continue
+            if metadata.degraded or metadata.size > self.config['max_file_size']:
+                continue
+
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
 
-                metrics = {
-                    'cyclomatic_complexity': self._calculate_cyclomatic_complexity(content, metadata.language),
-                    'cognitive_complexity': self._calculate_cognitive_complexity(content, metadata.language),
-                    'nesting_depth': self._calculate_max_nesting(content, metadata.language),
-                    'lines_of_code': len(content.splitlines()),
-                    'comment_ratio': self._calculate_comment_ratio(content, metadata.language)
-                }
-
-                complexity_metrics[file_path] = metrics
+                metadata.complexity = self._measure_complexity(content, metadata.language)
+                complexity_metrics[file_path] = metadata.complexity
 
             except Exception as e:
-                print(f"Error analyzing complexity for {file_path}: {str(e)}")
+                self._record_error(f"Error analyzing complexity for {file_path}: {str(e)}")
 
         return complexity_metrics
 
-    # Placeholder methods for complexity analysis (to be implemented)
+    def _measure_complexity(self, content: str, language: str) -> Dict[str, float]:
+        """Compute complexity metrics when 'complexity_metrics' is enabled"""
+        if not self.config['complexity_metrics']:
+            return {}
+        return ComplexityAnalyzer.measure(content, language)
+
     def _calculate_cyclomatic_complexity(self, content: str, language: str) -> int:
-        """Calculate cyclomatic complexity (placeholder)"""
-        return 0
+        """Calculate cyclomatic complexity"""
+        return ComplexityAnalyzer.measure(content, language)['cyclomatic_complexity']
 
     def _calculate_cognitive_complexity(self, content: str, language: str) -> int:
-        """Calculate cognitive complexity (placeholder)"""
-        return 0
+        """Calculate cognitive complexity"""
+        return ComplexityAnalyzer.measure(content, language)['cognitive_complexity']
 
     def _calculate_max_nesting(self, content: str, language: str) -> int:
-        """Calculate maximum nesting depth (placeholder)"""
-        return 0
+        """Calculate maximum nesting depth"""
+        return ComplexityAnalyzer.measure(content, language)['nesting_depth']
 
     def _calculate_comment_ratio(self, content: str, language: str) -> float:
-        """Calculate comment ratio (placeholder)"""
-        return 0.0
-
-if __name__ == "__main__":
-    # Example usage
-    analyzer = UniversalCodebaseAnalyzer()
-
-    # Get current directory
-    current_dir = os.path.dirname(os.path.abspath(__file__))
+        """Calculate comment ratio"""
+        return ComplexityAnalyzer.measure(content, language)['comment_ratio']
+
+# Per-process analyzer used by ProcessPoolExecutor workers
+_worker_analyzer: Optional[UniversalCodebaseAnalyzer] = None
+
+def _init_worker(config: Dict) -> None:
+    """Create the analyzer a worker process extracts metadata with"""
+    global _worker_analyzer
+    _worker_analyzer = UniversalCodebaseAnalyzer()
+    _worker_analyzer.config = config
+    if config['profile']:
+        _worker_analyzer.metrics = RunMetrics(config['profile_top'])
+
+def _extract_file_metadata_worker(file_path: str) -> Optional[FileMetadata]:
+    """Picklable entry point for extracting one file in a worker process"""
+    return _worker_analyzer._extract_file_metadata(file_path)
+
+def _metadata_from_read_worker(file_path: str, stat: os.stat_result, data: Optional[bytes],
+                               file_hash: Optional[str]) -> Optional[FileMetadata]:
+    """Picklable entry point for the extraction stage of the pipeline executor"""
+    return _worker_analyzer._metadata_from_read(file_path, stat, data, file_hash)
+
+def _extract_file_timed_worker(
+        file_path: str) -> Tuple[Optional[FileMetadata], float, Dict[str, float], List[str]]:
+    """Profiling entry point: timings plus the errors raised while extracting this file"""
+    metadata, seconds, timings = _worker_analyzer._extract_file_timed(file_path)
+    errors = _worker_analyzer.metrics.errors[:]
+    _worker_analyzer.metrics.errors.clear()
+    return metadata, seconds, timings, errors
+
+def _metadata_from_read_timed_worker(
+        file_path: str, stat: os.stat_result, data: Optional[bytes],
+        file_hash: Optional[str]) -> Tuple[Optional[FileMetadata], float, Dict[str, float], List[str]]:
+    """Profiling entry point for the pipeline's extraction stage, like _extract_file_timed_worker"""
+    metadata, seconds, timings = _worker_analyzer._metadata_from_read_timed(file_path, stat, data, file_hash)
+    errors = _worker_analyzer.metrics.errors[:]
+    _worker_analyzer.metrics.errors.clear()
+    return metadata, seconds, timings, errors
+
+def _query_main(argv: List[str]) -> int:
+    """``query`` subcommand: answer lookups from a saved symbol index"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='generate_report.py query',
+                                     description='Look up symbols and importers in a saved index')
+    parser.add_argument('index', help='<report>.index.json written alongside a report')
+    parser.add_argument('name', nargs='+',
+                        help='symbol name, module/file for --importers, or changed files for --impacted')
+    parser.add_argument('--kind', choices=sorted(SymbolIndex.KINDS),
+                        help='only report definitions of this kind')
+    parser.add_argument('--importers', action='store_true',
+                        help='list files importing NAME instead of its definitions')
+    parser.add_argument('--impacted', action='store_true',
+                        help='list the changed files and every file depending on them, e.g. to select tests')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(argv)
+    if len(args.name) > 1 and not args.impacted:
+        parser.error('only --impacted accepts several names')
+
+    index = SymbolIndex.load(args.index)
+    if args.impacted:
+        result = index.impacted_files(args.name)
+        lines = result
+    elif args.importers:
+        result = index.find_importers(args.name[0])
+        lines = result
+    else:
+        result = index.find_definitions(args.name[0], args.kind)
+        lines = [f"{kind}\t{path}" for kind, paths in result.items() for path in paths]
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for line in lines:
+            print(line)
+    return 0
+
+def _add_project_arguments(parser) -> None:
+    """Arguments shared by the subcommands that analyze a project"""
+    parser.add_argument('root', nargs='?', default='.', help='project root (default: the current directory)')
+    parser.add_argument('--config', help='YAML configuration file')
+
+def _print_changes(changes: Dict[str, List[str]], as_json: bool) -> None:
+    """Print changes as JSON, or as one '<change type>\t<path>' line per file"""
+    if as_json:
+        print(json.dumps(changes, indent=2))
+        return
+    for change_type, files in changes.items():
+        for path in files:
+            print(f"{change_type}\t{path}")
+
+def _scan_main(argv: List[str]) -> int:
+    """``scan`` subcommand: update the incremental cache and history, printing what changed"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='generate_report.py scan',
+        description='Incrementally analyze a project and print the files that changed'
+    )
+    _add_project_arguments(parser)
+    parser.add_argument('--exit-code', action='store_true', help='exit with status 1 when files changed')
+    parser.add_argument('--json', action='store_true', help='print changes as JSON')
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
+
+    analyzer = UniversalCodebaseAnalyzer(args.config)
+    analyzer.config['incremental'] = True
+    if analyzer.unchanged_since_last_scan(root):
+        # Nothing to extract, and nothing new for the history
+        changes = {}
+    else:
+        analyzer.analyze_project(root)
+        changes = {change_type: files for change_type, files in analyzer._analyze_changes().items() if files}
+    _print_changes(changes, args.json)
+    return 1 if args.exit_code and changes else 0
+
+def _diff_main(argv: List[str]) -> int:
+    """``diff`` subcommand: files changed since the last scan, leaving the cache untouched"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='generate_report.py diff',
+                                     description='List files added, modified or deleted since the last scan')
+    _add_project_arguments(parser)
+    parser.add_argument('--exit-code', action='store_true', help='exit with status 1 when files changed')
+    parser.add_argument('--json', action='store_true', help='print changes as JSON')
+    args = parser.parse_args(argv)
+
+    analyzer = UniversalCodebaseAnalyzer(args.config)
+    changes = analyzer.changes_since_last_scan(os.path.abspath(args.root))
+    _print_changes(changes, args.json)
+    return 1 if args.exit_code and any(changes.values()) else 0
+
+def _report_main(argv: List[str]) -> int:
+    """``report`` subcommand, also the default: analyze a project and write the report"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='generate_report.py [report]',
+        description='Analyze a codebase and write a report',
+        epilog="other subcommands: 'scan' and 'diff' check for changes, 'query' looks up symbols "
+               "in a saved report index; run 'generate_report.py <subcommand> -h' for details"
+    )
+    _add_project_arguments(parser)
+    parser.add_argument('--output', help='report path without extension')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and update the report when files change')
+    parser.add_argument('--workspace', action='store_true',
+                        help='analyze every package under ROOT and write per-package and aggregate reports')
+    parser.add_argument('--profile', action='store_true',
+                        help='add phase timings and the slowest files and patterns to the report')
+    parser.add_argument('--profile-output', metavar='PATH',
+                        help='write a cProfile dump of the analysis to PATH')
+    args = parser.parse_args(argv)
+    if args.watch and args.workspace:
+        parser.error('--watch cannot be combined with --workspace')
+    root = os.path.abspath(args.root)
+
+    analyzer = UniversalCodebaseAnalyzer(args.config)
+    if args.profile:
+        analyzer.config['profile'] = True
+    if args.profile_output:
+        analyzer.config['profile_output'] = args.profile_output
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+    output_path = args.output or f"codebase_report_{timestamp}"
 
-    # Analyze project
-    analyzer.analyze_project(current_dir)
+    if args.workspace:
+        analyzer.analyze_workspace(root)
+        analyzer.generate_workspace_report(output_path)
+    elif args.watch:
+        try:
+            analyzer.watch(root, output_path)
+        except KeyboardInterrupt:
+            pass
+    else:
+        # Analyze project
+        analyzer.analyze_project(root)
+
+        # Generate report
+        analyzer.generate_report(output_path)
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: ``generate_report.py [scan|report|query|diff] ...``"""
+    argv = sys.argv[1:] if argv is None else argv
+    commands = {'scan': _scan_main, 'report': _report_main, 'query': _query_main, 'diff': _diff_main}
+    if argv and argv[0] in commands:
+        return commands[argv[0]](argv[1:])
+    return _report_main(argv)
 
-    # Generate report
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-    analyzer.generate_report(f"codebase_report_{timestamp}")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""Command-line launcher for generate_report that reuses its cached bytecode
+
+Usage:
+    python report_cli.py scan --exit-code
+    python report_cli.py diff path/to/project --json
+    python report_cli.py report --output codebase_report
+    python report_cli.py query codebase_report.index.json useAuth
+"""
+import sys
+
+from generate_report import main
+
+if __name__ == "__main__":
+    sys.exit(main())
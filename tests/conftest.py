@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_report import UniversalCodebaseAnalyzer
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    """Analyzer whose state files (cache, history) land in a temporary CWD"""
+    state = tmp_path / 'state'
+    state.mkdir()
+    monkeypatch.chdir(state)
+    return UniversalCodebaseAnalyzer()
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Write {relative path: content} into a fresh project directory"""
+    root = tmp_path / 'project'
+    root.mkdir()
+
+    def write(files):
+        for name, content in files.items():
+            path = root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        return str(root)
+
+    return write
@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+
+from generate_report import main
+
+
+def test_scan_json_stays_parseable_with_unreadable_files(analyzer, project, capsys):
+    root = project({'a.js': 'export const a = 1\n'})
+    with open(f'{root}/latin1.js', 'wb') as f:
+        f.write('const s = "caf\xe9"\n'.encode('latin-1'))
+
+    assert main(['scan', root, '--json']) == 0
+    captured = capsys.readouterr()
+    assert 'latin1.js' in captured.err
+    assert sorted(json.loads(captured.out)['new_files']) == [f'{root}/a.js']
+
+
+def test_git_scan_keeps_a_stat_index_for_the_fast_path(analyzer, project, capsys):
+    root = project({'.gitignore': 'build/\n', 'a.js': 'export const a = 1\n', 'build/out.js': ''})
+    git = ['git', '-C', root, '-c', 'user.name=t', '-c', 'user.email=t@t']
+    for command in (['init', '-q'], ['add', '-A'], ['commit', '-qm', 'init']):
+        subprocess.run(git + command, check=True)
+    analyzer.config['change_detection'] = 'git'
+
+    analyzer.analyze_project(root)
+    assert os.path.exists(analyzer._stat_index_path())
+    assert analyzer.unchanged_since_last_scan(root)
+
+    with open(f'{root}/build/new.js', 'w') as f:
+        f.write('export const n = 1\n')
+    assert analyzer.changes_since_last_scan(root)['new_files'] == []
+    with open(f'{root}/b.js', 'w') as f:
+        f.write('export const b = 1\n')
+    assert analyzer.changes_since_last_scan(root)['new_files'] == [f'{root}/b.js']
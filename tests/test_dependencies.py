@@ -0,0 +1,59 @@
+import os
+
+
+def test_added_file_shadowing_a_resolved_import_updates_its_importers(analyzer, project):
+    root = project({
+        'a.js': "const u = require('./utils')\n",
+        'utils/index.js': 'export const u = 1\n',
+        'src/app.py': 'import helpers\n',
+        'helpers.py': 'X = 1\n'
+    })
+    analyzer.analyze_project(root)
+    assert analyzer.dependency_tree[f'{root}/a.js'] == [f'{root}/utils/index.js']
+    assert analyzer.dependency_tree[f'{root}/src/app.py'] == [f'{root}/helpers.py']
+
+    added = []
+    for name, content in (('utils.js', 'export const u = 2\n'), ('src/helpers.py', 'X = 2\n')):
+        added.append(os.path.join(root, name))
+        with open(added[-1], 'w') as f:
+            f.write(content)
+    assert analyzer._apply_changes(set(added))
+
+    assert analyzer.dependency_tree[f'{root}/a.js'] == [f'{root}/utils.js']
+    assert analyzer.dependency_tree[f'{root}/src/app.py'] == [f'{root}/src/helpers.py']
+    assert analyzer.dependency_graph.reverse_edges[f'{root}/utils.js'] == {f'{root}/a.js'}
+
+
+def test_added_and_removed_files_re_resolve_only_matching_importers(analyzer, project, monkeypatch):
+    root = project({
+        'a.js': "const m = require('./missing')\n",
+        'b.js': "const u = require('./utils')\n",
+        'c.js': "const react = require('react')\n",
+        'd.js': "const o = require('./other')\n",
+        'other.js': '',
+        'utils.js': '',
+    })
+    analyzer.analyze_project(root)
+    resolved = []
+    resolve_dependencies = analyzer._resolve_dependencies
+
+    def counting_resolve(file_path):
+        resolved.append(file_path)
+        return resolve_dependencies(file_path)
+
+    monkeypatch.setattr(analyzer, '_resolve_dependencies', counting_resolve)
+
+    with open(f'{root}/missing.js', 'w') as f:
+        f.write('')
+    assert analyzer._apply_changes({f'{root}/missing.js'})
+    assert sorted(resolved) == [f'{root}/a.js', f'{root}/missing.js']
+    assert analyzer.dependency_tree[f'{root}/a.js'] == [f'{root}/missing.js']
+    # Memoized resolutions of other names survive
+    assert (root, './other', False) in analyzer.import_resolver._cache
+
+    resolved.clear()
+    os.remove(f'{root}/utils.js')
+    assert analyzer._apply_changes({f'{root}/utils.js'})
+    assert resolved == [f'{root}/b.js']
+    assert analyzer.dependency_tree[f'{root}/b.js'] == []
+    assert f'{root}/utils.js' not in analyzer.dependency_graph.reverse_edges
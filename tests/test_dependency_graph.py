@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from generate_report import DependencyGraph
+
+
+def cyclic_nodes(edges):
+    """Nodes that can reach themselves, by brute force"""
+    cyclic = set()
+    for start in edges:
+        seen, pending = set(), list(edges[start])
+        while pending:
+            node = pending.pop()
+            if node == start:
+                cyclic.add(start)
+                break
+            if node not in seen:
+                seen.add(node)
+                pending.extend(edges.get(node, ()))
+    return cyclic
+
+
+def test_cycles_include_self_imports():
+    graph = DependencyGraph()
+    graph.set_edges('a', ['b'])
+    graph.set_edges('b', ['a'])
+    graph.set_edges('c', ['c'])
+    graph.set_edges('d', ['a'])
+    assert sorted(map(sorted, graph.cycles())) == [['a', 'b'], ['c']]
+    assert graph.circular_nodes() == {'a', 'b', 'c'}
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_incremental_circular_nodes_match_a_full_run(seed):
+    rng = random.Random(seed)
+    nodes = [f'n{index}' for index in range(rng.randint(4, 24))]
+    graph = DependencyGraph()
+    for node in nodes:
+        graph.set_edges(node, rng.sample(nodes, rng.randint(0, 2)))
+    graph.circular_nodes()
+
+    for _ in range(60):
+        node = rng.choice(nodes)
+        if node in graph.edges and rng.random() < 0.1:
+            # Importers drop their edges to a removed file, as _update_dependencies does
+            for importer in list(graph.reverse_edges.get(node, ())):
+                if importer != node:
+                    graph.set_edges(importer, [t for t in graph.edges[importer] if t != node])
+            graph.remove_node(node)
+        else:
+            graph.set_edges(node, rng.sample(nodes, rng.randint(0, 3)))
+
+        full = DependencyGraph()
+        for source, targets in graph.edges.items():
+            full.set_edges(source, targets)
+        expected = {node for component in full.cycles() for node in component}
+        assert graph.circular_nodes() == expected == cyclic_nodes(graph.edges)
+
+
+def test_impacted_follows_importers_transitively():
+    graph = DependencyGraph()
+    graph.set_edges('app', ['lib'])
+    graph.set_edges('lib', ['util'])
+    graph.set_edges('other', [])
+    assert graph.impacted(['util']) == {'util', 'lib', 'app'}
+    assert graph.transitive_dependencies('app') == {'lib', 'util'}
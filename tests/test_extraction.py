@@ -0,0 +1,63 @@
+import os
+import time
+
+import pytest
+
+from generate_report import ComplexityAnalyzer
+
+
+@pytest.mark.parametrize('language', ['javascript', 'python'])
+@pytest.mark.parametrize('unit', ["'\\", '"\\', '`', '"""\\"', '/*'])
+def test_unterminated_tokens_are_linear(language, unit):
+    content = unit * 200000
+    start = time.perf_counter()
+    ComplexityAnalyzer.measure(content, language)
+    assert time.perf_counter() - start < 2.0
+
+
+def test_unterminated_quote_in_jsx_text_hides_the_rest_of_the_line():
+    content = "function f() {\n  return <p>We're sorry if this breaks</p>\n}\n"
+    assert ComplexityAnalyzer.measure(content, 'javascript')['cyclomatic_complexity'] == 1
+
+
+def test_python_comment_ratio_ignores_hashes_in_continued_strings():
+    content = 'x = """a \\\n# not a comment"""\ny = 1  # comment\n'
+    assert ComplexityAnalyzer.measure(content, 'python')['comment_ratio'] == round(1 / 3, 3)
+
+
+def test_pathological_file_is_extracted_quickly(analyzer, project):
+    root = project({'big.js': "'\\" * 40000, 'big.py': "'\\" * 40000})
+    analyzer.config['extraction_time_budget'] = 1.0
+    for name in ('big.js', 'big.py'):
+        start = time.perf_counter()
+        metadata = analyzer._extract_file_metadata(os.path.join(root, name))
+        assert time.perf_counter() - start < 1.0
+        assert metadata.degraded is None
+
+
+def test_slow_complexity_downgrades_to_hash_only(analyzer, project, monkeypatch):
+    root = project({'slow.js': 'function f() { return 1 }\n'})
+    measure = ComplexityAnalyzer.measure
+
+    def slow_measure(content, language):
+        time.sleep(0.2)
+        return measure(content, language)
+
+    monkeypatch.setattr(ComplexityAnalyzer, 'measure', staticmethod(slow_measure))
+    analyzer.config['extraction_time_budget'] = 0.1
+    metadata = analyzer._extract_file_metadata(os.path.join(root, 'slow.js'))
+    assert metadata.degraded == 'extraction_time_budget'
+    assert metadata.functions == []
+
+
+def test_slow_deferred_complexity_is_degraded(analyzer, project, monkeypatch):
+    path = os.path.join(project({'slow.js': 'function f() { return 1 }\n'}), 'slow.js')
+    measure = ComplexityAnalyzer.measure
+
+    def slow_measure(content, language):
+        time.sleep(0.2)
+        return measure(content, language)
+
+    monkeypatch.setattr(ComplexityAnalyzer, 'measure', staticmethod(slow_measure))
+    analyzer.config['extraction_time_budget'] = 0.1
+    assert analyzer._extract_deferred_fields(path, ['complexity']) == {'degraded': 'extraction_time_budget'}
@@ -0,0 +1,65 @@
+import time
+
+from generate_report import ExtractionCache, UniversalCodebaseAnalyzer
+
+FIELDS = {'dependencies': ['./b'], 'exports': [], 'doc_strings': [], 'functions': ['f'], 'classes': [],
+          'complexity': {'cyclomatic_complexity': 1}}
+
+
+def test_get_returns_what_put_stored_for_the_same_version(tmp_path):
+    path = str(tmp_path / 'cache' / 'extractions.sqlite')
+    cache = ExtractionCache(path, version='v1', max_bytes=1 << 20)
+    assert cache.get('h1', 'javascript') is None
+    cache.put('h1', 'javascript', FIELDS)
+    assert cache.get('h1', 'javascript') == FIELDS
+    assert cache.get('h1', 'python') is None
+
+    # Another process or analyzer sees the entry; another extractor version does not
+    assert ExtractionCache(path, version='v1', max_bytes=1 << 20).get('h1', 'javascript') == FIELDS
+    assert ExtractionCache(path, version='v2', max_bytes=1 << 20).get('h1', 'javascript') is None
+
+
+def test_prune_evicts_least_recently_used_entries(tmp_path):
+    cache = ExtractionCache(str(tmp_path / 'extractions.sqlite'), version='v1', max_bytes=1 << 20)
+    for index in range(10):
+        cache.put(f'h{index}', 'javascript', FIELDS)
+    connection = cache._connect()
+    now = time.time()
+    for index in range(10):
+        # h0 is the oldest; a read older than TOUCH_INTERVAL refreshes h2
+        age = cache.TOUCH_INTERVAL * (2 + 10 - index)
+        connection.execute('UPDATE extractions SET last_access = ? WHERE hash = ?', (now - age, f'h{index}'))
+    assert cache.get('h2', 'javascript') == FIELDS
+
+    entry_size = connection.execute('SELECT size FROM extractions LIMIT 1').fetchone()[0]
+    cache.max_bytes = entry_size * 6
+    cache.prune()
+    kept = {row[0] for row in connection.execute('SELECT hash FROM extractions')}
+    # Evicted down to 90% of max_bytes, oldest first
+    assert kept == {'h2', 'h6', 'h7', 'h8', 'h9'}
+
+    cache.prune()
+    assert len(list(connection.execute('SELECT hash FROM extractions'))) == 5
+
+
+def test_analyzers_share_extractions_through_the_cache(analyzer, project, tmp_path, monkeypatch):
+    root = project({'a.js': "const b = require('./b')\nfunction f() {}\n", 'b.js': 'class B {}\n'})
+    analyzer.config['extraction_cache'] = str(tmp_path / 'shared.sqlite')
+    analyzer.analyze_project(root)
+    expected = {path: view.to_dict() for path, view in analyzer.file_metadata.items()}
+
+    def extract_symbols(*args, **kwargs):
+        raise AssertionError('extracted despite a cached result')
+
+    second = UniversalCodebaseAnalyzer()
+    second.config['extraction_cache'] = analyzer.config['extraction_cache']
+    monkeypatch.setattr(UniversalCodebaseAnalyzer, '_extract_symbols', extract_symbols)
+    second.analyze_project(root)
+    assert {path: view.to_dict() for path, view in second.file_metadata.items()} == expected
+
+
+def test_extractor_version_follows_the_extraction_tier():
+    analyzer = UniversalCodebaseAnalyzer()
+    full = analyzer._extractor_version()
+    analyzer.config['extraction_tier'] = 'deps'
+    assert analyzer._extractor_version() != full
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import mmap
+
+import pytest
+
+from generate_report import UniversalCodebaseAnalyzer
+
+CONTENT = b"// header\r\nexport function run() { return 1 }\r\n"
+
+
+@pytest.mark.parametrize('algorithm, expected', [
+    ('md5', hashlib.md5(CONTENT).hexdigest()),
+    ('sha1', hashlib.sha1(CONTENT).hexdigest()),
+    ('blake2b', hashlib.blake2b(CONTENT, digest_size=16).hexdigest()),
+])
+def test_hash_algorithm_selects_the_digest(analyzer, tmp_path, algorithm, expected):
+    path = tmp_path / 'a.js'
+    path.write_bytes(CONTENT)
+    analyzer.config['hash_algorithm'] = algorithm
+    metadata = analyzer._extract_file_metadata(str(path))
+    assert metadata.hash == expected == analyzer._hash_file_chunked(str(path))
+
+
+def test_memory_mapped_reads_match_plain_reads(analyzer, tmp_path, monkeypatch):
+    path = tmp_path / 'a.js'
+    path.write_bytes(CONTENT)
+    plain = analyzer._extract_file_metadata(str(path))
+
+    mapped = []
+    real_mmap = mmap.mmap
+
+    def counting_mmap(*args, **kwargs):
+        mapped.append(args)
+        return real_mmap(*args, **kwargs)
+
+    monkeypatch.setattr(mmap, 'mmap', counting_mmap)
+    analyzer.config['mmap_threshold'] = 1
+    content, file_hash = analyzer._read_and_hash(str(path), len(CONTENT))
+    assert mapped
+    assert content == CONTENT.decode().replace('\r\n', '\n')
+    assert file_hash == hashlib.md5(CONTENT).hexdigest()
+    assert analyzer._extract_file_metadata(str(path)) == plain
+
+
+@pytest.mark.parametrize('executor', ['thread', 'pipeline'])
+def test_files_over_max_file_size_are_hashed_but_not_parsed(analyzer, project, executor):
+    root = project({'big.js': 'export function big() {}\n' * 100, 'small.js': 'export function small() {}\n'})
+    analyzer.config['max_file_size'] = 1000
+    analyzer.config['executor'] = executor
+    analyzer.analyze_project(root)
+
+    big = analyzer.file_metadata[f'{root}/big.js']
+    with open(f'{root}/big.js', 'rb') as f:
+        assert big.hash == hashlib.md5(f.read()).hexdigest()
+    assert big.degraded == 'max_file_size'
+    assert list(big.functions) == []
+    assert list(analyzer.file_metadata[f'{root}/small.js'].functions) == ['small']
+    assert analyzer._degraded_files() == {f'{root}/big.js': 'max_file_size'}
+
+
+def test_switching_hash_algorithm_invalidates_the_incremental_cache(analyzer, project):
+    root = project({'a.js': 'export const a = 1\n', 'b.js': 'export const b = 1\n'})
+    analyzer.config['incremental'] = True
+    analyzer.analyze_project(root)
+    assert analyzer.unchanged_since_last_scan(root)
+
+    second = UniversalCodebaseAnalyzer()
+    second.config.update(incremental=True, hash_algorithm='sha256')
+    assert not second.unchanged_since_last_scan(root)
+    second.analyze_project(root)
+    with open(second._state_path(second.config['cache_file'])) as f:
+        cached = json.load(f)['files']
+    assert {len(entry['metadata']['hash']) for entry in cached.values()} == {64}
+    assert {len(metadata.hash) for metadata in second.file_metadata.values()} == {64}
+    assert second._analyze_changes()['modified_files'] == []
@@ -0,0 +1,82 @@
+import random
+
+from generate_report import HistoryStore
+
+
+def metadata(path, content_hash, mtime=1.0):
+    return {
+        'path': path, 'language': 'javascript', 'size': 1, 'last_modified': mtime, 'hash': content_hash,
+        'dependencies': [], 'exports': [], 'doc_strings': [], 'functions': [], 'classes': [],
+        'complexity': {}, 'degraded': None
+    }
+
+
+def test_truncated_trailing_record_is_dropped(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    store = HistoryStore(path)
+    store.append({'a.js': metadata('a.js', 'h1')}, 't1', {})
+    with open(path, 'ab') as f:
+        f.write(b'{"type": "run", "timestamp": "t2", "se')
+
+    store = HistoryStore(path)
+    assert [run['timestamp'] for run in store.runs] == ['t1']
+    store.append({'a.js': metadata('a.js', 'h2')}, 't3', {})
+
+    store = HistoryStore(path)
+    assert [run['timestamp'] for run in store.runs] == ['t1', 't3']
+    assert store.latest_hashes() == {'a.js': 'h2'}
+
+
+def test_changes_without_history_tracking_touch_no_state(analyzer, project, tmp_path):
+    root = project({'a.js': 'export const a = 1\n'})
+    analyzer.config['track_history'] = False
+    analyzer.analyze_project(root)
+
+    assert analyzer._analyze_changes() == {}
+    assert list((tmp_path / 'state').iterdir()) == []
+
+
+def test_snapshots_replay_every_run_and_survive_compaction(tmp_path):
+    rng = random.Random(0)
+    path = str(tmp_path / 'history.jsonl')
+    store = HistoryStore(path, max_runs=3)
+    expected = []
+    files = {}
+    for run in range(10):
+        for name in rng.sample(['a.js', 'b.js', 'c.js', 'd.js'], 2):
+            if name in files and rng.random() < 0.3:
+                del files[name]
+            else:
+                files[name] = metadata(name, f'h{rng.randint(0, 3)}', mtime=float(run))
+        expected.append({name: dict(meta) for name, meta in files.items()})
+        store.append(files, f't{run}', {})
+        # Compaction keeps the last max_runs runs once the log holds twice as many
+        kept = expected[-len(store.runs):]
+        for index, snapshot in enumerate(kept):
+            assert store.snapshot(index) == snapshot
+
+    reloaded = HistoryStore(path, max_runs=3)
+    assert [run['timestamp'] for run in reloaded.runs] == [run['timestamp'] for run in store.runs]
+    assert reloaded.snapshot() == expected[-1]
+    assert reloaded.latest_hashes() == {name: meta['hash'] for name, meta in files.items()}
+
+    store.compact()
+    assert len(store.runs) == 3
+    assert [store.snapshot(index) for index in range(3)] == expected[-3:]
+    with open(path) as f:
+        blob_keys = [line for line in f if line.startswith('{"type": "blob"')]
+    assert len(blob_keys) <= 4
+
+
+def test_unchanged_files_are_not_rewritten(tmp_path):
+    path = str(tmp_path / 'history.jsonl')
+    store = HistoryStore(path)
+    files = {'a.js': metadata('a.js', 'h1'), 'b.js': metadata('b.js', 'h1')}
+    store.append(files, 't1', {})
+    with open(path) as f:
+        size = len(f.read())
+    store.append(files, 't2', {})
+
+    with open(path) as f:
+        last = f.read()[size:]
+    assert '"set": {}' in last and 'blob' not in last
@@ -0,0 +1,47 @@
+import os
+
+from generate_report import UniversalCodebaseAnalyzer
+
+
+def rescan():
+    analyzer = UniversalCodebaseAnalyzer()
+    analyzer.config['incremental'] = True
+    return analyzer
+
+
+def test_incremental_scan_reports_new_modified_and_deleted_files(analyzer, project):
+    root = project({'a.js': 'export const a = 1\n', 'b.js': "const a = require('./a')\n"})
+    analyzer.config['incremental'] = True
+    analyzer.analyze_project(root)
+    assert sorted(analyzer._analyze_changes()['new_files']) == [f'{root}/a.js', f'{root}/b.js']
+
+    project({'a.js': 'export const a = 2\n', 'c.js': ''})
+    os.utime(f'{root}/a.js', (1, 1))
+    os.remove(f'{root}/b.js')
+    second = rescan()
+    second.analyze_project(root)
+    changes = second._analyze_changes()
+    assert changes['new_files'] == [f'{root}/c.js']
+    assert changes['modified_files'] == [f'{root}/a.js']
+    assert changes['deleted_files'] == [f'{root}/b.js']
+
+
+def test_failed_re_extraction_keeps_the_file_as_last_scanned(analyzer, project, capsys):
+    root = project({'a.js': 'export function run() {}\n'})
+    analyzer.config['incremental'] = True
+    analyzer.analyze_project(root)
+
+    with open(f'{root}/a.js', 'wb') as f:
+        f.write('export const s = "caf\xe9"\n'.encode('latin-1'))
+    second = rescan()
+    second.analyze_project(root)
+    assert 'a.js' in capsys.readouterr().err
+    assert second._analyze_changes()['deleted_files'] == []
+    assert list(second.file_metadata[f'{root}/a.js'].functions) == ['run']
+
+    # Still retried, and picked up once it can be read again
+    project({'a.js': 'export function fixed() {}\n'})
+    third = rescan()
+    third.analyze_project(root)
+    assert third._analyze_changes()['modified_files'] == [f'{root}/a.js']
+    assert list(third.file_metadata[f'{root}/a.js'].functions) == ['fixed']
@@ -0,0 +1,149 @@
+import hashlib
+import random
+from dataclasses import asdict
+
+from generate_report import (
+    FileMetadata, FileMetadataView, MetadataStore, SymbolIndex, UniversalCodebaseAnalyzer
+)
+
+
+def record(rng, path, algorithm='md5'):
+    words = ['react', 'useState', 'utils', 'App', 'render', 'Button']
+    return FileMetadata(
+        path=path,
+        language=rng.choice(['javascript', 'python', 'typescript']),
+        size=rng.randint(0, 10 ** 6),
+        last_modified=rng.random() * 1e9,
+        hash=hashlib.new(algorithm, path.encode()).hexdigest(),
+        dependencies=rng.sample(words, rng.randint(0, 3)),
+        exports=rng.sample(words, rng.randint(0, 2)),
+        doc_strings=[f'doc {rng.random()}' for _ in range(rng.randint(0, 2))],
+        functions=rng.sample(words, rng.randint(0, 3)),
+        classes=rng.sample(words, rng.randint(0, 1)),
+        complexity=rng.choice([{}, {'cyclomatic_complexity': rng.randint(1, 9), 'comment_ratio': 0.5}]),
+        degraded=rng.choice([None, None, 'max_file_size'])
+    )
+
+
+def as_dict(metadata):
+    values = asdict(metadata)
+    del values['degraded']
+    return values
+
+
+def test_round_trip_with_replacement_and_deletion():
+    rng = random.Random(0)
+    store = MetadataStore()
+    expected = {}
+    for step in range(500):
+        path = f'src/file{rng.randint(0, 60)}.js'
+        if path in expected and rng.random() < 0.3:
+            del store[path]
+            del expected[path]
+        else:
+            # A longer digest part way through re-strides the hash column
+            expected[path] = record(rng, path, 'sha256' if step > 250 else 'md5')
+            store[path] = expected[path]
+
+    assert len(store) == len(expected)
+    for path, metadata in expected.items():
+        view = store[path]
+        assert isinstance(view, FileMetadataView)
+        assert {key: (list(value) if isinstance(value, tuple) else value)
+                for key, value in view.to_dict().items()} == as_dict(metadata)
+        assert view.degraded == metadata.degraded
+
+    copy = MetadataStore(store.items())
+    assert {path: view.to_dict() for path, view in copy.items()} == \
+        {path: view.to_dict() for path, view in store.items()}
+
+
+def test_deferred_fields_load_on_first_access_in_groups():
+    calls = []
+
+    def loader(path, fields):
+        calls.append(fields)
+        return {'functions': ['f'], 'exports': ['e'], 'classes': [],
+                'complexity': {'cyclomatic_complexity': 2}}
+
+    store = MetadataStore(loader=loader)
+    store['a.js'] = FileMetadata('a.js', 'javascript', 1, 1.0, 'ab', ['dep'], None, [],
+                                 None, None, None, None)
+    view = store['a.js']
+    assert view.dependencies == ('dep',)
+    assert calls == []
+
+    assert view.functions == ('f',)
+    assert view.exports == ('e',)
+    assert calls == [['exports', 'functions', 'classes']]
+    assert view.complexity == {'cyclomatic_complexity': 2}
+    assert calls[-1] == ['complexity']
+    assert store._snapshot(store._rows['a.js'], 'a.js').functions == ['f']
+
+
+def test_loader_can_degrade_a_file():
+    store = MetadataStore(loader=lambda path, fields: {'degraded': 'extraction_time_budget'})
+    store['a.js'] = FileMetadata('a.js', 'javascript', 1, 1.0, 'ab', [], None, None, None, None, None, None)
+    assert store['a.js'].functions == ()
+    assert store['a.js'].degraded == 'extraction_time_budget'
+
+
+def test_deferred_tier_matches_full_extraction(project, tmp_path, monkeypatch):
+    root = project({
+        'a.js': ("/** Doc */\nconst b = require('./b')\n"
+                 "export function run() { if (b) { return 1 } }\nclass A {}\n"),
+        'b.js': 'export const b = 1\n',
+        'c.py': '"""Module doc"""\nimport os\n__all__ = ["f"]\ndef f():\n    return os\n'
+    })
+    monkeypatch.chdir(tmp_path)
+    full = UniversalCodebaseAnalyzer()
+    full.analyze_project(root)
+    lazy = UniversalCodebaseAnalyzer()
+    lazy.config['extraction_tier'] = 'deps'
+    lazy.analyze_project(root)
+
+    assert {path: view.to_dict() for path, view in lazy.file_metadata.items()} == \
+        {path: view.to_dict() for path, view in full.file_metadata.items()}
+
+
+def test_deps_tier_report_does_not_load_deferred_fields(analyzer, project, tmp_path, monkeypatch):
+    root = project({'a.js': "const b = require('./b')\nfunction f() {}\n", 'b.js': 'export class B {}\n'})
+    analyzer.config['extraction_tier'] = 'deps'
+    analyzer.analyze_project(root)
+    loads = []
+    monkeypatch.setattr(analyzer.file_metadata, 'loader', lambda path, fields: loads.append(path))
+    analyzer.generate_report(str(tmp_path / 'report'))
+
+    assert loads == []
+    index = SymbolIndex.load(str(tmp_path / 'report.index.json'))
+    assert index.definitions == {kind: {} for kind in SymbolIndex.KINDS}
+    assert index.modules == {'./b': [f'{root}/a.js']}
+    assert index.importers == {f'{root}/b.js': [f'{root}/a.js']}
+
+
+def test_deferred_fields_of_a_file_changed_since_the_scan_are_stale(analyzer, project, tmp_path):
+    root = project({'a.js': 'function f() {}\n', 'b.js': 'class B {}\n'})
+    analyzer.config['extraction_tier'] = 'deps'
+    analyzer.analyze_project(root)
+    with open(f'{root}/a.js', 'w') as f:
+        f.write('function g() {}\n')
+
+    assert analyzer.file_metadata[f'{root}/a.js'].functions == ()
+    assert analyzer.file_metadata[f'{root}/a.js'].degraded == 'stale'
+    assert analyzer.file_metadata[f'{root}/b.js'].classes == ('B',)
+    assert analyzer._degraded_files() == {f'{root}/a.js': 'stale'}
+    analyzer.generate_report(str(tmp_path / 'report'))
+    assert f'  - {root}/a.js (changed since the scan)\n' in (tmp_path / 'report.txt').read_text()
+
+
+def test_incremental_cache_round_trip(analyzer, project):
+    root = project({'a.js': "const b = require('./b')\nfunction f() {}\n", 'b.js': 'export class B {}\n'})
+    analyzer.config['incremental'] = True
+    analyzer.analyze_project(root)
+    first = {path: view.to_dict() for path, view in analyzer.file_metadata.items()}
+
+    cached = UniversalCodebaseAnalyzer()
+    cached.config['incremental'] = True
+    cached.analyze_project(root)
+    assert {path: view.to_dict() for path, view in cached.file_metadata.items()} == first
+    assert cached._analyze_changes()['new_files'] == []
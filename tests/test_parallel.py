@@ -0,0 +1,56 @@
+import pytest
+
+from generate_report import UniversalCodebaseAnalyzer
+
+
+def sample_project(project):
+    files = {}
+    for index in range(40):
+        files[f'pkg{index % 4}/mod{index}.js'] = (
+            f"/** Module {index} */\nconst dep = require('./mod{(index + 4) % 40}')\n"
+            f"export function run{index}(a) {{ if (a) {{ return dep }} return null }}\nclass C{index} {{}}\n"
+        )
+        files[f'py/mod{index}.py'] = f'"""Module {index}"""\nimport os\n\ndef f{index}():\n    return os\n'
+    files['broken.js'] = ''
+    root = project(files)
+    with open(f'{root}/broken.js', 'wb') as f:
+        f.write('const s = "caf\xe9"\n'.encode('latin-1'))
+    return root
+
+
+def analyze(root, **config):
+    analyzer = UniversalCodebaseAnalyzer()
+    analyzer.config['track_history'] = False
+    analyzer.config.update(config)
+    analyzer.analyze_project(root)
+    return analyzer
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process', 'pipeline'])
+def test_parallel_extraction_matches_serial(analyzer, project, executor):
+    root = sample_project(project)
+    serial = analyze(root)
+    parallel = analyze(root, workers=3, executor=executor)
+
+    assert list(parallel.file_metadata) == list(serial.file_metadata)
+    assert {path: view.to_dict() for path, view in parallel.file_metadata.items()} == \
+        {path: view.to_dict() for path, view in serial.file_metadata.items()}
+    assert parallel.dependency_tree == serial.dependency_tree
+    assert parallel.circular_dependencies == serial.circular_dependencies != set()
+    assert f'{root}/broken.js' not in parallel.file_metadata
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_profiled_pipeline_metrics_match_serial(analyzer, project, workers):
+    root = sample_project(project)
+    serial = analyze(root, profile=True)
+    pipeline = analyze(root, profile=True, executor='pipeline', workers=workers)
+
+    assert {path: view.to_dict() for path, view in pipeline.file_metadata.items()} == \
+        {path: view.to_dict() for path, view in serial.file_metadata.items()}
+    expected, metrics = serial.metrics.as_dict(), pipeline.metrics.as_dict()
+    assert metrics['files_extracted'] == expected['files_extracted'] == len(serial.file_metadata)
+    assert metrics['bytes_extracted'] == expected['bytes_extracted']
+    assert metrics['errors'] == expected['errors'] != []
+    assert {entry['pattern'] for entry in metrics['slowest_patterns']} == \
+        {entry['pattern'] for entry in expected['slowest_patterns']}
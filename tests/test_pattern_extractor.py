@@ -0,0 +1,67 @@
+import glob
+import os
+import random
+
+import pytest
+
+from generate_report import UniversalCodebaseAnalyzer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FRAGMENTS = {
+    'javascript': [
+        "import './styles.css'\n", "const x = require('lib')\n", 'export default class App {}\n',
+        'export const handler = () => {}\n', 'function run(a) {', 'let f = (a) =>', 'var g =\n  (',
+        '/** Doc comment */\n', '/** unclosed', '*/', 'class Widget extends Base {}\n', '}', '{',
+        "import(\"lazy\")", 'export function', ' ', '\n', '"', "'", 'const', '=', '(',
+    ],
+    'python': [
+        'import os\n', 'from pkg.mod import name\n', '__all__ = ["a", "b"]\n', '__all__ = [\n',
+        ']', '[', 'def f(x):\n', 'class C(Base):\n', '"""Doc string"""\n', '"""', '    pass\n',
+        'async def g():\n', '#', ' ', '\n', 'import', 'def', 'class',
+    ],
+}
+FRAGMENTS['typescript'] = FRAGMENTS['javascript'] + [
+    'export interface Props {}\n', 'export type Id = string\n', 'interface State {}\n',
+]
+
+
+def legacy_fields(analyzer, content, language):
+    return {
+        'dependencies': analyzer._extract_dependencies(content, language),
+        'exports': analyzer._extract_exports(content, language),
+        'doc_strings': analyzer._extract_doc_strings(content, language),
+        'functions': analyzer._extract_functions(content, language),
+        'classes': analyzer._extract_classes(content, language),
+    }
+
+
+@pytest.mark.parametrize('language', sorted(FRAGMENTS))
+@pytest.mark.parametrize('seed', range(10))
+def test_extractor_matches_legacy_patterns_on_random_content(language, seed):
+    analyzer = UniversalCodebaseAnalyzer()
+    rng = random.Random(seed)
+    for _ in range(20):
+        content = ''.join(rng.choice(FRAGMENTS[language]) for _ in range(rng.randint(0, 60)))
+        assert analyzer._extract_symbols(content, language) == legacy_fields(analyzer, content, language)
+
+
+def test_extractor_matches_legacy_patterns_on_repo_sources():
+    analyzer = UniversalCodebaseAnalyzer()
+    paths = glob.glob(os.path.join(REPO_ROOT, 'src', '**', '*.js'), recursive=True)
+    paths += glob.glob(os.path.join(REPO_ROOT, 'src', '**', '*.jsx'), recursive=True)
+    paths += glob.glob(os.path.join(REPO_ROOT, '*.py'))
+    assert paths
+    for path in paths:
+        language = analyzer.config['languages'][os.path.splitext(path)[1]]
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        expected = legacy_fields(analyzer, content, language)
+        assert analyzer._extract_symbols(content, language) == expected, path
+
+
+def test_requested_fields_only(analyzer):
+    fields = analyzer._extract_symbols("const a = require('a')\nfunction f() {}\n", 'javascript',
+                                       fields=['dependencies'])
+    assert fields['dependencies'] == ['a']
+    assert fields['functions'] is None
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+FILES = {
+    'src/a.js': "const b = require('./b')\nexport function a() { return b }\n",
+    'src/b.js': 'export class B {}\n',
+    'tools/run.py': 'import os\n\ndef run():\n    return os\n',
+}
+
+
+@pytest.mark.parametrize('config', [
+    {}, {'workers': 2, 'executor': 'thread'}, {'workers': 2, 'executor': 'process'}
+])
+def test_profiled_run_reports_phases_files_and_errors(analyzer, project, tmp_path, config):
+    root = project(FILES)
+    with open(f'{root}/broken.js', 'wb') as f:
+        f.write('const s = "caf\xe9"\n'.encode('latin-1'))
+    analyzer.config.update(profile=True, **config)
+    analyzer.analyze_project(root)
+    analyzer.generate_report(str(tmp_path / 'report'))
+
+    with open(tmp_path / 'report.json') as f:
+        metrics = json.load(f)['metrics']
+    for phase in ('detect_project_type', 'scan_files', 'analyze_dependencies', 'update_history'):
+        assert metrics['phases'][phase]['calls'] >= 1, phase
+    assert metrics['files_extracted'] == len(FILES)
+    assert metrics['bytes_extracted'] == sum(len(content) for content in FILES.values())
+    assert {entry['path'] for entry in metrics['slowest_files']} == {f'{root}/{name}' for name in FILES}
+    assert [message for message in metrics['errors'] if 'broken.js' in message]
+
+    text = (tmp_path / 'report.txt').read_text()
+    assert '\nRun Metrics\n' in text
+    assert 'scan_files: ' in text and 'broken.js' in text.split('Run Metrics')[1]
+
+
+def test_metrics_are_omitted_without_profiling(analyzer, project, tmp_path):
+    analyzer.analyze_project(project(FILES))
+    analyzer.generate_report(str(tmp_path / 'report'))
+    with open(tmp_path / 'report.json') as f:
+        assert 'metrics' not in json.load(f)
+    assert 'Run Metrics' not in (tmp_path / 'report.txt').read_text()
@@ -0,0 +1,44 @@
+import io
+import json
+
+import pytest
+
+
+def materialize(analyzer, summary):
+    return {
+        key: dict(value) if key in ('files', 'dependencies') else value
+        for key, value in analyzer._iter_report_sections(summary)
+    }
+
+
+@pytest.mark.parametrize('indent', [2, None])
+@pytest.mark.parametrize('files', [
+    {},
+    {
+        'a.js': ("/** Doc \"quoted\" */\nconst b = require('./b')\n"
+                 "export function run() { return b ? 1 : 2 }\n"),
+        'b.js': "const a = require('./a')\nexport const b = 'caf\u00e9'\n",
+        'c.py': '"""Module"""\nimport os\nclass C:\n    pass\n'
+    }
+])
+def test_streamed_json_report_matches_json_dumps(analyzer, project, indent, files):
+    analyzer.analyze_project(project(files))
+    summary = {'timestamp': 'now', 'project': {'name': 'p'}, 'statistics': analyzer._generate_statistics(),
+               'changes': {}, 'degraded_files': analyzer._degraded_files()}
+
+    buffer = io.StringIO()
+    analyzer._write_json_report(buffer, summary, indent=indent)
+    separators = (',', ': ') if indent is not None else (',', ':')
+    expected = json.dumps(materialize(analyzer, summary), indent=indent, separators=separators)
+    assert buffer.getvalue() == expected
+
+
+def test_ndjson_report_holds_one_record_per_file(analyzer, project):
+    analyzer.analyze_project(project({'a.js': "const b = require('./b')\n", 'b.js': ''}))
+    summary = {'timestamp': 'now', 'project': {}, 'statistics': {}, 'changes': {}, 'degraded_files': {}}
+
+    buffer = io.StringIO()
+    analyzer._write_ndjson_report(buffer, summary)
+    records = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert sorted(record['path'] for record in records if record['type'] == 'file') == \
+        sorted(analyzer.file_metadata)
@@ -0,0 +1,107 @@
+import pytest
+
+from generate_report import ImportResolver, UniversalCodebaseAnalyzer
+
+FILES = [
+    '/p/src/app.js', '/p/src/utils.js', '/p/src/utils/index.js', '/p/src/components/Button.tsx',
+    '/p/src/lib/index.ts', '/p/setup.py', '/p/pkg/__init__.py', '/p/pkg/mod.py', '/p/pkg/sub/__init__.py',
+    '/p/pkg/sub/deep.py', '/p/tools/run.py', '/p/tools/helpers.py', '/p/src/core/engine.py',
+]
+
+
+@pytest.fixture
+def resolver():
+    return ImportResolver(
+        FILES,
+        extensions=['.js', '.jsx', '.ts', '.tsx', '.py'],
+        index_files=['index.js', 'index.ts'],
+        aliases=[('@/*', '/p/src/*'), ('@components/*', '/p/src/components/*'), ('lib', '/p/src/lib')],
+        python_roots=['/p', '/p/src']
+    )
+
+
+@pytest.mark.parametrize('specifier, expected', [
+    ('./utils', '/p/src/utils.js'),
+    ('./utils/index', '/p/src/utils/index.js'),
+    ('../setup.py', '/p/setup.py'),
+    ('@/components/Button', '/p/src/components/Button.tsx'),
+    ('@components/Button', '/p/src/components/Button.tsx'),
+    ('lib', '/p/src/lib/index.ts'),
+    ('react', None),
+    ('./missing', None),
+])
+def test_resolves_relative_and_aliased_js_imports(resolver, specifier, expected):
+    assert resolver.resolve('/p/src/app.js', specifier) == expected
+
+
+@pytest.mark.parametrize('source, specifier, expected', [
+    ('/p/tools/run.py', 'helpers', '/p/tools/helpers.py'),
+    ('/p/tools/run.py', 'pkg.mod', '/p/pkg/mod.py'),
+    ('/p/tools/run.py', 'pkg.sub.deep', '/p/pkg/sub/deep.py'),
+    ('/p/tools/run.py', 'core.engine', '/p/src/core/engine.py'),
+    ('/p/tools/run.py', 'pkg', '/p/pkg/__init__.py'),
+    ('/p/tools/run.py', 'os', None),
+    # from pkg import mod / from pkg import name / from pkg.mod import name
+    ('/p/tools/run.py', 'pkg.name', '/p/pkg/__init__.py'),
+    ('/p/tools/run.py', 'pkg.mod.name', '/p/pkg/mod.py'),
+    ('/p/pkg/mod.py', '.sub', '/p/pkg/sub/__init__.py'),
+    ('/p/pkg/mod.py', '.sub.deep', '/p/pkg/sub/deep.py'),
+    ('/p/pkg/mod.py', '.name', '/p/pkg/__init__.py'),
+    ('/p/pkg/sub/deep.py', '..mod', '/p/pkg/mod.py'),
+    ('/p/pkg/sub/deep.py', '..', '/p/pkg/__init__.py'),
+    # from setuptools import setup
+    ('/p/setup.py', 'setuptools.setup', None),
+    ('/p/tools/run.py', 'helpers.name', '/p/tools/helpers.py'),
+])
+def test_resolves_absolute_and_relative_python_imports(resolver, source, specifier, expected):
+    assert resolver.resolve(source, specifier) == expected
+
+
+def test_from_imports_are_extracted_as_one_specifier():
+    analyzer = UniversalCodebaseAnalyzer()
+    content = (
+        'import os.path\nfrom setuptools import setup\nfrom . import sibling\nfrom ..pkg import (\n'
+        '    name,\n)\nfrom .mod import *\nyield from generator\n'
+    )
+    assert analyzer._extract_symbols(content, 'python')['dependencies'] == [
+        'os.path', 'setuptools.setup', '.sibling', '..pkg.name', '.mod'
+    ]
+
+
+def test_setup_py_does_not_import_itself(analyzer, project):
+    root = project({'setup.py': 'from setuptools import setup\nsetup(name="demo")\n'})
+    analyzer.analyze_project(root)
+    assert analyzer.dependency_tree[f'{root}/setup.py'] == []
+    assert analyzer.circular_dependencies == set()
+
+
+def test_self_imports_and_repeated_imports_give_one_edge(analyzer, project):
+    root = project({
+        'a.js': "const b = require('./b')\nconst again = require('./b.js')\nconst self = require('./a')\n",
+        'b.js': '',
+        'pkg/__init__.py': 'from . import helper\nfrom .helper import run\nimport pkg.helper\n',
+        'pkg/helper.py': 'def run():\n    pass\n',
+    })
+    analyzer.analyze_project(root)
+    assert analyzer.dependency_tree[f'{root}/a.js'] == [f'{root}/b.js']
+    assert analyzer.dependency_tree[f'{root}/pkg/__init__.py'] == [f'{root}/pkg/helper.py']
+    assert analyzer.circular_dependencies == set()
+    assert analyzer.get_symbol_index().importers[f'{root}/b.js'] == [f'{root}/a.js']
+
+
+def test_tsconfig_vite_and_configured_aliases(analyzer, project):
+    root = project({
+        'tsconfig.json': ('{\n  // paths\n  "compilerOptions": '
+                          '{"baseUrl": "src", "paths": {"#ui/*": ["ui/*"],}},\n}\n'),
+        'vite.config.js': ("export default { resolve: { alias: "
+                           "{ '~': path.resolve(__dirname, './src/lib') } } }\n"),
+        'src/ui/Card.tsx': 'export const Card = 1\n',
+        'src/lib/format.ts': 'export const format = 1\n',
+        'shared/log.js': 'export const log = 1\n',
+        'src/app.ts': "import '#ui/Card'\nimport '~/format'\nimport 'shared/log'\nimport 'react'\n",
+    })
+    analyzer.config['path_aliases'] = {'shared': 'shared'}
+    analyzer.analyze_project(root)
+    assert analyzer.dependency_tree[f'{root}/src/app.ts'] == [
+        f'{root}/src/ui/Card.tsx', f'{root}/src/lib/format.ts', f'{root}/shared/log.js'
+    ]
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from generate_report import SymbolIndex, main
+
+
+@pytest.fixture
+def indexed(analyzer, project):
+    root = project({
+        'src/auth.js': "export function useAuth() {}\nexport class Session {}\n",
+        'src/app.js': "const auth = require('./auth')\nfunction render() {}\n",
+        'src/page.js': "const app = require('./app')\nconst react = require('react')\n",
+        'tools/cli.py': 'import os\n\ndef useAuth():\n    pass\n',
+    })
+    analyzer.analyze_project(root)
+    return analyzer, root
+
+
+def test_build_and_query(indexed):
+    analyzer, root = indexed
+    assert analyzer.find_definitions('useAuth') == {
+        'function': [f'{root}/src/auth.js', f'{root}/tools/cli.py'],
+        'export': [f'{root}/src/auth.js'],
+    }
+    assert analyzer.find_definitions('Session', kind='class') == {'class': [f'{root}/src/auth.js']}
+    assert analyzer.find_definitions('missing') == {}
+
+    assert analyzer.find_importers('react') == [f'{root}/src/page.js']
+    assert analyzer.find_importers(f'{root}/src/auth.js') == [f'{root}/src/app.js']
+    assert analyzer.find_importers('src/auth.js') == [f'{root}/src/app.js']
+    assert analyzer.get_symbol_index().impacted_files(['src/auth.js']) == [
+        f'{root}/src/app.js', f'{root}/src/auth.js', f'{root}/src/page.js'
+    ]
+
+
+def test_index_round_trips_through_save_and_load(indexed, tmp_path):
+    analyzer, root = indexed
+    index = analyzer.get_symbol_index()
+    path = str(tmp_path / 'report.index.json')
+    index.save(path)
+
+    loaded = SymbolIndex.load(path)
+    assert loaded.root_dir == root
+    assert (loaded.definitions, loaded.modules, loaded.importers) == \
+        (index.definitions, index.modules, index.importers)
+
+    with open(path) as f:
+        data = json.load(f)
+    data['version'] = SymbolIndex.VERSION + 1
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    with pytest.raises(ValueError):
+        SymbolIndex.load(path)
+
+
+def test_report_writes_the_index_for_the_query_command(indexed, tmp_path, capsys):
+    analyzer, root = indexed
+    analyzer.generate_report(str(tmp_path / 'report'))
+    index_path = str(tmp_path / 'report.index.json')
+    capsys.readouterr()
+
+    assert main(['query', index_path, 'useAuth', '--kind', 'function']) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        f'function\t{root}/src/auth.js', f'function\t{root}/tools/cli.py'
+    ]
+    assert main(['query', index_path, 'src/auth.js', '--importers', '--json']) == 0
+    assert json.loads(capsys.readouterr().out) == [f'{root}/src/app.js']
+    assert main(['query', index_path, 'src/app.js', '--impacted']) == 0
+    assert capsys.readouterr().out.splitlines() == [f'{root}/src/app.js', f'{root}/src/page.js']
+
+    with pytest.raises(SystemExit):
+        main(['query', index_path, 'a', 'b'])
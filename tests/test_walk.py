@@ -0,0 +1,52 @@
+import os
+
+
+def test_walk_prunes_excluded_directories(analyzer, project):
+    root = project({
+        'src/app.js': '',
+        'node_modules/react/index.js': '',
+        'src/node_modules/local/index.js': '',
+        'build/out.js': '',
+        'src/__pycache__/mod.py': '',
+        'docs/build.js': '',
+    })
+    walked = [directory for directory, _ in analyzer._walk_directories(root)]
+    assert walked == [root, f'{root}/docs', f'{root}/src']
+
+    source_files, _ = analyzer._walk_project(root)
+    assert source_files == [f'{root}/docs/build.js', f'{root}/src/app.js']
+
+
+def test_walk_skips_excluded_files_and_groups_config_files(analyzer, project):
+    root = project({
+        'a.js': '',
+        'debug.log': '',
+        'yarn.lock': '',
+        'secret_keys.js': '',
+        'package.json': '{}',
+        'setup.cfg': '',
+        'config/app.yaml': '',
+        'config/base.json': '',
+        '.env.local': '',
+        'Dockerfile': '',
+    })
+    analyzer.config['excluded_files'] = analyzer.config['excluded_files'] | {'secret*'}
+    source_files, config_files = analyzer._walk_project(root)
+
+    assert source_files == [f'{root}/a.js']
+    # Grouped in CONFIG_PATTERNS order, walk order within a group
+    assert config_files == [
+        'package.json', 'config/base.json', 'config/app.yaml', 'setup.cfg', '.env.local', 'Dockerfile'
+    ]
+    assert analyzer._walk_cache[3] == [root]
+
+
+def test_source_path_check_agrees_with_the_walk(analyzer, project):
+    root = project({'src/a.js': '', 'src/skip.log': '', 'dist/b.js': '', 'src/b.py': '', 'README.md': ''})
+    analyzer.root_dir = root
+    walked = set(analyzer._walk_project(root)[0])
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            assert analyzer._is_source_path(path) == (path in walked), path
+    assert not analyzer._is_source_path(os.path.join(os.path.dirname(root), 'outside.js'))
@@ -0,0 +1,54 @@
+import json
+import os
+import time
+
+import pytest
+
+
+@pytest.mark.parametrize('mode', ['incremental', 'git'])
+def test_apply_changes_reports_and_caches_each_update(analyzer, project, mode):
+    root = project({'a.js': "import b from './b'\n", 'b.js': 'export const b = 1\n'})
+    if mode == 'git':
+        analyzer.config['change_detection'] = 'git'
+    else:
+        analyzer.config['incremental'] = True
+    analyzer.analyze_project(root)
+
+    added = os.path.join(root, 'e.js')
+    with open(added, 'w') as f:
+        f.write("import b from './b'\n")
+    assert analyzer._apply_changes({added})
+
+    changes = analyzer._analyze_changes()
+    assert changes['new_files'] == [added]
+    assert changes['modified_files'] == changes['deleted_files'] == []
+    assert analyzer.history[-1]['changes']['new_files'] == [added]
+    with open(analyzer._state_path(analyzer.config['cache_file'])) as f:
+        assert added in json.load(f)['files']
+
+    removed = os.path.join(root, 'b.js')
+    os.remove(removed)
+    assert analyzer._apply_changes({removed})
+    assert analyzer._analyze_changes()['deleted_files'] == [removed]
+    with open(analyzer._state_path(analyzer.config['cache_file'])) as f:
+        assert removed not in json.load(f)['files']
+
+
+def test_event_watcher_marks_files_under_moved_directories(analyzer, project, tmp_path):
+    pytest.importorskip('watchdog')
+    root = project({'a.js': "import x from './lib/x'\n", 'lib/x.js': 'export const x = 1\n'})
+    analyzer.config['watch_backend'] = 'watchdog'
+    analyzer.analyze_project(root)
+    watcher = analyzer._start_watcher(root)
+    try:
+        os.rename(os.path.join(root, 'lib'), str(tmp_path / 'lib'))
+        dirty = set()
+        deadline = time.monotonic() + 5
+        while os.path.join(root, 'lib', 'x.js') not in dirty and time.monotonic() < deadline:
+            time.sleep(0.05)
+            dirty |= watcher.drain()
+    finally:
+        watcher.stop()
+
+    assert analyzer._apply_changes(dirty)
+    assert sorted(analyzer.file_metadata) == [os.path.join(root, 'a.js')]
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from generate_report import main
+
+FILES = {
+    'scripts/build.js': "const ui = require('../packages/ui')\n",
+    'packages/ui/package.json': '{"name": "@acme/ui", "main": "index.js"}',
+    'packages/ui/index.js': "export function Button() {}\n",
+    'packages/ui/theme.js': 'export const theme = {}\n',
+    'packages/app/package.json': '{"name": "app"}',
+    'packages/app/main.js': "const ui = require('@acme/ui')\nconst theme = require('@acme/ui/theme')\n",
+    'services/api/setup.py': 'from setuptools import setup\nsetup(name="api")\n',
+    'services/api/api/__init__.py': '',
+    'services/api/api/handlers.py': 'def handle():\n    pass\n',
+    'services/worker/setup.py': 'from setuptools import setup\nsetup(name="worker")\n',
+    'services/worker/worker.py': 'from api import handlers\n',
+    'tools/sync/go.mod': 'module example.com/sync\n',
+    'tools/sync/main.go': 'package main\n\nfunc main() {}\n',
+}
+
+
+@pytest.fixture
+def workspace(analyzer, project):
+    root = project(FILES)
+    analyzer.analyze_workspace(root)
+    return analyzer, root
+
+
+def test_discovers_every_package_with_its_type(workspace):
+    analyzer, root = workspace
+    packages = {
+        package_dir: (package.project_context.name, package.project_context.type)
+        for package_dir, package in analyzer.packages.items()
+    }
+    assert packages == {
+        root: ('project', 'generic'),
+        f'{root}/packages/app': ('app', 'node'),
+        f'{root}/packages/ui': ('@acme/ui', 'node'),
+        f'{root}/services/api': ('api', 'python'),
+        f'{root}/services/worker': ('worker', 'python'),
+        # Types without a config parser fall back to a generic context
+        f'{root}/tools/sync': ('sync', 'go'),
+    }
+    assert list(analyzer.packages[f'{root}/tools/sync'].file_metadata) == [f'{root}/tools/sync/main.go']
+    assert list(analyzer.packages[root].file_metadata) == [f'{root}/scripts/build.js']
+
+
+def test_imports_resolve_across_packages(workspace):
+    analyzer, root = workspace
+    assert analyzer._cross_package_dependencies() == {
+        f'{root}/packages/app/main.js': [f'{root}/packages/ui/index.js', f'{root}/packages/ui/theme.js'],
+        f'{root}/scripts/build.js': [f'{root}/packages/ui/index.js'],
+        f'{root}/services/worker/worker.py': [f'{root}/services/api/api/handlers.py'],
+    }
+    app = analyzer.packages[f'{root}/packages/app']
+    assert app.dependency_tree[f'{root}/packages/app/main.js'] == [
+        f'{root}/packages/ui/index.js', f'{root}/packages/ui/theme.js'
+    ]
+
+
+def test_report_per_package_and_aggregate(workspace, tmp_path):
+    analyzer, root = workspace
+    analyzer.generate_workspace_report(str(tmp_path / 'report'))
+
+    for slug in ('root', 'packages_app', 'packages_ui', 'services_api', 'services_worker', 'tools_sync'):
+        for suffix in ('json', 'txt', 'index.json'):
+            assert (tmp_path / f'report.{slug}.{suffix}').exists(), (slug, suffix)
+    with open(tmp_path / 'report.packages_app.json') as f:
+        app_report = json.load(f)
+    assert app_report['project']['name'] == 'app'
+    assert list(app_report['files']) == [f'{root}/packages/app/main.js']
+
+    with open(tmp_path / 'report.json') as f:
+        summary = json.load(f)
+    assert summary['packages']['packages/app'] == {
+        'name': 'app', 'type': 'node', 'report': 'report.packages_app',
+        'statistics': summary['packages']['packages/app']['statistics'],
+        'circular_dependencies': [], 'depends_on': ['packages/ui']
+    }
+    assert summary['packages']['tools/sync']['type'] == 'go'
+    assert summary['packages']['.']['depends_on'] == ['packages/ui']
+    assert summary['statistics']['total_files'] == 10
+    assert summary['cross_package_dependencies'] == analyzer._cross_package_dependencies()
+    assert summary['cross_package_cycles'] == []
+
+
+def test_workspace_command(analyzer, project, tmp_path):
+    root = project(FILES)
+    assert main([root, '--workspace', '--output', str(tmp_path / 'out')]) == 0
+    with open(tmp_path / 'out.json') as f:
+        assert set(json.load(f)['packages']) == {
+            '.', 'packages/app', 'packages/ui', 'services/api', 'services/worker', 'tools/sync'
+        }
+    assert (tmp_path / 'out.tools_sync.txt').exists()